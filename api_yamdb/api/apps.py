@@ -8,3 +8,7 @@ class ApiConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        """Подключает обработчики сигналов и проверки настроек."""
+        from api import checks, signals  # noqa: F401
@@ -0,0 +1,137 @@
+"""JWT аутентификация без запроса пользователя к базе."""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+User = get_user_model()
+
+# Поля пользователя, которые передаются в токене и нужны для проверки прав.
+USER_CLAIMS = ('username', 'role', 'is_staff', 'is_superuser')
+
+REVOKED_PREFIX = 'jwt:revoked:'
+
+# Пользователи, загруженные из базы, в порядке истечения срока.
+_user_cache = OrderedDict()
+_user_cache_lock = threading.Lock()
+
+
+class RoleAccessToken(AccessToken):
+    """Токен доступа с ролью и флагами пользователя."""
+
+    @classmethod
+    def for_user(cls, user):
+        """Создает токен с данными, достаточными для проверки прав."""
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+def get_revocation_cache():
+    """Возвращает хранилище списка отзыва токенов."""
+    return caches[settings.JWT_REVOCATION_CACHE_ALIAS]
+
+
+def revoke_user_tokens(user_id):
+    """
+    Отзывает данные, выпущенные в токенах пользователя до этого момента.
+
+    Такие токены остаются действительными, но пользователь для них
+    загружается из базы, поэтому новые права применяются сразу.
+    """
+    get_revocation_cache().set(
+        f'{REVOKED_PREFIX}{user_id}',
+        int(time.time()),
+        timeout=int(
+            api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+        ),
+    )
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+
+
+def is_revoked(validated_token):
+    """Проверяет, выпущен ли токен до отзыва данных пользователя."""
+    revoked_at = get_revocation_cache().get(
+        f'{REVOKED_PREFIX}{validated_token[api_settings.USER_ID_CLAIM]}'
+    )
+    return (
+        revoked_at is not None
+        and validated_token.get('iat', 0) <= revoked_at
+    )
+
+
+def get_cached_user(user_id):
+    """Возвращает пользователя из кэша процесса, если срок не истек."""
+    with _user_cache_lock:
+        cached = _user_cache.get(user_id)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    return None
+
+
+def cache_user(user_id, user, ttl):
+    """
+    Запоминает пользователя в кэше процесса на ttl секунд.
+
+    Записи хранятся в порядке истечения срока: при добавлении удаляются
+    истекшие и самые старые записи сверх JWT_USER_CACHE_SIZE.
+    """
+    now = time.monotonic()
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+        _user_cache[user_id] = (now + ttl, user)
+        while _user_cache and (
+            len(_user_cache) > settings.JWT_USER_CACHE_SIZE
+            or next(iter(_user_cache.values()))[0] <= now
+        ):
+            _user_cache.popitem(last=False)
+
+
+def build_user(validated_token):
+    """Создает объект пользователя по данным токена без запроса к базе."""
+    user = User(
+        pk=validated_token[api_settings.USER_ID_CLAIM],
+        **{claim: validated_token[claim] for claim in USER_CLAIMS},
+    )
+    user._state.adding = False
+    user._state.db = 'default'
+    return user
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Аутентификация по JWT, использующая роль и флаги из токена.
+
+    Пользователь загружается из базы только для токенов без этих данных
+    и для токенов, выпущенных до изменения пользователя. Такие загрузки
+    можно кэшировать в памяти процесса на JWT_USER_CACHE_TTL секунд, но
+    не больше JWT_USER_CACHE_SIZE записей.
+    Объект пользователя из токена содержит только поля из USER_CLAIMS.
+    """
+
+    def get_user(self, validated_token):
+        """Возвращает пользователя по данным токена."""
+        if (
+            all(claim in validated_token for claim in USER_CLAIMS)
+            and api_settings.USER_ID_CLAIM in validated_token
+            and not is_revoked(validated_token)
+        ):
+            return build_user(validated_token)
+        ttl = settings.JWT_USER_CACHE_TTL
+        if not ttl:
+            return super().get_user(validated_token)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = get_cached_user(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache_user(user_id, user, ttl)
+        return user
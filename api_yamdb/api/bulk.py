@@ -0,0 +1,192 @@
+"""Массовое создание и изменение произведений."""
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+from reviews.models import Category, Genre, Title, TitleGenre
+from reviews.utils import bump_table_versions, deferred_table_versions
+from .cache import invalidate_tags
+from .serializers import TitleBulkItemSerializer
+from .signals import title_reviews_tag, title_tag
+
+DOES_NOT_EXIST = serializers.SlugRelatedField.default_error_messages[
+    'does_not_exist'
+]
+
+
+def check_size(items):
+    """Проверяет, что передан непустой список допустимой длины."""
+    if not isinstance(items, list) or not items:
+        message = 'Ожидается непустой список произведений.'
+    elif len(items) > settings.TITLE_BULK_MAX_ITEMS:
+        message = (
+            'В одном запросе можно передать не больше '
+            f'{settings.TITLE_BULK_MAX_ITEMS} произведений.'
+        )
+    else:
+        return
+    raise serializers.ValidationError(
+        {api_settings.NON_FIELD_ERRORS_KEY: [message]}
+    )
+
+
+def validate_items(items):
+    """
+    Проверяет поля элементов и возвращает их данные и ошибки.
+
+    Элемент с id изменяет произведение, как PATCH, а элемент без id
+    создает новое. Данные элемента с ошибками - None.
+    """
+    check_size(items)
+    validators = {
+        partial: TitleBulkItemSerializer(partial=partial)
+        for partial in (False, True)
+    }
+    validated, errors = [], []
+    for item in items:
+        partial = isinstance(item, dict) and 'id' in item
+        try:
+            validated.append(validators[partial].run_validation(item))
+            errors.append({})
+        except serializers.ValidationError as exc:
+            validated.append(None)
+            errors.append(exc.detail)
+    return validated, errors
+
+
+def load_references(validated):
+    """Загружает категории, жанры и произведения элементов по запросу."""
+    valid = [data for data in validated if data is not None]
+    return (
+        Category.objects.in_bulk(
+            {data['category'] for data in valid if 'category' in data},
+            field_name='slug',
+        ),
+        Genre.objects.in_bulk(
+            {slug for data in valid for slug in data.get('genre', ())},
+            field_name='slug',
+        ),
+        Title.objects.in_bulk({data['id'] for data in valid if 'id' in data}),
+    )
+
+
+def check_references(data, errors, categories, genres, titles, seen):
+    """Добавляет в ошибки элемента несуществующие слаги и id."""
+    if 'id' in data:
+        if data['id'] not in titles:
+            errors['id'] = [f'Произведение с id={data["id"]} не найдено.']
+        elif data['id'] in seen:
+            errors['id'] = [
+                f'Произведение с id={data["id"]} уже есть в запросе.'
+            ]
+        seen.add(data['id'])
+    if 'category' in data and data['category'] not in categories:
+        errors['category'] = [
+            DOES_NOT_EXIST.format(slug_name='slug', value=data['category'])
+        ]
+    unknown = [slug for slug in data.get('genre', ()) if slug not in genres]
+    if unknown:
+        errors['genre'] = [
+            DOES_NOT_EXIST.format(slug_name='slug', value=slug)
+            for slug in unknown
+        ]
+
+
+def validate_references(validated, errors):
+    """
+    Проверяет слаги и id элементов и возвращает найденные объекты.
+
+    При ошибке в любом элементе вызывает ValidationError со списком
+    ошибок по элементам.
+    """
+    categories, genres, titles = load_references(validated)
+    seen = set()
+    for data, item_errors in zip(validated, errors):
+        if data is not None:
+            check_references(
+                data, item_errors, categories, genres, titles, seen
+            )
+    if any(errors):
+        raise serializers.ValidationError(errors)
+    return categories, genres, titles
+
+
+def replace_genre_links(links):
+    """
+    Приводит жанры произведений к переданным множествам id жанров.
+
+    Существующие связи читаются одним запросом, лишние удаляются, а
+    недостающие добавляются bulk_create.
+    """
+    if not links:
+        return
+    missing = {
+        title_id: set(genre_ids) for title_id, genre_ids in links.items()
+    }
+    removed = []
+    for pk, title_id, genre_id in TitleGenre.objects.filter(
+        title_id__in=links
+    ).values_list('pk', 'title_id', 'genre_id'):
+        if genre_id in missing[title_id]:
+            missing[title_id].remove(genre_id)
+        else:
+            removed.append(pk)
+    if removed:
+        TitleGenre.objects.filter(pk__in=removed).delete()
+    TitleGenre.objects.bulk_create([
+        TitleGenre(title_id=title_id, genre_id=genre_id)
+        for title_id, genre_ids in missing.items()
+        for genre_id in sorted(genre_ids)
+    ])
+
+
+def bulk_save_titles(items):
+    """
+    Создает и изменяет произведения одной транзакцией.
+
+    Произведения и связи с жанрами записываются bulk_create и
+    bulk_update, которые не отправляют сигналы, поэтому версии таблиц и
+    теги кэша обновляются здесь. При ошибке в любом элементе вызывается
+    ValidationError со списком ошибок по элементам и ничего не
+    записывается. Возвращает число созданных и измененных произведений и
+    их id в порядке элементов.
+    """
+    validated, errors = validate_items(items)
+    categories, genres, titles = validate_references(validated, errors)
+    objects, created, updated, fields, links = [], [], [], set(), []
+    for data in validated:
+        values = {
+            name: value for name, value in data.items()
+            if name not in ('id', 'genre')
+        }
+        if 'category' in values:
+            values['category'] = categories[values['category']]
+        if 'id' in data:
+            title = titles[data['id']]
+            for name, value in values.items():
+                setattr(title, name, value)
+            fields.update(values)
+            updated.append(title)
+        else:
+            title = Title(**values)
+            created.append(title)
+        objects.append(title)
+        if 'genre' in data:
+            links.append(
+                (title, {genres[slug].pk for slug in data['genre']})
+            )
+    with transaction.atomic(), deferred_table_versions():
+        Title.objects.bulk_create(created)
+        if updated and fields:
+            Title.objects.bulk_update(updated, sorted(fields))
+        replace_genre_links({
+            title.pk: genre_ids for title, genre_ids in links
+        })
+        bump_table_versions(Title, TitleGenre)
+    ids = [title.pk for title in objects]
+    invalidate_tags('titles', *(
+        tag for pk in ids for tag in (title_tag(pk), title_reviews_tag(pk))
+    ))
+    return {'created': len(created), 'updated': len(updated), 'ids': ids}
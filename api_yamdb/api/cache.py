@@ -0,0 +1,86 @@
+"""Кэш ответов API с инвалидацией по тегам."""
+
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+ENTRY_PREFIX = 'response-cache:entry:'
+TAG_PREFIX = 'response-cache:tag:'
+
+
+def get_cache():
+    """Возвращает хранилище кэша ответов."""
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def new_tag_version():
+    """Возвращает новую уникальную версию тега."""
+    return uuid.uuid4().hex
+
+
+def get_tag_versions(tags):
+    """
+    Возвращает текущие версии тегов.
+
+    Отсутствующим тегам присваивается новая случайная версия, поэтому
+    вытеснение тега из кэша не может вернуть его к старой версии.
+    """
+    cache = get_cache()
+    keys = {TAG_PREFIX + tag: tag for tag in tags}
+    stored = cache.get_many(keys)
+    missing = {
+        key: new_tag_version() for key in keys if key not in stored
+    }
+    if missing:
+        cache.set_many(missing, timeout=None)
+        stored.update(missing)
+    return {keys[key]: version for key, version in stored.items()}
+
+
+def invalidate_tags(*tags):
+    """Делает недействительными все записи, помеченные тегами."""
+    if tags:
+        get_cache().set_many(
+            {TAG_PREFIX + tag: new_tag_version() for tag in set(tags)},
+            timeout=None,
+        )
+
+
+def get_user_role(user):
+    """Возвращает роль пользователя для ключа кэша."""
+    if not user or not user.is_authenticated:
+        return 'anonymous'
+    return 'admin' if user.is_admin else user.role
+
+
+def build_entry_key(request):
+    """Строит ключ записи по адресу, параметрам и роли пользователя."""
+    query = sorted(request.query_params.lists())
+    key = '|'.join((
+        request.get_host(),
+        request.path,
+        repr(query),
+        get_user_role(request.user),
+    ))
+    return ENTRY_PREFIX + hashlib.sha1(key.encode()).hexdigest()
+
+
+def get_cached_data(request):
+    """Возвращает данные ответа из кэша, если все его теги актуальны."""
+    entry = get_cache().get(build_entry_key(request))
+    if entry is None:
+        return None
+    if get_tag_versions(entry['tags']) != entry['tags']:
+        return None
+    return entry['data']
+
+
+def set_cached_data(request, data, tag_versions):
+    """Сохраняет данные ответа вместе с версиями его тегов."""
+    get_cache().set(
+        build_entry_key(request),
+        {'tags': tag_versions, 'data': data},
+        timeout=settings.RESPONSE_CACHE_TIMEOUT,
+    )
@@ -0,0 +1,31 @@
+"""Проверки настроек API приложения."""
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Error, register
+
+# Кэши, данные которых не видны другим процессам сервера.
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+@register()
+def check_revocation_cache(app_configs, **kwargs):
+    """Список отзыва токенов должен быть общим для всех процессов."""
+    alias = settings.JWT_REVOCATION_CACHE_ALIAS
+    if alias not in settings.CACHES:
+        return [Error(
+            f'Кэш {alias!r} из JWT_REVOCATION_CACHE_ALIAS не найден в '
+            'CACHES.',
+            id='api.E001',
+        )]
+    if isinstance(caches[alias], PROCESS_LOCAL_CACHES):
+        return [Error(
+            f'Кэш {alias!r} для отзыва токенов виден только одному '
+            'процессу.',
+            hint='Укажите в JWT_REVOCATION_CACHE_ALIAS общий кэш: '
+                 'файловый, в базе, Redis или Memcached.',
+            id='api.E002',
+        )]
+    return []
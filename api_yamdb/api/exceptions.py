@@ -0,0 +1,37 @@
+"""Обработка исключений API."""
+
+from django.db import OperationalError
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.views import exception_handler as default_handler
+
+# Через сколько секунд клиенту стоит повторить запрос к занятой базе.
+RETRY_AFTER = 1
+
+
+class DatabaseBusy(APIException):
+    """База данных занята другой записью дольше времени ожидания."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'База данных занята, повторите запрос позже.'
+    default_code = 'database_busy'
+
+
+def is_database_locked(exc):
+    """Проверяет, что запрос не дождался блокировки записи SQLite."""
+    return isinstance(exc, OperationalError) and 'locked' in str(exc)
+
+
+def exception_handler(exc, context):
+    """
+    Обработчик исключений DRF с ответом 503 на занятую базу.
+
+    Ожидание блокировки ограничено SQLITE_BUSY_TIMEOUT; если его не
+    хватило, клиент получает Retry-After вместо ошибки сервера.
+    """
+    if is_database_locked(exc):
+        exc = DatabaseBusy()
+        response = default_handler(exc, context)
+        response['Retry-After'] = str(RETRY_AFTER)
+        return response
+    return default_handler(exc, context)
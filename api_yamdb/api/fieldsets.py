@@ -0,0 +1,128 @@
+"""Выборочные поля ответа и сокращение запросов к базе под них."""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def parse_names(value):
+    """Разбирает список полей, перечисленных через запятую."""
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def get_requested_fields(request, available):
+    """
+    Возвращает поля, которые нужно оставить в ответе, или None.
+
+    Параметры учитываются только в безопасных запросах, чтобы не менять
+    набор полей при проверке данных записи. Неизвестное поле - ошибка
+    запроса.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    params = request.query_params
+    if FIELDS_PARAM not in params and OMIT_PARAM not in params:
+        return None
+    errors = {}
+    selected = list(available)
+    for param in (FIELDS_PARAM, OMIT_PARAM):
+        if param not in params:
+            continue
+        names = parse_names(params[param])
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            errors[param] = f'Неизвестные поля: {", ".join(unknown)}.'
+        elif param == FIELDS_PARAM:
+            selected = [name for name in selected if name in names]
+        else:
+            selected = [name for name in selected if name not in names]
+    if errors:
+        raise serializers.ValidationError(errors)
+    return selected
+
+
+class SparseFieldsMixin:
+    """
+    Оставляет в ответе только поля из параметров fields и omit.
+
+    Применяется к сериализатору верхнего уровня: вложенные сериализаторы
+    создаются без контекста и выводятся полностью.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        names = get_requested_fields(
+            kwargs.get('context', {}).get('request'), self.fields
+        )
+        if names is not None:
+            for name in set(self.fields) - set(names):
+                self.fields.pop(name)
+
+
+def get_queryset_lookups(serializer):
+    """
+    Возвращает данные модели, которые нужны полям сериализатора.
+
+    Результат - множества столбцов, связей для select_related и связей
+    для prefetch_related, или None, если их не удалось определить.
+    Столбцы полей, которые не соответствуют полям модели, берутся из
+    Meta.field_dependencies сериализатора.
+    """
+    model = serializer.Meta.model
+    dependencies = getattr(serializer.Meta, 'field_dependencies', {})
+    columns, select, prefetch = set(), set(), set()
+    for name, field in serializer.fields.items():
+        if name in dependencies:
+            columns.update(dependencies[name])
+            continue
+        if field.source == '*':
+            return None
+        path = field.source.split('.')
+        try:
+            model_field = model._meta.get_field(path[0])
+        except FieldDoesNotExist:
+            return None
+        if model_field.many_to_many or model_field.one_to_many:
+            prefetch.add(model_field.name)
+        elif model_field.is_relation:
+            columns.add(model_field.name)
+            if isinstance(field, serializers.SlugRelatedField):
+                columns.add(f'{model_field.name}__{field.slug_field}')
+            if len(path) > 1 or not isinstance(
+                field, serializers.PrimaryKeyRelatedField
+            ):
+                select.add(model_field.name)
+        else:
+            columns.add(model_field.name)
+    return columns, select, prefetch
+
+
+def get_ordering_columns(queryset):
+    """Возвращает столбцы сортировки, значения которых читает пагинация."""
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+    return {
+        name.lstrip('-') for name in ordering
+        if isinstance(name, str) and '__' not in name
+    }
+
+
+def prune_queryset(queryset, serializer):
+    """Оставляет в queryset только данные, нужные полям сериализатора."""
+    lookups = get_queryset_lookups(serializer)
+    if lookups is None:
+        return queryset
+    columns, select, prefetch = lookups
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    # Менеджер связи (title.reviews) проставляет объектам известного
+    # родителя по значению внешнего ключа, поэтому этот столбец нужен.
+    known = {field.name for field in queryset._known_related_objects}
+    return queryset.only(
+        *columns, *known, *get_ordering_columns(queryset)
+    )
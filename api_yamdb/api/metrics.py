@@ -0,0 +1,162 @@
+"""Сбор метрик запросов API: число SQL запросов и время этапов."""
+
+import math
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Метрики запроса: атрибут, имя в Prometheus и описание.
+METRICS = (
+    ('query_count', 'queries', 'Число SQL запросов'),
+    ('sql_time', 'sql_seconds', 'Время SQL запросов'),
+    ('serializer_time', 'serializer_seconds', 'Время сериализации'),
+    ('render_time', 'render_seconds', 'Время рендеринга ответа'),
+    ('total_time', 'request_seconds', 'Полное время обработки запроса'),
+)
+QUANTILES = (0.5, 0.9, 0.99)
+
+current_metrics = ContextVar('current_metrics', default=None)
+
+
+class RequestMetrics:
+    """Метрики одного запроса."""
+
+    def __init__(self):
+        self.query_count = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self.render_time = 0.0
+        self.total_time = 0.0
+
+    def query_wrapper(self, execute, sql, params, many, context):
+        """Обертка выполнения SQL для connection.execute_wrapper."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.query_count += 1
+
+    def as_tuple(self):
+        """Возвращает значения метрик в порядке METRICS."""
+        return tuple(getattr(self, name) for name, _, _ in METRICS)
+
+    def server_timing(self):
+        """Возвращает значение заголовка Server-Timing."""
+        return ', '.join((
+            f'sql;dur={self.sql_time * 1000:.1f};'
+            f'desc="{self.query_count} queries"',
+            f'serializer;dur={self.serializer_time * 1000:.1f}',
+            f'render;dur={self.render_time * 1000:.1f}',
+            f'total;dur={self.total_time * 1000:.1f}',
+        ))
+
+
+def add_time(name, start):
+    """Добавляет к метрике текущего запроса время, прошедшее с start."""
+    metrics = current_metrics.get()
+    if metrics is not None:
+        setattr(
+            metrics, name,
+            getattr(metrics, name) + time.perf_counter() - start,
+        )
+
+
+def timed(name, func):
+    """Оборачивает функцию, добавляя время ее работы к метрике name."""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            add_time(name, start)
+
+    return wrapper
+
+
+def time_serializer(serializer):
+    """
+    Включает учет времени сериализации для объекта сериализатора.
+
+    Оборачивается to_representation самого объекта, поэтому для списка
+    время вложенных сериализаторов учитывается один раз.
+    """
+    if current_metrics.get() is not None:
+        serializer.to_representation = timed(
+            'serializer_time', serializer.to_representation
+        )
+    return serializer
+
+
+def quantile_key(quantile):
+    """Возвращает ключ перцентиля в отчете, например p99."""
+    return f'p{round(quantile * 100)}'
+
+
+def percentile(values, quantile):
+    """Возвращает перцентиль по методу ближайшего ранга."""
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[max(math.ceil(quantile * len(values)) - 1, 0)]
+
+
+class MetricsRegistry:
+    """
+    Метрики запросов по маршрутам.
+
+    Перцентили считаются по последним METRICS_WINDOW запросам маршрута,
+    количество и суммы - за все время работы процесса.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.counts = {}
+        self.sums = {}
+
+    def record(self, route, metrics):
+        """Сохраняет метрики запроса к маршруту."""
+        values = metrics.as_tuple()
+        with self.lock:
+            if route not in self.samples:
+                self.samples[route] = deque(maxlen=settings.METRICS_WINDOW)
+                self.counts[route] = 0
+                self.sums[route] = (0,) * len(values)
+            self.samples[route].append(values)
+            self.counts[route] += 1
+            self.sums[route] = tuple(map(sum, zip(self.sums[route], values)))
+
+    def clear(self):
+        """Удаляет все собранные метрики."""
+        with self.lock:
+            self.samples.clear()
+            self.counts.clear()
+            self.sums.clear()
+
+    def report(self):
+        """Возвращает количество, суммы и перцентили метрик по маршрутам."""
+        with self.lock:
+            snapshot = {
+                route: (list(samples), self.counts[route], self.sums[route])
+                for route, samples in self.samples.items()
+            }
+        report = {}
+        for route, (samples, count, sums) in sorted(snapshot.items()):
+            report[route] = {'count': count}
+            for index, (name, _, _) in enumerate(METRICS):
+                values = [sample[index] for sample in samples]
+                report[route][name] = {
+                    'sum': sums[index],
+                    **{
+                        quantile_key(quantile): percentile(values, quantile)
+                        for quantile in QUANTILES
+                    },
+                }
+        return report
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,146 @@
+"""Middleware API приложения."""
+
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.db import connections
+
+from .metrics import RequestMetrics, current_metrics, registry, timed
+from .replicas import RequestReads, current_reads, pool
+
+
+class QueryMetricsMiddleware:
+    """
+    Считает SQL запросы и время этапов обработки запросов к API.
+
+    Метрики сохраняются по маршрутам в реестр метрик, а в режиме DEBUG
+    также возвращаются в заголовке Server-Timing.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Обрабатывает запрос, собирая его метрики."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            with self.wrap_connections(metrics):
+                response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics, start)
+
+    async def __acall__(self, request):
+        """
+        Асинхронный вариант __call__.
+
+        Асинхронный ORM выполняет запросы в потоке запроса, поэтому
+        обертки устанавливаются на соединения этого потока.
+        """
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            stack = await sync_to_async(self.wrap_connections)(metrics)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics, start)
+
+    def wrap_connections(self, metrics):
+        """Подключает учет запросов к соединениям текущего потока."""
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(
+                connection.execute_wrapper(metrics.query_wrapper)
+            )
+        return stack
+
+    def finish(self, request, response, metrics, start):
+        """Сохраняет метрики запроса и добавляет заголовок Server-Timing."""
+        metrics.total_time = time.perf_counter() - start
+        route = self.get_route(request)
+        if route is not None:
+            registry.record(route, metrics)
+        if settings.DEBUG:
+            response['Server-Timing'] = metrics.server_timing()
+        return response
+
+    def process_template_response(self, request, response):
+        """Учитывает время рендеринга ответов DRF."""
+        response.render = timed('render_time', response.render)
+        return response
+
+    def get_route(self, request):
+        """Возвращает имя маршрута API или None для остальных адресов."""
+        match = request.resolver_match
+        if match is None or not match.route.startswith('api/'):
+            return None
+        return f'{request.method} {match.view_name}'
+
+
+class ReplicaMiddleware:
+    """
+    Направляет чтение безопасных запросов к API в реплики.
+
+    Автор запроса, изменившего данные, читает из основной базы следующие
+    DATABASE_REPLICA_LAG секунд.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Обрабатывает запрос с выбором базы для чтения."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        reads = RequestReads(request)
+        token = current_reads.set(reads)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_reads.reset(token)
+        return self.finish(reads, response, start)
+
+    async def __acall__(self, request):
+        """Асинхронный вариант __call__."""
+        reads = RequestReads(request)
+        token = current_reads.set(reads)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_reads.reset(token)
+        return self.finish(reads, response, start)
+
+    def finish(self, reads, response, start):
+        """Закрепляет автора записи или учитывает задержку реплики."""
+        if reads.wrote:
+            reads.pin()
+        elif reads.used_replica():
+            pool.record(reads.alias, time.perf_counter() - start)
+        return response
@@ -0,0 +1,527 @@
+"""Миксины для представлений API приложения."""
+
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import SynchronousOnlyOperation, ValidationError
+from django.http import Http404, HttpResponse
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import SAFE_METHODS, AllowAny
+from rest_framework.response import Response
+
+from reviews.utils import aget_table_versions, get_table_versions
+from .cache import get_cached_data, get_tag_versions, set_cached_data
+from .fieldsets import FIELDS_PARAM, OMIT_PARAM, parse_names, prune_queryset
+from .metrics import time_serializer, timed
+from .replicas import may_be_stale
+from .serializers import IdListSerializer
+
+
+async def aget_object_or_404(queryset, **filter_kwargs):
+    """Асинхронный вариант get_object_or_404 из DRF."""
+    try:
+        return await queryset.aget(**filter_kwargs)
+    except (
+        queryset.model.DoesNotExist, TypeError, ValueError, ValidationError
+    ):
+        raise Http404
+
+
+class ConditionalListMixin:
+    """
+    Поддержка ETag и Last-Modified для list.
+
+    Валидаторы строятся по счетчикам изменений таблиц из version_models,
+    поэтому при неизменных данных ответ 304 возвращается без запросов к
+    самим таблицам и без сериализации.
+    """
+
+    version_models = ()
+
+    def get_validators(self, request):
+        """Возвращает ETag и время последнего изменения данных."""
+        return self.build_validators(
+            request, get_table_versions(self.version_models)
+        )
+
+    async def aget_validators(self, request):
+        """Асинхронный вариант get_validators."""
+        return self.build_validators(
+            request, await aget_table_versions(self.version_models)
+        )
+
+    def build_validators(self, request, versions):
+        """Строит ETag и время изменения по версиям таблиц."""
+        key = '|'.join((
+            request.get_full_path(),
+            request.accepted_renderer.format,
+            *(f'{name}:{version}' for name, version, _ in versions),
+        ))
+        etag = '"{}"'.format(hashlib.sha1(key.encode()).hexdigest())
+        modified = [
+            modified for _, _, modified in versions if modified is not None
+        ]
+        last_modified = (
+            int(max(modified).timestamp()) if modified else None
+        )
+        return etag, last_modified
+
+    def get_not_modified_response(self, request, validators=None):
+        """Возвращает ответ 304, если данные у клиента актуальны."""
+        if validators is None:
+            validators = self.get_validators(request)
+        etag, last_modified = validators
+        request.conditional_validators = (etag, last_modified)
+        if_none_match = request.headers.get('If-None-Match')
+        if_modified_since = parse_http_date_safe(
+            request.headers.get('If-Modified-Since', '')
+        )
+        if if_none_match is not None:
+            # "*" не учитывается: валидаторы строятся без загрузки объекта
+            # и не говорят о том, что он существует.
+            not_modified = etag in parse_etags(if_none_match)
+        else:
+            not_modified = (
+                if_modified_since is not None
+                and last_modified is not None
+                and last_modified <= if_modified_since
+            )
+        if not not_modified:
+            return None
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        self.set_validator_headers(request, response)
+        return response
+
+    def set_validator_headers(self, request, response):
+        """Добавляет заголовки ETag и Last-Modified в ответ."""
+        validators = getattr(request, 'conditional_validators', None)
+        if validators is None or response.status_code not in (
+            status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED
+        ):
+            return
+        etag, last_modified = validators
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+
+    def conditional_response(self, request, handler, *args, **kwargs):
+        """Выполняет обработчик, только если данные у клиента устарели."""
+        response = self.get_not_modified_response(request)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            self.set_validator_headers(request, response)
+        return response
+
+    async def aconditional_response(self, request, handler, *args,
+                                    **kwargs):
+        """Асинхронный вариант conditional_response."""
+        response = self.get_not_modified_response(
+            request, await self.aget_validators(request)
+        )
+        if response is None:
+            response = await handler(request, *args, **kwargs)
+            self.set_validator_headers(request, response)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        """Возвращает список или 304, если он не изменился."""
+        return self.conditional_response(
+            request, super().list, *args, **kwargs
+        )
+
+    async def alist(self, request, *args, **kwargs):
+        """Асинхронный вариант list."""
+        return await self.aconditional_response(
+            request, super().alist, *args, **kwargs
+        )
+
+
+class ConditionalGetMixin(ConditionalListMixin):
+    """Поддержка ETag и Last-Modified для list и retrieve."""
+
+    def retrieve(self, request, *args, **kwargs):
+        """Возвращает объект или 304, если он не изменился."""
+        return self.conditional_response(
+            request, super().retrieve, *args, **kwargs
+        )
+
+    async def aretrieve(self, request, *args, **kwargs):
+        """Асинхронный вариант retrieve."""
+        return await self.aconditional_response(
+            request, super().aretrieve, *args, **kwargs
+        )
+
+
+class CachedListMixin:
+    """
+    Кэширование ответов list с инвалидацией по тегам.
+
+    Запись помечается тегами из get_cache_tags и тегами объектов
+    страницы из get_object_cache_tag. Обработчики сигналов меняют версии
+    тегов, после чего все помеченные ими записи перестают действовать.
+    """
+
+    def get_cache_tags(self):
+        """Возвращает теги, общие для всех ответов представления."""
+        return ()
+
+    def get_object_cache_tag(self, pk):
+        """Возвращает тег отдельного объекта."""
+        return None
+
+    def get_response_object_ids(self, data):
+        """Возвращает id объектов, вошедших в ответ."""
+        if isinstance(data, dict) and 'results' in data:
+            data = data['results']
+        if isinstance(data, dict):
+            data = [data]
+        return [item['id'] for item in data if 'id' in item]
+
+    def cached_response(self, request, handler, *args, **kwargs):
+        """Возвращает ответ из кэша или выполняет обработчик."""
+        data = get_cached_data(request)
+        if data is not None:
+            return Response(data)
+        tag_versions = get_tag_versions(self.get_cache_tags())
+        response = handler(request, *args, **kwargs)
+        self.store_response(request, response, tag_versions)
+        return response
+
+    async def acached_response(self, request, handler, *args, **kwargs):
+        """
+        Асинхронный вариант cached_response.
+
+        Кэш ответов вызывается синхронно, поэтому он не должен храниться
+        в базе данных.
+        """
+        data = get_cached_data(request)
+        if data is not None:
+            return Response(data)
+        tag_versions = get_tag_versions(self.get_cache_tags())
+        response = await handler(request, *args, **kwargs)
+        self.store_response(request, response, tag_versions)
+        return response
+
+    def store_response(self, request, response, tag_versions):
+        """Сохраняет успешный ответ в кэш с тегами его объектов."""
+        if response.status_code != status.HTTP_200_OK or may_be_stale():
+            return
+        object_tags = [
+            self.get_object_cache_tag(pk)
+            for pk in self.get_response_object_ids(response.data)
+        ]
+        tag_versions.update(
+            get_tag_versions([tag for tag in object_tags if tag])
+        )
+        set_cached_data(request, response.data, tag_versions)
+
+    def list(self, request, *args, **kwargs):
+        """Возвращает список из кэша или формирует его."""
+        return self.cached_response(request, super().list, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        """Асинхронный вариант list."""
+        return await self.acached_response(
+            request, super().alist, *args, **kwargs
+        )
+
+
+class CachedGetMixin(CachedListMixin):
+    """Кэширование ответов list и retrieve с инвалидацией по тегам."""
+
+    def retrieve(self, request, *args, **kwargs):
+        """Возвращает объект из кэша или формирует ответ."""
+        return self.cached_response(
+            request, super().retrieve, *args, **kwargs
+        )
+
+    async def aretrieve(self, request, *args, **kwargs):
+        """Асинхронный вариант retrieve."""
+        return await self.acached_response(
+            request, super().aretrieve, *args, **kwargs
+        )
+
+
+class SerializerMetricsMixin:
+    """Учитывает время сериализации в метриках запроса."""
+
+    def get_serializer(self, *args, **kwargs):
+        """Возвращает сериализатор с учетом времени сериализации."""
+        return time_serializer(super().get_serializer(*args, **kwargs))
+
+
+class SparseFieldsetMixin:
+    """
+    Сокращает запросы к базе до полей из параметров fields и omit.
+
+    Из queryset убираются связи и столбцы, которые не нужны оставшимся
+    полям сериализатора.
+    """
+
+    def filter_queryset(self, queryset):
+        """Фильтрует queryset и оставляет в нем только нужные данные."""
+        queryset = super().filter_queryset(queryset)
+        params = self.request.query_params
+        if self.request.method not in SAFE_METHODS or (
+            FIELDS_PARAM not in params and OMIT_PARAM not in params
+        ):
+            return queryset
+        serializer = self.get_serializer_class()(
+            context=self.get_serializer_context()
+        )
+        return prune_queryset(queryset, serializer)
+
+
+class NestedResourceMixin:
+    """
+    Родительский объект вложенного ресурса.
+
+    Родитель загружается одним запросом по parent_lookups (поле модели ->
+    параметр адреса), который заодно проверяет, что вся цепочка из адреса
+    существует. Объект кэшируется на время запроса и передается
+    сериализаторам в контексте под именем модели.
+    """
+
+    parent_model = None
+    parent_lookups = {}
+    parent_select_related = ()
+
+    def get_parent_lookup(self):
+        """Возвращает queryset родителя и условия по параметрам адреса."""
+        return (
+            self.parent_model.objects.select_related(
+                *self.parent_select_related
+            ),
+            {
+                field: self.kwargs.get(kwarg)
+                for field, kwarg in self.parent_lookups.items()
+            },
+        )
+
+    def get_parent(self):
+        """Возвращает родительский объект или вызывает 404."""
+        if not hasattr(self, '_parent'):
+            queryset, lookups = self.get_parent_lookup()
+            self._parent = get_object_or_404(queryset, **lookups)
+        return self._parent
+
+    async def aget_parent(self):
+        """Асинхронный вариант get_parent."""
+        if not hasattr(self, '_parent'):
+            queryset, lookups = self.get_parent_lookup()
+            self._parent = await aget_object_or_404(queryset, **lookups)
+        return self._parent
+
+    async def ainitial(self, request, *args, **kwargs):
+        """
+        Загружает родителя после проверок DRF.
+
+        Синхронные get_queryset и контекст сериализатора затем берут его
+        из кэша объекта представления.
+        """
+        await super().ainitial(request, *args, **kwargs)
+        await self.aget_parent()
+
+    def get_serializer_context(self):
+        """Добавляет родительский объект в контекст сериализатора."""
+        context = super().get_serializer_context()
+        context[self.parent_model._meta.model_name] = self.get_parent()
+        return context
+
+
+class BatchListMixin:
+    """
+    Загрузка нескольких объектов по списку id.
+
+    Id передаются в list параметром ids через запятую, а длинные списки -
+    в теле POST запроса к действию batch. Объекты загружаются одной
+    выборкой без пагинации и возвращаются в порядке запроса, а id, для
+    которых объектов нет, перечисляются в missing.
+    """
+
+    ids_param = 'ids'
+
+    def get_requested_ids(self, data):
+        """Проверяет список id и убирает из него повторы."""
+        serializer = IdListSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        return list(dict.fromkeys(serializer.validated_data['ids']))
+
+    def get_query_ids(self, request):
+        """Возвращает id из параметра ids или None без него."""
+        if self.ids_param not in request.query_params:
+            return None
+        return self.get_requested_ids(
+            {'ids': parse_names(request.query_params[self.ids_param])}
+        )
+
+    def get_batch_queryset(self, ids):
+        """Возвращает queryset объектов с указанными id."""
+        return self.filter_queryset(self.get_queryset()).filter(pk__in=ids)
+
+    def get_batch_response(self, ids, objects):
+        """Возвращает найденные объекты в порядке ids и отсутствующие id."""
+        by_id = {obj.pk: obj for obj in objects}
+        found = [by_id[pk] for pk in ids if pk in by_id]
+        return Response({
+            'count': len(found),
+            'results': self.get_serializer(found, many=True).data,
+            'missing': [pk for pk in ids if pk not in by_id],
+        })
+
+    def list(self, request, *args, **kwargs):
+        """Возвращает объекты по параметру ids или обычный список."""
+        ids = self.get_query_ids(request)
+        if ids is None:
+            return super().list(request, *args, **kwargs)
+        return self.get_batch_response(ids, self.get_batch_queryset(ids))
+
+    async def alist(self, request, *args, **kwargs):
+        """Асинхронный вариант list."""
+        ids = self.get_query_ids(request)
+        if ids is None:
+            return await super().alist(request, *args, **kwargs)
+        return self.get_batch_response(ids, [
+            obj async for obj in self.get_batch_queryset(ids).aiterator()
+        ])
+
+    @action(detail=False, methods=('post',), permission_classes=(AllowAny,))
+    def batch(self, request):
+        """Возвращает объекты по списку id из тела запроса."""
+        ids = self.get_requested_ids(request.data)
+        return self.get_batch_response(ids, self.get_batch_queryset(ids))
+
+
+class AsyncReadMixin:
+    """
+    Асинхронные list и retrieve для запуска под ASGI.
+
+    При включенной настройке API_ASYNC_READS маршруты представления
+    получают асинхронный view: GET и HEAD действий из async_actions
+    выполняются методами alist и aretrieve через асинхронный ORM, а
+    остальные запросы передаются синхронному view DRF в потоке. Права,
+    фильтрация, пагинация и формат ответа те же, что у синхронных
+    действий. Миксин располагается в MRO сразу перед ViewSet DRF.
+    """
+
+    async_actions = ('list', 'retrieve')
+    # Форматы, рендереры которых не обращаются к базе.
+    async_render_formats = ('json',)
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        """Возвращает асинхронный view, если он включен настройкой."""
+        view = super().as_view(actions, **initkwargs)
+        if not settings.API_ASYNC_READS or not (
+            set(actions.values()) & set(cls.async_actions)
+        ):
+            return view
+        sync_view = sync_to_async(view)
+        mapping = dict(actions)
+        if 'get' in mapping:
+            mapping.setdefault('head', mapping['get'])
+
+        async def async_view(request, *args, **kwargs):
+            if mapping.get(request.method.lower()) not in cls.async_actions:
+                return await sync_view(request, *args, **kwargs)
+            self = cls(**initkwargs)
+            self.action_map = mapping
+            for method, name in mapping.items():
+                setattr(self, method, getattr(self, name))
+            self.request = request
+            self.args = args
+            self.kwargs = kwargs
+            return await self.adispatch(request, *args, **kwargs)
+
+        async_view.cls = cls
+        async_view.initkwargs = initkwargs
+        async_view.actions = actions
+        async_view.csrf_exempt = True
+        return async_view
+
+    async def adispatch(self, request, *args, **kwargs):
+        """Асинхронный вариант dispatch."""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            handler = getattr(self, f'a{self.action}')
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        self.response = self.finalize_response(
+            request, response, *args, **kwargs
+        )
+        return await self.arender(self.response)
+
+    async def ainitial(self, request, *args, **kwargs):
+        """
+        Выполняет проверки DRF перед обработчиком.
+
+        Для токенов без данных пользователя аутентификация обращается к
+        базе, поэтому в этом случае пользователь загружается в потоке.
+        Остальные проверки к базе не обращаются и выполняются один раз.
+        """
+        try:
+            request.user
+        except SynchronousOnlyOperation:
+            await sync_to_async(lambda: request.user)()
+        self.initial(request, *args, **kwargs)
+
+    async def arender(self, response):
+        """
+        Рендерит ответ DRF и возвращает его как HttpResponse.
+
+        Ответ с методом render Django рендерил бы в потоке, поэтому он
+        рендерится здесь, а в потоке - только рендерерами, которые могут
+        обращаться к базе.
+        """
+        render = timed('render_time', response.render)
+        if response.accepted_renderer.format in self.async_render_formats:
+            render()
+        else:
+            await sync_to_async(render)()
+        rendered = HttpResponse(response.content, status=response.status_code)
+        for header, value in response.items():
+            rendered[header] = value
+        return rendered
+
+    async def apaginate_queryset(self, queryset):
+        """Асинхронный вариант paginate_queryset."""
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(
+            queryset, self.request, view=self
+        )
+
+    async def aget_object(self):
+        """Асинхронный вариант get_object."""
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        obj = await aget_object_or_404(
+            queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def alist(self, request, *args, **kwargs):
+        """Асинхронный вариант list."""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(queryset)
+        if page is None:
+            page = [obj async for obj in queryset.aiterator()]
+            return Response(self.get_serializer(page, many=True).data)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        """Асинхронный вариант retrieve."""
+        serializer = self.get_serializer(await self.aget_object())
+        return Response(serializer.data)
@@ -0,0 +1,98 @@
+"""Пагинация для API приложения."""
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class PubDateCursorPagination(CursorPagination):
+    """Курсорная пагинация по дате публикации и id."""
+
+    ordering = ('pub_date', 'id')
+
+
+class AsyncPageNumberPagination(PageNumberPagination):
+    """Постраничная пагинация с асинхронным вариантом paginate_queryset."""
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Асинхронный вариант paginate_queryset.
+
+        Количество объектов и страница загружаются через асинхронный ORM,
+        ответ и ошибки совпадают с синхронным вариантом.
+        """
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            ))
+        self.page.object_list = [
+            obj async for obj in self.page.object_list.aiterator()
+        ]
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.request = request
+        return list(self.page)
+
+
+class OptionalCursorPagination(AsyncPageNumberPagination):
+    """
+    Постраничная пагинация с переключением на курсорную.
+
+    Курсорный режим включается параметром `?pagination=cursor` и не
+    выполняет COUNT(*) и OFFSET, поэтому стоимость глубоких страниц
+    не растет с номером страницы.
+    """
+
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    cursor_pagination_class = PubDateCursorPagination
+
+    def __init__(self):
+        """Создает пагинатор для курсорного режима."""
+        self.cursor_paginator = self.cursor_pagination_class()
+        self.use_cursor = False
+
+    def is_cursor_mode(self, request):
+        """Проверяет, запрошен ли курсорный режим."""
+        return (
+            request.query_params.get(self.mode_query_param)
+            == self.cursor_mode
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Выбирает режим пагинации по параметрам запроса."""
+        self.use_cursor = self.is_cursor_mode(request)
+        if self.use_cursor:
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Асинхронный вариант paginate_queryset.
+
+        Курсорная пагинация DRF не имеет асинхронного варианта, поэтому
+        в курсорном режиме страница загружается в потоке.
+        """
+        self.use_cursor = self.is_cursor_mode(request)
+        if self.use_cursor:
+            return await sync_to_async(
+                self.cursor_paginator.paginate_queryset
+            )(queryset, request, view)
+        return await super().apaginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        """Возвращает ответ в формате выбранного режима."""
+        if self.use_cursor:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
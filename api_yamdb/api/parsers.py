@@ -0,0 +1,36 @@
+"""Парсеры для API приложения."""
+
+import codecs
+
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from .renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(parsers.JSONParser):
+    """
+    JSON парсер на orjson.
+
+    Без orjson и для тел не в UTF-8 используется стандартный модуль json.
+    Как и в JSONParser DRF, значения NaN и Infinity не принимаются.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Разбирает тело запроса в формате JSON."""
+        encoding = (parser_context or {}).get(
+            'encoding', settings.DEFAULT_CHARSET
+        )
+        if (
+            orjson is None
+            or not self.strict
+            or codecs.lookup(encoding).name != 'utf-8'
+        ):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except ValueError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
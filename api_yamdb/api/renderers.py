@@ -0,0 +1,111 @@
+"""Рендереры для API приложения."""
+
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+from .metrics import METRICS, QUANTILES, quantile_key
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+PROMETHEUS_PREFIX = 'yamdb'
+# Даты передаются кодировщику DRF, чтобы формат не зависел от библиотеки.
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    if orjson else 0
+)
+JAVASCRIPT_ESCAPES = (
+    ('\u2028'.encode(), b'\\u2028'),
+    ('\u2029'.encode(), b'\\u2029'),
+)
+
+json_encoder = JSONEncoder()
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    JSON рендерер на orjson с тем же результатом, что у JSONRenderer DRF.
+
+    Типы, которые orjson не сериализует сам (даты, Decimal, ленивые
+    строки), преобразует кодировщик DRF. Без orjson, а также для ответов
+    с отступами используется стандартный модуль json.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Преобразует данные в JSON."""
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        if data is None:
+            return b''
+        content = orjson.dumps(
+            data, default=json_encoder.default, option=ORJSON_OPTIONS
+        )
+        for char, escaped in JAVASCRIPT_ESCAPES:
+            if char in content:
+                content = content.replace(char, escaped)
+        return content
+
+
+def escape_label(value):
+    """Экранирует значение метки в текстовом формате Prometheus."""
+    return (
+        str(value).replace('\\', '\\\\').replace('"', '\\"')
+        .replace('\n', '\\n')
+    )
+
+
+class PrometheusRenderer(renderers.BaseRenderer):
+    """Текстовый формат Prometheus для отчета о метриках."""
+
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Преобразует отчет MetricsView в строки метрик Prometheus."""
+        if not isinstance(data, dict) or 'routes' not in data:
+            return ''.join(
+                f'# {key}: {value}\n' for key, value in (data or {}).items()
+            ).encode(self.charset)
+        lines = []
+        for name, metric, description in METRICS:
+            metric = f'{PROMETHEUS_PREFIX}_api_{metric}'
+            lines.append(f'# HELP {metric} {description}')
+            lines.append(f'# TYPE {metric} summary')
+            for route, values in data['routes'].items():
+                label = f'route="{escape_label(route)}"'
+                for quantile in QUANTILES:
+                    lines.append(
+                        f'{metric}{{{label},quantile="{quantile}"}} '
+                        f'{values[name][quantile_key(quantile)]}'
+                    )
+                lines.append(f'{metric}_sum{{{label}}} {values[name]["sum"]}')
+                lines.append(f'{metric}_count{{{label}}} {values["count"]}')
+        jobs = data['jobs']
+        metric = f'{PROMETHEUS_PREFIX}_jobs'
+        lines.append(f'# HELP {metric} Задачи в очереди по статусам')
+        lines.append(f'# TYPE {metric} gauge')
+        for status, value in jobs.items():
+            if status not in ('due', 'oldest_due_age'):
+                lines.append(f'{metric}{{status="{status}"}} {value}')
+        lines.append(f'# HELP {metric}_due Задачи с наступившим сроком')
+        lines.append(f'# TYPE {metric}_due gauge')
+        lines.append(f'{metric}_due {jobs["due"]}')
+        lines.append(
+            f'# HELP {metric}_oldest_due_age_seconds '
+            'Возраст самой старой задачи с наступившим сроком'
+        )
+        lines.append(f'# TYPE {metric}_oldest_due_age_seconds gauge')
+        lines.append(
+            f'{metric}_oldest_due_age_seconds {jobs["oldest_due_age"]}'
+        )
+        return ('\n'.join(lines) + '\n').encode(self.charset)
@@ -0,0 +1,201 @@
+"""Распределение чтения запросов API между репликами базы данных."""
+
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils.functional import SimpleLazyObject
+from rest_framework.permissions import SAFE_METHODS
+
+PIN_PREFIX = 'db:pinned:'
+LAST_WRITE_KEY = 'db:last-write'
+# Вес нового замера в скользящем среднем задержки реплики.
+LATENCY_WEIGHT = 0.2
+
+current_reads = ContextVar('current_reads', default=None)
+
+
+def get_replica_cache():
+    """Возвращает хранилище закреплений за основной базой."""
+    return caches[settings.DATABASE_REPLICA_CACHE_ALIAS]
+
+
+class ReplicaPool:
+    """
+    Выбор реплики для чтения в процессе.
+
+    Реплика, к которой не удалось подключиться, пропускается
+    DATABASE_REPLICA_RETRY секунд.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counter = itertools.count()
+        self.failed_until = {}
+        self.latency = {}
+
+    def get_order(self, aliases):
+        """Возвращает доступные реплики в порядке выбора."""
+        now = time.monotonic()
+        aliases = [
+            alias for alias in aliases
+            if self.failed_until.get(alias, 0) <= now
+        ]
+        if not aliases:
+            return []
+        if settings.DATABASE_REPLICA_SELECTION == 'least_latency':
+            # Реплики без замеров получают запросы первыми.
+            return sorted(aliases, key=lambda a: self.latency.get(a, 0))
+        start = next(self.counter) % len(aliases)
+        return aliases[start:] + aliases[:start]
+
+    def choose(self, aliases):
+        """Возвращает первую реплику, к которой удалось подключиться."""
+        for alias in self.get_order(aliases):
+            try:
+                connections[alias].ensure_connection()
+            except DatabaseError:
+                self.mark_failed(alias)
+                continue
+            return alias
+        return DEFAULT_DB_ALIAS
+
+    def mark_failed(self, alias):
+        """Исключает реплику из выбора на время."""
+        with self.lock:
+            self.failed_until[alias] = (
+                time.monotonic() + settings.DATABASE_REPLICA_RETRY
+            )
+
+    def record(self, alias, seconds):
+        """Учитывает время запроса, обслуженного репликой."""
+        with self.lock:
+            previous = self.latency.get(alias)
+            self.latency[alias] = seconds if previous is None else (
+                previous + LATENCY_WEIGHT * (seconds - previous)
+            )
+
+    def clear(self):
+        """Сбрасывает замеры и отметки о недоступности."""
+        with self.lock:
+            self.failed_until.clear()
+            self.latency.clear()
+
+
+pool = ReplicaPool()
+
+
+def get_pin_key(request):
+    """
+    Возвращает ключ закрепления автора запроса за основной базой.
+
+    Пока DRF не выполнил аутентификацию, пользователь неизвестен, и
+    автор определяется по адресу клиента.
+    """
+    user = getattr(request, 'user', None)
+    if (
+        user is not None
+        and not isinstance(user, SimpleLazyObject)
+        and user.is_authenticated
+    ):
+        return f'{PIN_PREFIX}user:{user.pk}'
+    return f'{PIN_PREFIX}ip:{request.META.get("REMOTE_ADDR")}'
+
+
+class RequestReads:
+    """
+    Выбор базы для чтения в рамках одного запроса.
+
+    Реплики используются только для безопасных запросов к API. Чтение
+    автора, недавно изменявшего данные, идет из основной базы, чтобы он
+    видел свои изменения, пока они доходят до реплик.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.alias = None
+        self.wrote = False
+        self.pinned = {}
+
+    def is_routed(self):
+        """Проверяет, можно ли читать данные запроса из реплики."""
+        match = self.request.resolver_match
+        return (
+            self.request.method in SAFE_METHODS
+            and match is not None
+            and match.route.startswith('api/')
+        )
+
+    def is_pinned(self):
+        """Проверяет, изменял ли автор запроса данные недавно."""
+        key = get_pin_key(self.request)
+        if key not in self.pinned:
+            self.pinned[key] = get_replica_cache().get(key) is not None
+        return self.pinned[key]
+
+    def get_alias(self):
+        """Возвращает базу для чтения или None для основной базы."""
+        if not settings.DATABASE_REPLICAS or not self.is_routed():
+            return None
+        if self.is_pinned():
+            return DEFAULT_DB_ALIAS
+        if self.alias is None:
+            self.alias = pool.choose(settings.DATABASE_REPLICAS)
+        return self.alias
+
+    def used_replica(self):
+        """Проверяет, читались ли данные запроса из реплики."""
+        return self.alias not in (None, DEFAULT_DB_ALIAS)
+
+    def pin(self):
+        """Закрепляет автора за основной базой после изменения данных."""
+        get_replica_cache().set_many(
+            {get_pin_key(self.request): True, LAST_WRITE_KEY: True},
+            timeout=settings.DATABASE_REPLICA_LAG,
+        )
+
+
+def may_be_stale():
+    """
+    Проверяет, могла ли реплика еще не получить недавние изменения.
+
+    Такие ответы не сохраняются в общий кэш, иначе устаревшие данные
+    остались бы в нем до следующей инвалидации.
+    """
+    reads = current_reads.get()
+    return (
+        reads is not None
+        and reads.used_replica()
+        and get_replica_cache().get(LAST_WRITE_KEY) is not None
+    )
+
+
+class ReplicaRouter:
+    """
+    Роутер баз данных: чтение запросов API из реплик, запись в основную.
+
+    Вне запросов (команды, фоновые задачи) используется основная база.
+    """
+
+    def db_for_read(self, model, **hints):
+        """Возвращает реплику для чтения в рамках текущего запроса."""
+        reads = current_reads.get()
+        return reads.get_alias() if reads is not None else None
+
+    def db_for_write(self, model, **hints):
+        """Запись всегда выполняется в основной базе."""
+        reads = current_reads.get()
+        if reads is not None:
+            reads.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Реплики содержат те же данные, что и основная база."""
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= aliases:
+            return True
+        return None
@@ -3,11 +3,12 @@
 import datetime as dt
 
 from rest_framework import serializers
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
 
 from reviews.models import Category, Genre, Title, Review, Comment
-from reviews.constants import MIN_SCORE, MAX_SCORE
+from reviews.constants import MIN_SCORE, MAX_SCORE, NAME_MAX_LENGTH
 from users.constants import (
     USERNAME_MAX_LENGTH,
     USER_EMAIL_MAX_LENGTH,
@@ -16,11 +17,15 @@ from users.validators import (
     validate_username_pattern,
     validate_username_reserved,
 )
+from .fieldsets import SparseFieldsMixin
 
 User = get_user_model()
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(
+    SparseFieldsMixin,
+    serializers.ModelSerializer
+):
     """Сериализатор для модели Category."""
 
     class Meta:
@@ -30,7 +35,10 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(
+    SparseFieldsMixin,
+    serializers.ModelSerializer
+):
     """Сериализатор для модели Genre."""
 
     class Meta:
@@ -40,12 +48,15 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(
+    SparseFieldsMixin,
+    serializers.ModelSerializer
+):
     """Сериализатор для модели Title."""
 
     genre = GenreSerializer(many=True)
     category = CategorySerializer()
-    rating = serializers.FloatField(source='avg_rating', read_only=True)
+    rating = serializers.FloatField(read_only=True)
 
     class Meta:
         """Мета-класс для TitleSerializer."""
@@ -60,9 +71,27 @@ class TitleSerializer(serializers.ModelSerializer):
             'genre',
             'rating'
         )
+        field_dependencies = {'rating': ('rating_sum', 'rating_count')}
 
 
-class TitlePostMethodSerializer(serializers.ModelSerializer):
+class SimilarTitleSerializer(TitleSerializer):
+    """Сериализатор похожего произведения со значением сходства."""
+
+    similarity = serializers.FloatField(read_only=True)
+
+    class Meta(TitleSerializer.Meta):
+        """Мета-класс для SimilarTitleSerializer."""
+
+        fields = TitleSerializer.Meta.fields + ('similarity',)
+        field_dependencies = {
+            **TitleSerializer.Meta.field_dependencies, 'similarity': (),
+        }
+
+
+class TitlePostMethodSerializer(
+    SparseFieldsMixin,
+    serializers.ModelSerializer
+):
     """Сериализатор для создания и обновления Title."""
 
     genre = serializers.SlugRelatedField(
@@ -94,7 +123,23 @@ class TitlePostMethodSerializer(serializers.ModelSerializer):
         return value
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class TitleBulkItemSerializer(TitlePostMethodSerializer):
+    """
+    Сериализатор элемента массовой записи произведений.
+
+    Категория и жанры принимаются как слаги без запросов к базе: их
+    существование проверяется сразу для всего списка.
+    """
+
+    id = serializers.IntegerField(min_value=1, required=False)
+    category = serializers.SlugField()
+    genre = serializers.ListField(child=serializers.SlugField())
+
+
+class ReviewSerializer(
+    SparseFieldsMixin,
+    serializers.ModelSerializer
+):
     """Сериализатор для модели Review."""
 
     author = serializers.SlugRelatedField(
@@ -120,18 +165,20 @@ class ReviewSerializer(serializers.ModelSerializer):
     def validate(self, data):
         """Проверка уникальности отзыва пользователя."""
         request = self.context['request']
-        author = request.user
-        title_id = self.context.get('view').kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
         if (
             request.method == 'POST'
-            and title.reviews.filter(author=author).exists()
+            and self.context['title'].reviews.filter(
+                author=request.user
+            ).exists()
         ):
             raise serializers.ValidationError('Ваш отзыв уже засчитан')
         return data
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(
+    SparseFieldsMixin,
+    serializers.ModelSerializer
+):
     """Сериализатор для модели Comment."""
 
     review = serializers.SlugRelatedField(
@@ -150,7 +197,63 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ('id', 'author', 'pub_date', 'text', 'review')
 
 
-class UserSerializer(serializers.ModelSerializer):
+class ReviewSearchSerializer(ReviewSerializer):
+    """Сериализатор отзыва в результатах поиска."""
+
+    class Meta(ReviewSerializer.Meta):
+        """Мета-класс для ReviewSearchSerializer."""
+
+        exclude = ()
+        fields = ('id', 'title', 'text', 'author', 'score', 'pub_date')
+
+
+class CommentSearchSerializer(CommentSerializer):
+    """Сериализатор комментария в результатах поиска."""
+
+    review = serializers.PrimaryKeyRelatedField(read_only=True)
+    title = serializers.IntegerField(source='review.title_id', read_only=True)
+
+    class Meta(CommentSerializer.Meta):
+        """Мета-класс для CommentSearchSerializer."""
+
+        fields = ('id', 'title', 'review', 'author', 'pub_date', 'text')
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    """Сериализатор параметров поискового запроса."""
+
+    q = serializers.CharField(max_length=NAME_MAX_LENGTH)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.SEARCH_RESULTS_MAX_LIMIT,
+        default=settings.SEARCH_RESULTS_LIMIT,
+    )
+
+
+class RecommendationQuerySerializer(serializers.Serializer):
+    """Сериализатор параметров запроса рекомендаций."""
+
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.RECOMMENDATIONS_MAX_LIMIT,
+        default=settings.RECOMMENDATIONS_LIMIT,
+    )
+
+
+class IdListSerializer(serializers.Serializer):
+    """Сериализатор списка id для запроса нескольких объектов."""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.BATCH_MAX_IDS,
+    )
+
+
+class UserSerializer(
+    SparseFieldsMixin,
+    serializers.ModelSerializer
+):
     """Сериализатор для модели User."""
 
     class Meta:
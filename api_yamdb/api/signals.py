@@ -0,0 +1,156 @@
+"""Обработчики сигналов API приложения."""
+
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from reviews.models import Category, Genre, Review, Title, TitleGenre
+from .authentication import USER_CLAIMS, revoke_user_tokens
+from .cache import invalidate_tags
+
+User = get_user_model()
+
+# Поля пользователя, после изменения которых данные ранее выданных
+# токенов больше не используются.
+TOKEN_FIELDS = (*USER_CLAIMS, 'is_active', 'password')
+# Поля пользователя, которые выводятся в данных его отзывов.
+REVIEW_FIELDS = ('username',)
+
+
+def invalidate_on_commit(*tags):
+    """
+    Меняет версии тегов после фиксации транзакции записи.
+
+    Иначе параллельный запрос успеет прочитать старые строки и сохранить
+    их в кэш под новыми версиями тегов.
+    """
+    transaction.on_commit(partial(invalidate_tags, *tags))
+
+
+def title_tag(title_id):
+    """Тег ответа с данными произведения."""
+    return f'title:{title_id}'
+
+
+def title_reviews_tag(title_id):
+    """Тег состава списка отзывов произведения."""
+    return f'reviews:title:{title_id}'
+
+
+def review_tag(review_id):
+    """Тег ответа с данными отзыва."""
+    return f'review:{review_id}'
+
+
+@receiver((post_save, post_delete), sender=Category)
+def invalidate_categories(sender, **kwargs):
+    """Категории входят в списки категорий и в данные произведений."""
+    invalidate_on_commit('categories')
+
+
+@receiver((post_save, post_delete), sender=Genre)
+def invalidate_genres(sender, **kwargs):
+    """Жанры входят в списки жанров и в данные произведений."""
+    invalidate_on_commit('genres')
+
+
+@receiver((post_save, post_delete), sender=Title)
+def invalidate_title(sender, instance, **kwargs):
+    """Изменение произведения может менять состав списков произведений."""
+    invalidate_on_commit(
+        'titles', title_tag(instance.pk), title_reviews_tag(instance.pk)
+    )
+
+
+@receiver((post_save, post_delete), sender=TitleGenre)
+def invalidate_title_genre(sender, instance, **kwargs):
+    """Связь с жанром меняет данные произведения и фильтр по жанру."""
+    invalidate_on_commit('titles', title_tag(instance.title_id))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, instance, action, reverse, pk_set,
+                            **kwargs):
+    """Обрабатывает изменение жанров через менеджер связи."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        title_ids = [instance.pk]
+    elif pk_set:
+        title_ids = pk_set
+    else:
+        title_ids = instance.titles.values_list('pk', flat=True)
+    invalidate_on_commit('titles', *(title_tag(pk) for pk in title_ids))
+
+
+@receiver(post_save, sender=Review)
+def invalidate_saved_review(sender, instance, created, **kwargs):
+    """Новый отзыв меняет состав списка, измененный - только себя."""
+    tags = [title_tag(instance.title_id)]
+    if created:
+        tags.append(title_reviews_tag(instance.title_id))
+    else:
+        tags.append(review_tag(instance.pk))
+    invalidate_on_commit(*tags)
+
+
+@receiver(post_delete, sender=Review)
+def invalidate_deleted_review(sender, instance, **kwargs):
+    """Удаление отзыва меняет рейтинг и состав списка отзывов."""
+    invalidate_on_commit(
+        title_tag(instance.title_id),
+        title_reviews_tag(instance.title_id),
+        review_tag(instance.pk),
+    )
+
+
+@receiver(pre_save, sender=User)
+def remember_changed_user_fields(sender, instance, update_fields=None,
+                                 **kwargs):
+    """Сравнивает поля токенов и отзывов с сохраненной записью."""
+    instance._changed_fields = set()
+    if instance._state.adding or instance.pk is None:
+        return
+    fields = {*TOKEN_FIELDS, *REVIEW_FIELDS}
+    if update_fields is not None:
+        fields &= set(update_fields)
+    if not fields:
+        return
+    stored = sender.objects.filter(pk=instance.pk).values(*fields).first()
+    if stored is None:
+        return
+    instance._changed_fields = {
+        field for field in fields if stored[field] != getattr(instance, field)
+    }
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_reviews(sender, instance, created, **kwargs):
+    """Имя автора входит в данные его отзывов."""
+    if not set(REVIEW_FIELDS) & getattr(instance, '_changed_fields', set()):
+        return
+    invalidate_on_commit(*(
+        review_tag(pk)
+        for pk in instance.reviews.values_list('pk', flat=True)
+    ))
+
+
+@receiver(post_save, sender=User)
+def revoke_changed_user_tokens(sender, instance, created, **kwargs):
+    """Роль и флаги из ранее выданных токенов больше не используются."""
+    if set(TOKEN_FIELDS) & getattr(instance, '_changed_fields', set()):
+        revoke_user_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    """Токены удаленного пользователя больше не действуют."""
+    revoke_user_tokens(instance.pk)
@@ -11,7 +11,9 @@ from .views import (
     CommentViewSet,
     UserViewSet,
     SignUpView,
-    TokenView
+    TokenView,
+    SearchView,
+    MetricsView,
 )
 
 router_v1 = DefaultRouter()
@@ -36,5 +38,9 @@ urlpatterns = [
         path('', include(router_v1.urls)),
         path('auth/signup/', SignUpView.as_view(), name='signup_v1'),
         path('auth/token/', TokenView.as_view(), name='token_v1'),
+        path('search/', SearchView.as_view(), name='search_v1'),
+        path(
+            '_internal/metrics', MetricsView.as_view(), name='metrics_v1'
+        ),
     ])),
 ]
@@ -1,44 +1,75 @@
 """Views для API приложения."""
 
-from django.db.models import Avg
+from django.db import transaction
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
 from django.conf import settings
+from django.db.models import F
+from django.http import Http404
 from rest_framework import filters, mixins, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.filters import SearchFilter
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import AccessToken
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.generics import get_object_or_404
+from rest_framework.settings import api_settings
 
+from .authentication import RoleAccessToken
+from .bulk import bulk_save_titles
 from .filters import TitleFilter
+from .mixins import (
+    AsyncReadMixin,
+    BatchListMixin,
+    CachedGetMixin,
+    CachedListMixin,
+    ConditionalGetMixin,
+    ConditionalListMixin,
+    NestedResourceMixin,
+    SerializerMetricsMixin,
+    SparseFieldsetMixin,
+)
+from .metrics import registry, time_serializer
+from .signals import review_tag, title_reviews_tag, title_tag
+from .pagination import OptionalCursorPagination
+from .renderers import PrometheusRenderer
 from .serializers import (
     CategorySerializer,
     GenreSerializer,
+    SimilarTitleSerializer,
     TitlePostMethodSerializer,
     TitleSerializer,
     ReviewSerializer,
     CommentSerializer,
+    RecommendationQuerySerializer,
     UserSerializer,
     UserMeSerializer,
     SignUpSerializer,
-    TokenSerializer
+    TokenSerializer,
+    ReviewSearchSerializer,
+    CommentSearchSerializer,
+    SearchQuerySerializer,
+)
+from reviews.models import (
+    Category, Genre, Title, TitleGenre, Review, Comment
 )
-from reviews.models import Category, Genre, Title, Review, Comment
 from .permissions import (
     AdminModerAuthorOrReadOnly,
     IsAdminOrReadOnly,
     IsAdminOrSuperuser
 )
+from jobs.queue import queue_depth, send_mail_later
+from reviews.recommendations import get_recommendation_model
+from reviews.search import get_search_backend
+from reviews.utils import change_title_rating, recalculate_title_ratings
 from users.utils import generate_confirmation_code, create_or_update_user
 
 User = get_user_model()
 
 
 class CreateDestroyListViewSet(
+    SparseFieldsetMixin,
+    SerializerMetricsMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -49,32 +80,61 @@ class CreateDestroyListViewSet(
     pass
 
 
-class CategoryViewSet(CreateDestroyListViewSet):
+class CategoryViewSet(
+    ConditionalListMixin,
+    CachedListMixin,
+    CreateDestroyListViewSet
+):
     """ViewSet для модели Category."""
 
     queryset = Category.objects.all()
+    version_models = (Category,)
     serializer_class = CategorySerializer
     permission_classes = (IsAdminOrReadOnly,)
     lookup_field = 'slug'
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
 
+    def get_cache_tags(self):
+        """Возвращает теги кэша списка категорий."""
+        return ('categories',)
 
-class GenreViewSet(CreateDestroyListViewSet):
+
+class GenreViewSet(
+    ConditionalListMixin,
+    CachedListMixin,
+    CreateDestroyListViewSet
+):
     """ViewSet для модели Genre."""
 
     queryset = Genre.objects.all()
+    version_models = (Genre,)
     serializer_class = GenreSerializer
     permission_classes = (IsAdminOrReadOnly,)
     lookup_field = 'slug'
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
 
+    def get_cache_tags(self):
+        """Возвращает теги кэша списка жанров."""
+        return ('genres',)
 
-class TitleViewSet(viewsets.ModelViewSet):
+
+class TitleViewSet(
+    ConditionalGetMixin,
+    CachedGetMixin,
+    SparseFieldsetMixin,
+    SerializerMetricsMixin,
+    BatchListMixin,
+    AsyncReadMixin,
+    viewsets.ModelViewSet
+):
     """ViewSet для модели Title."""
 
-    queryset = Title.objects.annotate(avg_rating=Avg('reviews__score'))
+    queryset = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    )
+    version_models = (Title, TitleGenre, Category, Genre, Review)
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
@@ -82,53 +142,150 @@ class TitleViewSet(viewsets.ModelViewSet):
 
     def get_serializer_class(self):
         """Возвращает соответствующий сериализатор в зависимости от метода."""
-        if self.request.method == 'GET':
+        if self.action == 'similar':
+            return SimilarTitleSerializer
+        if self.request.method == 'GET' or self.action == 'batch':
             return TitleSerializer
         return TitlePostMethodSerializer
 
-
-class ReviewViewSet(viewsets.ModelViewSet):
+    def get_cache_tags(self):
+        """Возвращает теги кэша: список зависит и от состава произведений."""
+        tags = ('categories', 'genres')
+        if self.action == 'list':
+            tags += ('titles',)
+        return tags
+
+    def get_object_cache_tag(self, pk):
+        """Возвращает тег кэша произведения."""
+        return title_tag(pk)
+
+    @action(detail=False, methods=('post',))
+    def bulk(self, request):
+        """
+        Создает и изменяет произведения списком.
+
+        Элементы с id изменяют существующие произведения, без id -
+        создают новые; запись выполняется, только если верны все
+        элементы.
+        """
+        return Response(bulk_save_titles(request.data))
+
+    @action(detail=True)
+    def similar(self, request, pk=None):
+        """
+        Возвращает похожие произведения по убыванию сходства.
+
+        Соседи читаются из индекса, который обновляет команда
+        build_similar_titles; фильтры списка произведений применяются к
+        ним так же, как к списку.
+        """
+        try:
+            titles = list(
+                self.filter_queryset(self.get_queryset())
+                .filter(similar_to__title_id=pk)
+                .annotate(similarity=F('similar_to__score'))
+                .order_by('-similar_to__score', 'id')
+            )
+        except (TypeError, ValueError):
+            raise Http404
+        if not titles:
+            get_object_or_404(Title, pk=pk)
+        return Response(self.get_serializer(titles, many=True).data)
+
+
+class ReviewViewSet(
+    NestedResourceMixin,
+    CachedGetMixin,
+    SparseFieldsetMixin,
+    SerializerMetricsMixin,
+    AsyncReadMixin,
+    viewsets.ModelViewSet
+):
     """ViewSet для модели Review."""
 
     serializer_class = ReviewSerializer
     http_method_names = ['get', 'post', 'patch', 'delete']
     permission_classes = (AdminModerAuthorOrReadOnly,)
+    pagination_class = OptionalCursorPagination
+    parent_model = Title
+    parent_lookups = {'id': 'title_id'}
 
     def get_queryset(self):
         """Возвращает queryset отзывов для конкретного произведения."""
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        return title.reviews.all()
+        return self.get_parent().reviews.select_related('author').order_by(
+            'pub_date', 'id'
+        )
 
-    def perform_create(self, serializer):
-        """Создает отзыв для конкретного произведения."""
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        serializer.save(author=self.request.user, title=title)
+    def get_cache_tags(self):
+        """Возвращает тег состава отзывов произведения."""
+        return (title_reviews_tag(self.kwargs.get('title_id')),)
 
+    def get_object_cache_tag(self, pk):
+        """Возвращает тег кэша отзыва."""
+        return review_tag(pk)
 
-class CommentViewSet(viewsets.ModelViewSet):
+    def perform_create(self, serializer):
+        """Создает отзыв для конкретного произведения."""
+        with transaction.atomic():
+            review = serializer.save(
+                author=self.request.user, title=self.get_parent()
+            )
+            change_title_rating(review.title_id, review.score, 1)
+
+    def perform_update(self, serializer):
+        """Обновляет отзыв и сохраненный рейтинг произведения."""
+        old_score = serializer.instance.score
+        with transaction.atomic():
+            review = serializer.save()
+            if review.score != old_score:
+                change_title_rating(review.title_id, review.score - old_score)
+
+    def perform_destroy(self, instance):
+        """Удаляет отзыв и учитывает это в рейтинге произведения."""
+        with transaction.atomic():
+            instance.delete()
+            change_title_rating(instance.title_id, -instance.score, -1)
+
+
+class CommentViewSet(
+    NestedResourceMixin,
+    SparseFieldsetMixin,
+    SerializerMetricsMixin,
+    AsyncReadMixin,
+    viewsets.ModelViewSet
+):
     """ViewSet для модели Comment."""
 
     queryset = Comment.objects.all().order_by('id')
     serializer_class = CommentSerializer
     http_method_names = ['get', 'post', 'patch', 'delete']
     permission_classes = (AdminModerAuthorOrReadOnly,)
+    pagination_class = OptionalCursorPagination
+    parent_model = Review
+    parent_lookups = {'id': 'reviews_id', 'title_id': 'title_id'}
+    parent_select_related = ('title',)
 
     def get_queryset(self):
-        """Возвращает queryset комментариев для конкретного отзыва."""
-        review = get_object_or_404(
-            Review,
-            id=self.kwargs.get('reviews_id'))
-        return review.comments.all()
+        """
+        Возвращает queryset комментариев для конкретного отзыва.
+
+        Менеджер связи проставляет комментариям уже загруженный отзыв,
+        поэтому для поля review отдельные запросы не выполняются.
+        """
+        return self.get_parent().comments.select_related('author').order_by(
+            'pub_date', 'id'
+        )
 
     def perform_create(self, serializer):
         """Создает комментарий для конкретного отзыва."""
-        review = get_object_or_404(
-            Review,
-            id=self.kwargs.get('reviews_id'))
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.get_parent())
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(
+    SparseFieldsetMixin,
+    SerializerMetricsMixin,
+    viewsets.ModelViewSet
+):
     """ViewSet для модели User."""
 
     queryset = User.objects.all()
@@ -139,6 +296,16 @@ class UserViewSet(viewsets.ModelViewSet):
     search_fields = ('username',)
     http_method_names = ['get', 'post', 'patch', 'delete']
 
+    def perform_destroy(self, instance):
+        """Удаляет пользователя и пересчитывает рейтинги его отзывов."""
+        title_ids = list(
+            instance.reviews.values_list('title_id', flat=True)
+        )
+        with transaction.atomic():
+            instance.delete()
+            if title_ids:
+                recalculate_title_ratings(title_ids)
+
     @action(
         detail=False,
         methods=['get', 'patch'],
@@ -147,12 +314,14 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def me(self, request):
         """Получение и обновление профиля текущего пользователя."""
+        # Пользователь из токена содержит не все поля профиля.
+        user = get_object_or_404(User, pk=request.user.pk)
         if request.method == 'GET':
-            serializer = self.get_serializer(request.user)
+            serializer = self.get_serializer(user)
             return Response(serializer.data)
 
         serializer = self.get_serializer(
-            request.user,
+            user,
             data=request.data,
             partial=True
         )
@@ -160,6 +329,41 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer.save()
         return Response(serializer.data)
 
+    @action(
+        detail=False,
+        url_path='me/recommendations',
+        permission_classes=(IsAuthenticated,),
+    )
+    def recommendations(self, request):
+        """
+        Рекомендует текущему пользователю произведения без его отзывов.
+
+        Без обученной модели, а также пользователю, которого не было при
+        обучении, рекомендуются произведения с наибольшим числом оценок.
+        """
+        params = RecommendationQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        limit = params.validated_data['limit']
+        reviewed = list(
+            Review.objects.filter(author_id=request.user.pk).values_list(
+                'title_id', flat=True
+            )
+        )
+        model = get_recommendation_model()
+        ids = model.recommend(
+            request.user.pk, reviewed, limit
+        ) if model else None
+        if ids is None:
+            titles = TitleViewSet.queryset.exclude(pk__in=reviewed).order_by(
+                '-rating_count', 'id'
+            )[:limit]
+        else:
+            found = TitleViewSet.queryset.in_bulk(ids)
+            titles = [found[pk] for pk in ids if pk in found]
+        return Response(time_serializer(TitleSerializer(
+            titles, many=True, context=self.get_serializer_context()
+        )).data)
+
 
 class SignUpView(APIView):
     """Представление для регистрации пользователя."""
@@ -178,7 +382,7 @@ class SignUpView(APIView):
 
         create_or_update_user(username, email, confirmation_code)
 
-        send_mail(
+        send_mail_later(
             'Код подтверждения для YaMDb',
             f'Ваш код подтверждения: {confirmation_code}',
             settings.DEFAULT_FROM_EMAIL,
@@ -199,8 +403,60 @@ class TokenView(APIView):
         serializer.is_valid(raise_exception=True)
 
         user = serializer.validated_data['user']
-        token = AccessToken.for_user(user)
+        token = RoleAccessToken.for_user(user)
         return Response(
             {'token': str(token)},
             status=status.HTTP_200_OK
         )
+
+
+class SearchView(APIView):
+    """Полнотекстовый поиск по произведениям, отзывам и комментариям."""
+
+    permission_classes = (AllowAny,)
+
+    def get(self, request):
+        """Возвращает найденные объекты по убыванию релевантности."""
+        params = SearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data['q']
+        limit = params.validated_data['limit']
+        backend = get_search_backend()
+        titles = backend.search(
+            Title, query, limit, TitleViewSet.queryset
+        )
+        reviews = backend.search(
+            Review, query, limit, Review.objects.select_related('author')
+        )
+        comments = backend.search(
+            Comment, query, limit,
+            Comment.objects.select_related('author', 'review')
+        )
+        context = {'request': request, 'view': self}
+        return Response({
+            'titles': time_serializer(TitleSerializer(
+                titles, many=True, context=context
+            )).data,
+            'reviews': time_serializer(ReviewSearchSerializer(
+                reviews, many=True, context=context
+            )).data,
+            'comments': time_serializer(CommentSearchSerializer(
+                comments, many=True, context=context
+            )).data,
+        })
+
+
+class MetricsView(APIView):
+    """Метрики запросов к API по маршрутам."""
+
+    permission_classes = (IsAdminOrSuperuser,)
+    renderer_classes = (
+        *api_settings.DEFAULT_RENDERER_CLASSES, PrometheusRenderer
+    )
+
+    def get(self, request):
+        """Возвращает перцентили метрик маршрутов и состояние очереди."""
+        return Response({
+            'routes': registry.report(),
+            'jobs': queue_depth(),
+        })
@@ -6,13 +6,83 @@ from datetime import timedelta
 # JWT настройки
 JWT_ACCESS_TOKEN_LIFETIME_DAYS = 1
 JWT_REFRESH_TOKEN_LIFETIME_DAYS = 7
+# Время жизни кэша пользователей в памяти процесса для токенов без ролей
+# (0 - кэш выключен).
+JWT_USER_CACHE_TTL = 0
+# Наибольшее число пользователей в этом кэше.
+JWT_USER_CACHE_SIZE = 10_000
+# Кэш списка отзыва токенов. Он должен быть общим для всех процессов
+# (файловый, база, Redis, Memcached), иначе отзыв действует только в
+# процессе, где изменили пользователя; проверяется при запуске.
+JWT_REVOCATION_CACHE_ALIAS = 'shared'
 
 # Настройки пагинации
 DEFAULT_PAGE_SIZE = 10
+# Наибольшее число id в запросе нескольких объектов по списку id.
+BATCH_MAX_IDS = 1000
+# Наибольшее число произведений в одном запросе массовой записи.
+TITLE_BULK_MAX_ITEMS = 5000
+
+# Настройки кэша ответов API
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = 300
+
+# Настройки поиска
+SEARCH_RESULTS_LIMIT = 10
+SEARCH_RESULTS_MAX_LIMIT = 50
+
+# Настройки метрик запросов: число последних запросов маршрута,
+# по которым считаются перцентили.
+METRICS_WINDOW = 1000
 
 # Настройки email
 DEFAULT_FROM_EMAIL = 'noreply@yamdb.com'
 
+# Настройки очереди фоновых задач
+# Выполнять задачи сразу при постановке в очередь (для тестов и отладки).
+JOBS_EAGER = False
+JOBS_BATCH_SIZE = 100
+JOBS_POLL_INTERVAL = 1
+JOBS_MAX_ATTEMPTS = 5
+# Пауза перед первым повтором в секундах, далее удваивается.
+JOBS_RETRY_DELAY = 30
+JOBS_RETRY_MAX_DELAY = 3600
+# Задача, которую обработчик не завершил за это время, забирается снова.
+JOBS_LOCK_TIMEOUT = 600
+
+# Настройки SQLite, применяются к каждому новому соединению.
+# WAL позволяет читать базу во время записи.
+SQLITE_JOURNAL_MODE = 'WAL'
+# В режиме WAL NORMAL не повреждает базу при сбое, но последние
+# транзакции могут потеряться при отключении питания.
+SQLITE_SYNCHRONOUS = 'NORMAL'
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+# Отрицательное значение - размер кэша страниц в КиБ.
+SQLITE_CACHE_SIZE = -64 * 1024
+# Сколько секунд ждать освобождения блокировки записи.
+SQLITE_BUSY_TIMEOUT = 20
+# Транзакции сразу берут блокировку записи, поэтому ожидание работает
+# и для транзакций, которые сначала читают, а затем пишут.
+SQLITE_TRANSACTION_MODE = 'IMMEDIATE'
+
+# Реплики для чтения: псевдонимы из DATABASES. Безопасные запросы к API
+# читают из них, запись всегда идет в основную базу.
+DATABASE_REPLICAS = []
+# 'round_robin' - по очереди, 'least_latency' - с наименьшей задержкой.
+DATABASE_REPLICA_SELECTION = 'round_robin'
+# Сколько секунд после записи ее автор читает из основной базы
+# (должно превышать отставание реплик).
+DATABASE_REPLICA_LAG = 5
+# На сколько секунд исключается реплика, к которой не удалось подключиться.
+DATABASE_REPLICA_RETRY = 30
+# Кэш закреплений за основной базой; при нескольких процессах - общий.
+DATABASE_REPLICA_CACHE_ALIAS = 'default'
+
+# Асинхронные list и retrieve произведений, отзывов и комментариев.
+# Включайте при запуске под ASGI: под WSGI каждый такой запрос
+# выполняется в отдельном цикле событий и становится медленнее.
+API_ASYNC_READS = False
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # SECURITY WARNING: keep the secret key used in production secret!
@@ -38,9 +108,13 @@ INSTALLED_APPS = [
     'reviews.apps.ReviewsConfig',
     'api.apps.ApiConfig',
     'users.apps.UsersConfig',
+    'jobs.apps.JobsConfig',
+    'benchmarks.apps.BenchmarksConfig',
 ]
 
 MIDDLEWARE = [
+    'api.middleware.QueryMetricsMiddleware',
+    'api.middleware.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -79,9 +153,41 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'init_command': (
+                f'PRAGMA journal_mode={SQLITE_JOURNAL_MODE};'
+                f'PRAGMA synchronous={SQLITE_SYNCHRONOUS};'
+                f'PRAGMA mmap_size={SQLITE_MMAP_SIZE};'
+                f'PRAGMA cache_size={SQLITE_CACHE_SIZE};'
+            ),
+            'timeout': SQLITE_BUSY_TIMEOUT,
+            'transaction_mode': SQLITE_TRANSACTION_MODE,
+        },
     }
 }
 
+# Реплики добавляются в DATABASES и перечисляются в DATABASE_REPLICAS,
+# например 'replica': {..., 'TEST': {'MIRROR': 'default'}}.
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+
+
+# Cache
+# Для нескольких процессов подключите общий бэкенд, например
+# 'django.core.cache.backends.filebased.FileBasedCache' или
+# 'django.core.cache.backends.redis.RedisCache'.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'yamdb',
+    },
+    # Общий для процессов сервера кэш.
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    },
+}
+
 
 # Password validation
 
@@ -134,21 +240,58 @@ STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
 DATA_TO_LOAD_DIR = BASE_DIR / 'static/data/'
 
+# Полнотекстовый поиск: SQLite FTS5 или PostgreSQL tsvector
+# ('reviews.search.PostgresSearchBackend').
+SEARCH_BACKEND = 'reviews.search.SQLiteFTSBackend'
+
+# Индекс похожих произведений (команда build_similar_titles): число
+# соседей, веса признаков, оценка, с которой отзыв считается высоким, и
+# разница в годах, при которой близость по году падает вдвое.
+TITLE_SIMILARITY_NEIGHBORS = 20
+TITLE_SIMILARITY_WEIGHTS = {
+    'genre': 0.4,
+    'ratings': 0.3,
+    'category': 0.2,
+    'year': 0.1,
+}
+TITLE_SIMILARITY_HIGH_SCORE = 8
+TITLE_SIMILARITY_YEAR_SCALE = 10
+
+# Рекомендации (команда train_recommendations): каталог с факторами,
+# размерность факторов, регуляризация и число итераций ALS, длина списка
+# рекомендаций по умолчанию и наибольшая.
+RECOMMENDATIONS_DIR = BASE_DIR / 'recommendations'
+RECOMMENDATIONS_FACTORS = 32
+RECOMMENDATIONS_REGULARIZATION = 0.1
+RECOMMENDATIONS_ITERATIONS = 10
+RECOMMENDATIONS_LIMIT = 10
+RECOMMENDATIONS_MAX_LIMIT = 50
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': (
-        'rest_framework.pagination.PageNumberPagination'
+        'api.pagination.AsyncPageNumberPagination'
     ),
     'PAGE_SIZE': DEFAULT_PAGE_SIZE,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'EXCEPTION_HANDLER': 'api.exceptions.exception_handler',
 }
 
 SIMPLE_JWT = {
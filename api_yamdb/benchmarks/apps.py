@@ -0,0 +1,10 @@
+"""Конфигурация приложения benchmarks."""
+
+from django.apps import AppConfig
+
+
+class BenchmarksConfig(AppConfig):
+    """Конфигурация приложения benchmarks."""
+
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'benchmarks'
@@ -0,0 +1,63 @@
+"""Отдельная база и синтетический набор данных для замеров."""
+
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from reviews.csv_import import DEFAULT_CHUNK_SIZE
+from reviews.generator import DataGenerator, generate_database
+from reviews.models import Comment, Review, Title
+
+
+def seed_dataset(titles, reviews, comments, users=None, seed=42,
+                 chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    Заполняет пустую базу набором данных generate_data.
+
+    Возвращает фактические размеры набора: часть отзывов самых
+    популярных произведений отбрасывается, если им не хватает авторов.
+    """
+    generator = DataGenerator(titles, reviews, comments, users, seed=seed)
+    generate_database(generator, chunk_size, progress)
+    return generator.sizes
+
+
+def dataset_exists(titles, reviews, comments, users=None, seed=42):
+    """Проверяет, что в базе уже есть набор данных с такими параметрами."""
+    sizes = DataGenerator(titles, reviews, comments, users, seed=seed).sizes
+    exists = (
+        Title.objects.count() == sizes['titles']
+        and Review.objects.count() == sizes['reviews']
+        and Comment.objects.count() == sizes['comments']
+    )
+    return sizes if exists else None
+
+
+def get_database_name(connection, label='benchmark'):
+    """Возвращает имя отдельной базы по умолчанию."""
+    if connection.vendor == 'sqlite':
+        return str(settings.BASE_DIR / f'{label}.sqlite3')
+    return f'{label}_{connection.settings_dict["NAME"]}'
+
+
+@contextmanager
+def benchmark_database(name=None, keepdb=False, label='benchmark'):
+    """
+    Создает отдельную базу с миграциями и переключает на нее соединение.
+
+    После выхода база удаляется, если не передан keepdb.
+    """
+    connection = connections[DEFAULT_DB_ALIAS]
+    connection.settings_dict['TEST']['NAME'] = (
+        name or get_database_name(connection, label)
+    )
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, keepdb=keepdb, serialize=False,
+    )
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(
+            old_name, verbosity=0, keepdb=keepdb
+        )
@@ -0,0 +1,88 @@
+"""Проверка планов SQL запросов, которые выполняют эндпоинты API."""
+
+import re
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+EXPLAINED_STATEMENTS = ('SELECT', 'UPDATE', 'DELETE')
+# Полный просмотр таблицы или ее индекса; поиск по FTS5 выглядит как
+# SCAN ... VIRTUAL TABLE и полным просмотром не является.
+SQLITE_SCAN_RE = re.compile(r'^SCAN (\w+)(?:$| USING )')
+SQLITE_SORT_RE = re.compile(
+    r'^USE TEMP B-TREE FOR (?:RIGHT PART OF )?ORDER BY'
+)
+POSTGRES_SCAN_RE = re.compile(r'Seq Scan on (\w+)')
+POSTGRES_SORT_RE = re.compile(r'^\s*(?:->\s*)?Sort\b')
+
+# Полные просмотры, которых нельзя избежать: списки без фильтров читают
+# индекс сортировки до LIMIT и считают строки для пагинации, поиск
+# подстроки в имени пользователя не может использовать индекс.
+ALLOWED_SCANS = {
+    'categories_list': {'reviews_category'},
+    'genres_list': {'reviews_genre'},
+    'titles_list': {'reviews_title'},
+    'titles_list_deep_page': {'reviews_title'},
+    'users_search': {'users_user'},
+}
+
+
+def explain(sql):
+    """
+    Возвращает строки плана запроса.
+
+    На PostgreSQL последовательное чтение запрещается на время EXPLAIN,
+    поэтому оно остается в плане, только если подходящего индекса нет.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+        if connection.vendor == 'postgresql':
+            with transaction.atomic():
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute(f'EXPLAIN {sql}')
+                return [row[0] for row in cursor.fetchall()]
+    raise NotImplementedError(
+        f'Проверка планов не поддерживается для {connection.vendor}'
+    )
+
+
+def find_scans(plan):
+    """Возвращает таблицы, которые план читает целиком без индекса."""
+    pattern = (
+        SQLITE_SCAN_RE if connection.vendor == 'sqlite' else POSTGRES_SCAN_RE
+    )
+    return {
+        match.group(1)
+        for match in map(pattern.search, plan) if match is not None
+    }
+
+
+def has_sort(plan):
+    """Проверяет, сортирует ли план строки без индекса."""
+    pattern = (
+        SQLITE_SORT_RE if connection.vendor == 'sqlite' else POSTGRES_SORT_RE
+    )
+    return any(pattern.search(line) for line in plan)
+
+
+def explain_scenario(transport, scenario, token=None):
+    """
+    Выполняет запрос сценария и проверяет планы всех его SQL запросов.
+
+    Возвращает код ответа и список кортежей (sql, план, таблицы,
+    прочитанные целиком без разрешения в ALLOWED_SCANS).
+    """
+    path, data, token = scenario.build(0, token)
+    with CaptureQueriesContext(connection) as queries:
+        status = transport.request(scenario.method, path, data, token)
+    allowed = ALLOWED_SCANS.get(scenario.name, set())
+    results = []
+    for query in queries.captured_queries:
+        sql = query['sql']
+        if not sql.lstrip().upper().startswith(EXPLAINED_STATEMENTS):
+            continue
+        plan = explain(sql)
+        results.append((sql, plan, find_scans(plan) - allowed))
+    return status, results
@@ -0,0 +1,66 @@
+"""Команда для сравнения JSON рендереров на больших страницах."""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.renderers import orjson
+from benchmarks.dataset import benchmark_database, seed_dataset
+from benchmarks.rendering import PAGE_SIZES, compare_renderers
+from benchmarks.runner import get_environment
+
+
+class Command(BaseCommand):
+    """Команда для сравнения JSON рендереров на больших страницах."""
+
+    help = (
+        'Сравнивает время рендеринга и разбора страниц произведений и '
+        'отзывов стандартным JSON рендерером DRF и рендерером API. '
+        'Результат выводится в JSON.'
+    )
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы командной строки."""
+        parser.add_argument(
+            '--page-size', type=int, action='append', default=None,
+            help='Размер страницы (можно указать несколько раз).',
+        )
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument(
+            '--database-name', default=None,
+            help='Имя отдельной базы для замера (для SQLite - путь).',
+        )
+        parser.add_argument('--output', help='Файл для результатов JSON.')
+
+    def handle(self, *args, **options):
+        """Обрабатывает команду замера."""
+        page_sizes = options['page_size'] or PAGE_SIZES
+        if min(page_sizes) < 1 or options['iterations'] < 1:
+            raise CommandError(
+                'Размер страницы и число итераций должны быть '
+                'положительными.'
+            )
+        largest = max(page_sizes)
+        with benchmark_database(options['database_name'], label='renderers'):
+            seed_dataset(titles=largest, reviews=largest * 2, comments=0)
+            report = {
+                **get_environment(),
+                'orjson': orjson.__version__ if orjson else None,
+                'results': compare_renderers(
+                    page_sizes, options['iterations']
+                ),
+            }
+        for kind, sizes in report['results'].items():
+            for size, summary in sizes.items():
+                self.stderr.write(
+                    f'{kind} {size}: {summary["render_json_ms"]} -> '
+                    f'{summary["render_fast_ms"]} мс '
+                    f'(x{summary["render_speedup"]}), разбор '
+                    f'x{summary["parse_speedup"]}'
+                )
+        content = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(content + '\n')
+        else:
+            self.stdout.write(content)
@@ -0,0 +1,72 @@
+"""Команда для проверки планов SQL запросов эндпоинтов API."""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from benchmarks.dataset import benchmark_database, seed_dataset
+from benchmarks.explain import explain_scenario, has_sort
+from benchmarks.management.commands.run_benchmarks import (
+    BENCHMARK_SETTINGS,
+    DUMMY_CACHES,
+)
+from benchmarks.runner import ClientTransport
+from benchmarks.scenarios import build_scenarios, prepare_context
+
+
+class Command(BaseCommand):
+    """Команда для проверки планов SQL запросов эндпоинтов API."""
+
+    help = (
+        'Выполняет запросы ко всем эндпоинтам API на отдельной базе, '
+        'получает планы их SQL запросов и завершается ошибкой, если '
+        'какая-либо таблица читается целиком без индекса.'
+    )
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы командной строки."""
+        parser.add_argument(
+            '--database-name', default=None,
+            help='Имя отдельной базы для проверки (для SQLite - путь).',
+        )
+
+    def handle(self, *args, **options):
+        """Обрабатывает команду проверки планов."""
+        with benchmark_database(options['database_name'], label='explain'):
+            with override_settings(**BENCHMARK_SETTINGS, CACHES=DUMMY_CACHES):
+                failures = self.check_plans(options['verbosity'])
+        if failures:
+            raise CommandError(
+                f'Полное чтение таблиц без индекса: {failures}.'
+            )
+        self.stdout.write('Все запросы используют индексы.')
+
+    def check_plans(self, verbosity):
+        """Проверяет планы всех сценариев и возвращает число нарушений."""
+        sizes = seed_dataset(titles=200, reviews=2000, comments=2000)
+        context = prepare_context()
+        failures = 0
+        with ClientTransport() as transport:
+            for scenario in build_scenarios(context, sizes):
+                status, results = explain_scenario(
+                    transport, scenario, context['admin_token']
+                )
+                if status >= 400:
+                    raise CommandError(
+                        f'Сценарий {scenario.name} вернул код {status}.'
+                    )
+                self.stdout.write(
+                    f'{scenario.name}: {len(results)} запросов'
+                )
+                for sql, plan, scans in results:
+                    if scans:
+                        failures += 1
+                        self.stdout.write(
+                            f'  ОШИБКА: {", ".join(sorted(scans))} без '
+                            f'индекса в запросе {sql}'
+                        )
+                    elif has_sort(plan) and verbosity > 1:
+                        self.stdout.write(f'  сортировка без индекса: {sql}')
+                    if scans or verbosity > 2:
+                        for line in plan:
+                            self.stdout.write(f'    {line}')
+        return failures
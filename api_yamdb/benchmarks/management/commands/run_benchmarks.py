@@ -0,0 +1,215 @@
+"""Команда для замера производительности эндпоинтов API."""
+
+import json
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from benchmarks.dataset import (
+    benchmark_database,
+    dataset_exists,
+    seed_dataset,
+)
+from benchmarks.runner import (
+    TRANSPORTS,
+    get_environment,
+    run_mixed,
+    run_scenario,
+)
+from benchmarks.scenarios import (
+    build_scenarios,
+    discard_written_reviews,
+    prepare_context,
+)
+from reviews.models import Title
+
+# Настройки на время замера: письма не отправляются, задачи копятся.
+BENCHMARK_SETTINGS = {
+    'DEBUG': False,
+    'JOBS_EAGER': False,
+    'EMAIL_BACKEND': 'django.core.mail.backends.locmem.EmailBackend',
+}
+# Без кэша ответов и без списка отзыва токенов, который проверяется в
+# каждом запросе с токеном.
+DUMMY_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+    'shared': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+}
+
+
+class Command(BaseCommand):
+    """Команда для замера производительности эндпоинтов API."""
+
+    help = (
+        'Заполняет отдельную базу синтетическими данными и замеряет '
+        'задержку и пропускную способность эндпоинтов API. Результат '
+        'выводится в JSON.'
+    )
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы командной строки."""
+        parser.add_argument('--titles', type=int, default=1000)
+        parser.add_argument('--reviews', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=20000)
+        parser.add_argument(
+            '--users', type=int, default=None,
+            help='Количество пользователей (не меньше нужного для отзывов).',
+        )
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--warmup', type=int, default=20)
+        parser.add_argument(
+            '--concurrency', type=int, default=1,
+            help='Количество потоков, одновременно выполняющих запросы.',
+        )
+        parser.add_argument(
+            '--transport', choices=(*TRANSPORTS, 'all'), default='all',
+            help='Тестовый клиент Django, WSGI или ASGI сервер либо все.',
+        )
+        parser.add_argument(
+            '--scenario', action='append', default=None,
+            help='Выполнить только указанные сценарии.',
+        )
+        parser.add_argument(
+            '--mixed', action='store_true',
+            help='Выполнять сценарии одновременно, чередуя их запросы.',
+        )
+        parser.add_argument(
+            '--no-cache', action='store_true',
+            help='Отключить кэш ответов на время замера.',
+        )
+        parser.add_argument(
+            '--database-name', default=None,
+            help='Имя отдельной базы для замера (для SQLite - путь).',
+        )
+        parser.add_argument(
+            '--keepdb', action='store_true',
+            help='Сохранить базу и данные для следующих запусков.',
+        )
+        parser.add_argument('--output', help='Файл для результатов JSON.')
+        parser.add_argument(
+            '--compare', help='Файл с результатами для сравнения.'
+        )
+
+    def handle(self, *args, **options):
+        """Обрабатывает команду замера."""
+        for name in ('titles', 'iterations', 'concurrency'):
+            if options[name] < 1:
+                raise CommandError(f'--{name} должен быть положительным.')
+        overrides = dict(BENCHMARK_SETTINGS)
+        if options['no_cache']:
+            overrides['CACHES'] = DUMMY_CACHES
+        with benchmark_database(options['database_name'], options['keepdb']):
+            with override_settings(**overrides):
+                report = self.benchmark(options)
+        content = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(content + '\n')
+        else:
+            self.stdout.write(content)
+        if options['compare']:
+            self.compare(report, options['compare'])
+
+    def seed(self, options):
+        """Заполняет базу, если в ней еще нет данных нужного размера."""
+        dataset = (
+            options['titles'], options['reviews'], options['comments'],
+            options['users'],
+        )
+        sizes = dataset_exists(*dataset, seed=options['seed'])
+        if sizes:
+            self.stderr.write('Используются сохраненные данные.')
+            return sizes
+        if Title.objects.exists():
+            raise CommandError(
+                'В базе замера другие данные. Запустите команду без '
+                '--keepdb, чтобы пересоздать ее.'
+            )
+        self.stderr.write('Заполнение базы...')
+        return seed_dataset(
+            *dataset, seed=options['seed'], progress=self.report_table
+        )
+
+    def report_table(self, file_name, count, elapsed):
+        """Выводит время заполнения таблицы."""
+        self.stderr.write(f'{file_name}: {count} строк за {elapsed:.1f} с')
+
+    def benchmark(self, options):
+        """Выполняет сценарии и возвращает отчет."""
+        discard_written_reviews()
+        sizes = self.seed(options)
+        context = prepare_context()
+        scenarios = build_scenarios(context, sizes)
+        if options['scenario']:
+            names = {scenario.name for scenario in scenarios}
+            unknown = set(options['scenario']) - names
+            if unknown:
+                raise CommandError(
+                    'Неизвестные сценарии: ' + ', '.join(sorted(unknown))
+                )
+            scenarios = [
+                scenario for scenario in scenarios
+                if scenario.name in options['scenario']
+            ]
+        transports = (
+            list(TRANSPORTS) if options['transport'] == 'all'
+            else [options['transport']]
+        )
+        params = {
+            name: options[name]
+            for name in ('iterations', 'warmup', 'concurrency')
+        }
+        results = {}
+        for name in transports:
+            results[name] = {}
+            with TRANSPORTS[name]() as transport:
+                if options['mixed']:
+                    results[name] = run_mixed(
+                        transport, scenarios, context['admin_token'],
+                        **params,
+                    )
+                else:
+                    for scenario in scenarios:
+                        results[name][scenario.name] = run_scenario(
+                            transport, scenario, context['admin_token'],
+                            **params,
+                        )
+            for scenario, summary in results[name].items():
+                self.stderr.write(
+                    f'{name} {scenario}: p50 {summary["p50_ms"]} мс, '
+                    f'p99 {summary["p99_ms"]} мс, {summary["rps"]} '
+                    f'запр/с, ошибок {summary["errors"]}'
+                )
+        return {
+            **get_environment(),
+            'created': datetime.now(timezone.utc).isoformat(),
+            'dataset': {**sizes, 'seed': options['seed']},
+            'options': {
+                name: options[name] for name in (
+                    'iterations', 'warmup', 'concurrency', 'no_cache',
+                    'mixed',
+                )
+            },
+            'results': results,
+        }
+
+    def compare(self, report, path):
+        """Выводит изменение медианы и пропускной способности."""
+        with open(path, encoding='utf-8') as file:
+            previous = json.load(file)
+        self.stderr.write(
+            f'Сравнение с {previous.get("commit") or path}:'
+        )
+        for transport, scenarios in report['results'].items():
+            for name, summary in scenarios.items():
+                old = previous.get('results', {}).get(transport, {}).get(name)
+                if not old or not old['p50_ms']:
+                    continue
+                change = (summary['p50_ms'] / old['p50_ms'] - 1) * 100
+                self.stderr.write(
+                    f'{transport} {name}: p50 {old["p50_ms"]} -> '
+                    f'{summary["p50_ms"]} мс ({change:+.1f}%), '
+                    f'{old["rps"]} -> {summary["rps"]} запр/с'
+                )
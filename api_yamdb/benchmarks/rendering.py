@@ -0,0 +1,84 @@
+"""Сравнение JSON рендереров и парсеров на страницах разного размера."""
+
+import io
+import time
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+from api.serializers import ReviewSerializer, TitleSerializer
+from reviews.models import Review, Title
+
+PAGE_SIZES = (10, 100, 1000)
+PAIRS = {
+    'json': (JSONRenderer, JSONParser),
+    'fast': (FastJSONRenderer, FastJSONParser),
+}
+
+
+def page_data(kind, size):
+    """Возвращает данные страницы списка в том виде, как их отдает API."""
+    if kind == 'titles':
+        results = TitleSerializer(
+            Title.objects.select_related('category').prefetch_related(
+                'genre'
+            ).order_by('id')[:size],
+            many=True,
+        ).data
+    else:
+        results = ReviewSerializer(
+            Review.objects.select_related('author').order_by('id')[:size],
+            many=True,
+        ).data
+    return {
+        'count': len(results), 'next': None, 'previous': None,
+        'results': results,
+    }
+
+
+def best_time(func, iterations):
+    """Возвращает наименьшее время вызова в мс."""
+    best = float('inf')
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 3)
+
+
+def compare_renderers(page_sizes=PAGE_SIZES, iterations=50):
+    """
+    Замеряет рендеринг и разбор страниц произведений и отзывов.
+
+    Возвращает время каждой пары рендерер/парсер, ускорение и признак
+    побайтового совпадения ответов.
+    """
+    results = {}
+    for kind in ('titles', 'reviews'):
+        results[kind] = {}
+        for size in page_sizes:
+            data = page_data(kind, size)
+            summary = {}
+            contents = set()
+            for name, (renderer_class, parser_class) in PAIRS.items():
+                renderer = renderer_class()
+                parser = parser_class()
+                content = renderer.render(data)
+                contents.add(content)
+                summary['bytes'] = len(content)
+                summary[f'render_{name}_ms'] = best_time(
+                    lambda: renderer.render(data), iterations
+                )
+                summary[f'parse_{name}_ms'] = best_time(
+                    lambda: parser.parse(io.BytesIO(content)), iterations
+                )
+            summary['identical'] = len(contents) == 1
+            for stage in ('render', 'parse'):
+                fast = summary[f'{stage}_fast_ms']
+                summary[f'{stage}_speedup'] = round(
+                    summary[f'{stage}_json_ms'] / fast if fast else 0, 2
+                )
+            results[kind][size] = summary
+    return results
@@ -0,0 +1,308 @@
+"""Выполнение сценариев замеров через тестовый клиент и HTTP серверы."""
+
+import http.client
+import importlib
+import json
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+
+import django
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import clear_url_caches
+from django.utils.deprecation import RemovedInDjango60Warning
+
+from api.metrics import percentile
+
+try:
+    import uvicorn
+except ImportError:
+    uvicorn = None
+
+QUANTILES = (0.5, 0.9, 0.99)
+KEEP_ALIVE_TIMEOUT = 3600
+
+
+class ClientTransport:
+    """Запросы через тестовый клиент Django без сетевого уровня."""
+
+    name = 'client'
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def request(self, method, path, data=None, token=None):
+        """Выполняет запрос и возвращает код ответа."""
+        if not hasattr(self.local, 'client'):
+            self.local.client = Client()
+        extra = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        response = self.local.client.generic(
+            method, path,
+            json.dumps(data) if data is not None else '',
+            content_type='application/json',
+            **extra,
+        )
+        return response.status_code
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    """Обработчик запросов WSGI сервера без журнала в stderr."""
+
+    # Заголовки и тело ответа пишутся отдельно; без TCP_NODELAY каждый
+    # ответ задерживается алгоритмом Нейгла.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+
+def reload_urls():
+    """Заново импортирует модули маршрутов и сбрасывает кэш адресов."""
+    with warnings.catch_warnings():
+        # Роутер DRF повторно регистрирует конвертер суффикса формата.
+        warnings.simplefilter('ignore', RemovedInDjango60Warning)
+        for name in ('api.urls', settings.ROOT_URLCONF):
+            if name in sys.modules:
+                importlib.reload(sys.modules[name])
+    clear_url_caches()
+
+
+@contextmanager
+def async_reads(enabled=True):
+    """
+    Включает или выключает асинхронные list и retrieve API.
+
+    Представления выбирают вид view при импорте маршрутов, поэтому
+    маршруты собираются заново при входе и при выходе.
+    """
+    try:
+        with override_settings(API_ASYNC_READS=enabled):
+            reload_urls()
+            yield
+    finally:
+        reload_urls()
+
+
+class WSGITransport:
+    """
+    Запросы по HTTP к WSGI серверу, запущенному в отдельном потоке.
+
+    Каждый поток замера использует свое постоянное соединение.
+    """
+
+    name = 'wsgi'
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def __enter__(self):
+        self.server = ThreadedWSGIServer(
+            ('127.0.0.1', 0), QuietRequestHandler
+        )
+        self.server.set_app(get_wsgi_application())
+        self.address = self.server.server_address[:2]
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+        return False
+
+    def request(self, method, path, data=None, token=None):
+        """Выполняет запрос и возвращает код ответа."""
+        if not hasattr(self.local, 'connection'):
+            self.local.connection = http.client.HTTPConnection(
+                *self.address
+            )
+        headers = {}
+        body = None
+        if data is not None:
+            body = json.dumps(data)
+            headers['Content-Type'] = 'application/json'
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        self.local.connection.request(method, path, body, headers)
+        response = self.local.connection.getresponse()
+        response.read()
+        return response.status
+
+
+class ASGITransport(WSGITransport):
+    """
+    Запросы по HTTP к ASGI серверу uvicorn, запущенному в отдельном потоке.
+
+    На время замера включаются асинхронные list и retrieve, поэтому
+    сравнение с WSGITransport показывает разницу синхронного и
+    асинхронного чтения.
+    """
+
+    name = 'asgi'
+
+    def __enter__(self):
+        self.reads = async_reads()
+        self.reads.__enter__()
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        self.address = sock.getsockname()[:2]
+        self.server = uvicorn.Server(uvicorn.Config(
+            get_asgi_application(), lifespan='off', log_level='warning',
+            access_log=False, backlog=4096,
+            # Соединение основного потока простаивает, пока сценарий
+            # выполняется в других потоках.
+            timeout_keep_alive=KEEP_ALIVE_TIMEOUT,
+        ))
+        self.thread = threading.Thread(
+            target=self.server.run, args=([sock],), daemon=True
+        )
+        self.thread.start()
+        while not self.server.started and self.thread.is_alive():
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.should_exit = True
+        self.thread.join()
+        self.reads.__exit__(*exc_info)
+        return False
+
+
+# Замер через ASGI доступен, если установлен uvicorn.
+TRANSPORTS = {
+    transport.name: transport
+    for transport in (ClientTransport, WSGITransport, ASGITransport)
+    if transport is not ASGITransport or uvicorn is not None
+}
+
+
+def summarize(latencies, errors, elapsed):
+    """Возвращает перцентили задержки в мс и пропускную способность."""
+    milliseconds = [latency * 1000 for latency in latencies]
+    summary = {'requests': len(latencies), 'errors': errors}
+    for quantile in QUANTILES:
+        summary[f'p{round(quantile * 100)}_ms'] = round(
+            percentile(milliseconds, quantile), 3
+        )
+    summary['mean_ms'] = round(
+        sum(milliseconds) / len(milliseconds) if milliseconds else 0, 3
+    )
+    summary['rps'] = round(len(latencies) / elapsed if elapsed else 0, 1)
+    return summary
+
+
+def call(transport, scenario, iteration, token=None):
+    """Выполняет запрос итерации и возвращает задержку и код ответа."""
+    path, data, token = scenario.build(iteration, token)
+    start = time.perf_counter()
+    status = transport.request(scenario.method, path, data, token)
+    return time.perf_counter() - start, status
+
+
+def execute(tasks, concurrency):
+    """Выполняет запросы в нескольких потоках и возвращает их результаты."""
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(concurrency) as pool:
+            results = list(pool.map(lambda task: task(), tasks))
+    else:
+        results = [task() for task in tasks]
+    return results, time.perf_counter() - started
+
+
+def run_scenario(transport, scenario, token=None, iterations=100,
+                 warmup=10, concurrency=1):
+    """
+    Выполняет сценарий и возвращает сводку замера.
+
+    Прогревочные запросы не учитываются. Ошибкой считается ответ с кодом
+    400 и выше.
+    """
+    for iteration in range(warmup):
+        call(transport, scenario, iteration, token)
+    results, elapsed = execute(
+        [
+            partial(call, transport, scenario, iteration, token)
+            for iteration in range(warmup, warmup + iterations)
+        ],
+        concurrency,
+    )
+    return summarize(
+        [latency for latency, _ in results],
+        sum(status >= 400 for _, status in results),
+        elapsed,
+    )
+
+
+def run_mixed(transport, scenarios, token=None, iterations=100,
+              warmup=10, concurrency=1):
+    """
+    Выполняет сценарии одновременно, чередуя их запросы.
+
+    Так проверяется работа чтения и записи под общей нагрузкой.
+    Возвращает сводки по сценариям; пропускная способность считается
+    по общему времени замера.
+    """
+    for iteration in range(warmup):
+        for scenario in scenarios:
+            call(transport, scenario, iteration, token)
+    tasks = [
+        partial(call, transport, scenario, iteration, token)
+        for iteration in range(warmup, warmup + iterations)
+        for scenario in scenarios
+    ]
+    results, elapsed = execute(tasks, concurrency)
+    summaries = {}
+    for index, scenario in enumerate(scenarios):
+        own = results[index::len(scenarios)]
+        summaries[scenario.name] = summarize(
+            [latency for latency, _ in own],
+            sum(status >= 400 for _, status in own),
+            elapsed,
+        )
+    return summaries
+
+
+def git(*args):
+    """Возвращает вывод команды git или None, если git недоступен."""
+    try:
+        result = subprocess.run(
+            ('git', *args), cwd=settings.BASE_DIR, capture_output=True,
+            text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def get_environment():
+    """Возвращает сведения о коммите и окружении для сравнения замеров."""
+    status = git('status', '--porcelain', '--untracked-files=no')
+    return {
+        'commit': git('rev-parse', 'HEAD'),
+        'dirty': bool(status) if status is not None else None,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+    }
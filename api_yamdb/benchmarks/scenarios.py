@@ -0,0 +1,201 @@
+"""Сценарии замеров: запросы к эндпоинтам API."""
+
+import itertools
+from urllib.parse import urlencode
+
+from django.contrib.auth import get_user_model
+
+from api.authentication import RoleAccessToken
+from reviews.models import Review, Title
+from reviews.utils import recalculate_title_ratings
+
+User = get_user_model()
+
+BENCHMARK_ADMIN = 'bench_admin'
+TOKEN_USER = 'bench_token'
+TOKEN_CODE = 'BENCH0'
+# Авторы отзывов сценария записи: каждый пишет не больше одного отзыва
+# к произведению, поэтому сценарий создает до WRITERS * TITLE_SAMPLE_SIZE
+# отзывов.
+WRITER_PREFIX = 'bench_writer_'
+WRITERS = 100
+# Количество отзывов, комментарии к которым обходит сценарий.
+REVIEW_SAMPLE_SIZE = 1000
+# Количество произведений, которые обходят сценарии.
+TITLE_SAMPLE_SIZE = 1000
+
+
+class Scenario:
+    """
+    Запрос к эндпоинту, повторяемый при замере.
+
+    Адрес и тело запроса могут быть функциями номера итерации, чтобы
+    сценарий обходил разные объекты.
+    """
+
+    def __init__(self, name, path, method='GET', data=None, auth=False):
+        self.name = name
+        self.path = path
+        self.method = method
+        self.data = data
+        self.auth = auth
+
+    def build(self, iteration, token=None):
+        """Возвращает адрес, тело запроса и токен для итерации."""
+        path = self.path(iteration) if callable(self.path) else self.path
+        data = self.data(iteration) if callable(self.data) else self.data
+        return path, data, token if self.auth else None
+
+
+class ReviewCreateScenario(Scenario):
+    """Создание отзывов от имени разных авторов к разным произведениям."""
+
+    def __init__(self, name, title_ids, writer_tokens):
+        super().__init__(name, '/api/v1/titles/', method='POST', auth=True)
+        self.title_ids = title_ids
+        self.writer_tokens = writer_tokens
+        self.created = itertools.count()
+
+    def build(self, iteration, token=None):
+        """Выбирает следующую свободную пару автора и произведения."""
+        number = next(self.created)
+        writer = number % len(self.writer_tokens)
+        title_id = self.title_ids[
+            number // len(self.writer_tokens) % len(self.title_ids)
+        ]
+        return (
+            f'/api/v1/titles/{title_id}/reviews/',
+            {'text': f'Отзыв замера {number}', 'score': number % 10 + 1},
+            self.writer_tokens[writer],
+        )
+
+
+def url(path, **params):
+    """Возвращает адрес с закодированными параметрами запроса."""
+    return f'{path}?{urlencode(params)}' if params else path
+
+
+def discard_written_reviews():
+    """Удаляет отзывы, созданные сценариями прошлых запусков."""
+    reviews = Review.objects.filter(author__username__startswith=WRITER_PREFIX)
+    title_ids = set(reviews.values_list('title_id', flat=True))
+    if title_ids:
+        reviews.delete()
+        recalculate_title_ratings(title_ids)
+
+
+def prepare_context():
+    """Создает служебных пользователей и возвращает данные для сценариев."""
+    admin, _ = User.objects.update_or_create(
+        username=BENCHMARK_ADMIN,
+        defaults={
+            'email': f'{BENCHMARK_ADMIN}@yamdb.fake',
+            'role': User.Role.ADMIN,
+        },
+    )
+    User.objects.update_or_create(
+        username=TOKEN_USER,
+        defaults={
+            'email': f'{TOKEN_USER}@yamdb.fake',
+            'confirmation_code': TOKEN_CODE,
+        },
+    )
+    User.objects.bulk_create(
+        [
+            User(
+                username=f'{WRITER_PREFIX}{number}',
+                email=f'{WRITER_PREFIX}{number}@yamdb.fake',
+            )
+            for number in range(WRITERS)
+        ],
+        ignore_conflicts=True,
+    )
+    writers = User.objects.filter(
+        username__startswith=WRITER_PREFIX
+    ).order_by('username')[:WRITERS]
+    return {
+        'admin_token': str(RoleAccessToken.for_user(admin)),
+        'writer_tokens': [
+            str(RoleAccessToken.for_user(writer)) for writer in writers
+        ],
+        'title_name': Title.objects.values_list('name', flat=True).first(),
+        'title_ids': list(
+            Title.objects.order_by('id').values_list('id', flat=True)[
+                :TITLE_SAMPLE_SIZE
+            ]
+        ),
+        'reviews': list(
+            Review.objects.order_by('id').values_list('title_id', 'id')[
+                :REVIEW_SAMPLE_SIZE
+            ]
+        ),
+    }
+
+
+def build_scenarios(context, sizes):
+    """Возвращает сценарии для всех эндпоинтов API."""
+    titles = sizes['titles']
+    title_ids = context['title_ids'] or [1]
+    reviews = context['reviews'] or [(1, 1)]
+    signups = itertools.count()
+
+    def title_path(iteration):
+        return f'/api/v1/titles/{title_ids[iteration % len(title_ids)]}/'
+
+    def comments_path(iteration):
+        title_id, review_id = reviews[iteration % len(reviews)]
+        return f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+
+    def signup_data(iteration):
+        username = f'bench_signup_{next(signups)}'
+        return {'username': username, 'email': f'{username}@yamdb.fake'}
+
+    return [
+        Scenario('categories_list', '/api/v1/categories/'),
+        Scenario('genres_list', '/api/v1/genres/'),
+        Scenario('titles_list', '/api/v1/titles/'),
+        Scenario(
+            'titles_list_deep_page',
+            url('/api/v1/titles/', page=max(titles // 20, 1)),
+        ),
+        Scenario(
+            'titles_filter_genre', url('/api/v1/titles/', genre='genre-1')
+        ),
+        Scenario(
+            'titles_filter_category',
+            url('/api/v1/titles/', category='category-1'),
+        ),
+        Scenario('titles_filter_year', url('/api/v1/titles/', year=2000)),
+        Scenario(
+            'titles_filter_name',
+            url('/api/v1/titles/', name=context['title_name'] or ''),
+        ),
+        Scenario('title_detail', title_path),
+        Scenario('reviews_page', lambda i: f'{title_path(i)}reviews/'),
+        Scenario(
+            'reviews_cursor_page',
+            lambda i: url(f'{title_path(i)}reviews/', pagination='cursor'),
+        ),
+        Scenario('comments_page', comments_path),
+        ReviewCreateScenario(
+            'review_create', title_ids, context['writer_tokens']
+        ),
+        Scenario('search', url('/api/v1/search/', q='интересный фильм')),
+        Scenario(
+            'users_search',
+            url('/api/v1/users/', search='user1'),
+            auth=True,
+        ),
+        Scenario(
+            'signup',
+            '/api/v1/auth/signup/',
+            method='POST',
+            data=signup_data,
+        ),
+        Scenario(
+            'token',
+            '/api/v1/auth/token/',
+            method='POST',
+            data={'username': TOKEN_USER, 'confirmation_code': TOKEN_CODE},
+        ),
+    ]
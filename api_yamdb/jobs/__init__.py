@@ -0,0 +1 @@
+"""Приложение jobs."""
@@ -0,0 +1,10 @@
+"""Конфигурация приложения jobs."""
+
+from django.apps import AppConfig
+
+
+class JobsConfig(AppConfig):
+    """Конфигурация приложения jobs."""
+
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'jobs'
@@ -0,0 +1,10 @@
+"""Константы для приложения jobs."""
+
+# Максимальная длина вида задачи
+JOB_KIND_MAX_LENGTH = 64
+
+# Максимальная длина статуса задачи
+JOB_STATUS_MAX_LENGTH = 16
+
+# Максимальная длина идентификатора обработчика
+JOB_WORKER_MAX_LENGTH = 64
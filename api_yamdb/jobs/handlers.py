@@ -0,0 +1,39 @@
+"""Обработчики фоновых задач."""
+
+from django.core.mail import EmailMessage, get_connection
+
+SEND_MAIL = 'send_mail'
+
+
+def send_mail_jobs(jobs):
+    """
+    Отправляет письма задач через одно соединение с почтовым сервером.
+
+    Возвращает список ошибок в порядке задач (None - письмо отправлено).
+    Ошибка открытия соединения относится ко всем задачам пакета.
+    """
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        return [error] * len(jobs)
+    errors = []
+    try:
+        for job in jobs:
+            try:
+                connection.send_messages(
+                    [EmailMessage(connection=connection, **job.payload)]
+                )
+            except Exception as error:
+                errors.append(error)
+            else:
+                errors.append(None)
+    finally:
+        connection.close()
+    return errors
+
+
+# Обработчики по видам задач: принимают пакет задач и возвращают ошибки.
+HANDLERS = {
+    SEND_MAIL: send_mail_jobs,
+}
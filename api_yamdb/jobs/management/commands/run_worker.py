@@ -0,0 +1,64 @@
+"""Команда для выполнения задач из очереди."""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.queue import get_worker_id, queue_depth, run_batch
+
+
+class Command(BaseCommand):
+    """Команда для выполнения задач из очереди."""
+
+    help = 'Выполнение фоновых задач из очереди в базе данных'
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы командной строки."""
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить задачи с наступившим сроком и завершиться.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.JOBS_BATCH_SIZE,
+            help='Количество задач, забираемых за один раз.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.JOBS_POLL_INTERVAL,
+            help='Пауза в секундах, если задач нет.',
+        )
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Только показать метрики очереди.',
+        )
+
+    def handle(self, *args, **options):
+        """Обрабатывает команду выполнения задач."""
+        if options['stats']:
+            for name, value in queue_depth().items():
+                self.stdout.write(f'{name}: {value}')
+            return
+        if options['batch_size'] < 1:
+            raise CommandError('Размер пакета должен быть положительным.')
+        worker_id = get_worker_id()
+        try:
+            while True:
+                stats = run_batch(worker_id, options['batch_size'])
+                if stats['claimed']:
+                    self.stdout.write(
+                        f'Задач: {stats["claimed"]}, выполнено '
+                        f'{stats["done"]}, отложено {stats["pending"]}, '
+                        f'с ошибкой {stats["failed"]}'
+                    )
+                elif options['once']:
+                    return
+                else:
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Обработчик остановлен.')
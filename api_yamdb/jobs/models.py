@@ -0,0 +1,58 @@
+"""Модели для приложения jobs."""
+
+from django.db import models
+from django.utils import timezone
+
+from jobs.constants import (
+    JOB_KIND_MAX_LENGTH,
+    JOB_STATUS_MAX_LENGTH,
+    JOB_WORKER_MAX_LENGTH,
+)
+
+
+class Job(models.Model):
+    """Фоновая задача, ожидающая выполнения обработчиком очереди."""
+
+    class Status(models.TextChoices):
+        """Статусы задачи."""
+
+        PENDING = 'pending', 'Ожидает'
+        RUNNING = 'running', 'Выполняется'
+        DONE = 'done', 'Выполнена'
+        FAILED = 'failed', 'Ошибка'
+
+    kind = models.CharField('Вид', max_length=JOB_KIND_MAX_LENGTH)
+    payload = models.JSONField('Данные', default=dict)
+    status = models.CharField(
+        'Статус',
+        max_length=JOB_STATUS_MAX_LENGTH,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveIntegerField('Попытки', default=0)
+    run_at = models.DateTimeField('Выполнить после', default=timezone.now)
+    locked_by = models.CharField(
+        'Обработчик', max_length=JOB_WORKER_MAX_LENGTH, blank=True
+    )
+    locked_at = models.DateTimeField('Взята в работу', null=True, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created_at = models.DateTimeField('Дата создания', auto_now_add=True)
+    finished_at = models.DateTimeField(
+        'Дата завершения', null=True, blank=True
+    )
+
+    class Meta:
+        """Мета-класс для модели Job."""
+
+        verbose_name = 'задача'
+        verbose_name_plural = 'Задачи'
+        ordering = ('run_at', 'id')
+        indexes = (
+            models.Index(
+                fields=('status', 'run_at'), name='job_status_run_at_idx'
+            ),
+        )
+
+    def __str__(self):
+        """Строковое представление задачи."""
+        return f'{self.kind} #{self.pk} ({self.status})'
@@ -0,0 +1,164 @@
+"""Очередь фоновых задач в базе данных."""
+
+import os
+import socket
+import uuid
+from datetime import timedelta
+from itertools import groupby
+from operator import attrgetter
+
+from django.conf import settings
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from jobs.constants import JOB_WORKER_MAX_LENGTH
+from jobs.handlers import HANDLERS, SEND_MAIL
+from jobs.models import Job
+
+
+def enqueue(kind, payload, run_at=None):
+    """
+    Ставит задачу в очередь.
+
+    При JOBS_EAGER задача выполняется сразу без записи в базу, а ошибка
+    обработчика передается вызывающему коду.
+    """
+    if kind not in HANDLERS:
+        raise ValueError(f'Неизвестный вид задачи: {kind}')
+    job = Job(kind=kind, payload=payload)
+    if settings.JOBS_EAGER:
+        error, = HANDLERS[kind]([job])
+        if error is not None:
+            raise error
+        job.status = Job.Status.DONE
+        return job
+    if run_at is not None:
+        job.run_at = run_at
+    job.save()
+    return job
+
+
+def send_mail_later(subject, message, from_email, recipient_list):
+    """Ставит в очередь отправку письма с аргументами как у send_mail."""
+    return enqueue(SEND_MAIL, {
+        'subject': subject,
+        'body': message,
+        'from_email': from_email,
+        'to': list(recipient_list),
+    })
+
+
+def get_worker_id():
+    """Возвращает уникальный идентификатор обработчика очереди."""
+    worker_id = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+    return worker_id[-JOB_WORKER_MAX_LENGTH:]
+
+
+def get_retry_delay(attempts):
+    """Возвращает экспоненциально растущую паузу перед повтором."""
+    return timedelta(seconds=min(
+        settings.JOBS_RETRY_DELAY * 2 ** (attempts - 1),
+        settings.JOBS_RETRY_MAX_DELAY,
+    ))
+
+
+def available_jobs(now):
+    """Условие задач, которые можно взять в работу."""
+    stale = now - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT)
+    return (
+        Q(status=Job.Status.PENDING, run_at__lte=now)
+        | Q(status=Job.Status.RUNNING, locked_at__lt=stale)
+    )
+
+
+def claim_jobs(worker_id, limit):
+    """
+    Забирает в работу до limit задач, срок выполнения которых наступил.
+
+    Повторная проверка условия в UPDATE не дает двум обработчикам взять
+    одну задачу. Задачи, зависшие у упавшего обработчика дольше
+    JOBS_LOCK_TIMEOUT, забираются снова.
+    """
+    now = timezone.now()
+    ids = list(
+        Job.objects.filter(available_jobs(now))
+        .order_by('run_at', 'id')
+        .values_list('pk', flat=True)[:limit]
+    )
+    if not ids:
+        return []
+    Job.objects.filter(available_jobs(now), pk__in=ids).update(
+        status=Job.Status.RUNNING,
+        locked_by=worker_id,
+        locked_at=now,
+        attempts=F('attempts') + 1,
+    )
+    return list(
+        Job.objects.filter(pk__in=ids, locked_by=worker_id, locked_at=now)
+        .order_by('kind', 'run_at', 'id')
+    )
+
+
+def finish_job(job, error, now):
+    """Отмечает результат задачи и при ошибке планирует повтор."""
+    job.locked_by = ''
+    job.locked_at = None
+    if error is None:
+        job.status = Job.Status.DONE
+        job.last_error = ''
+        job.finished_at = now
+    elif job.attempts >= settings.JOBS_MAX_ATTEMPTS:
+        job.status = Job.Status.FAILED
+        job.last_error = repr(error)
+        job.finished_at = now
+    else:
+        job.status = Job.Status.PENDING
+        job.last_error = repr(error)
+        job.run_at = now + get_retry_delay(job.attempts)
+
+
+def run_batch(worker_id, batch_size):
+    """Выполняет пакет задач и возвращает количество задач по исходам."""
+    jobs = claim_jobs(worker_id, batch_size)
+    for kind, group in groupby(jobs, key=attrgetter('kind')):
+        group = list(group)
+        handler = HANDLERS.get(kind)
+        if handler is None:
+            errors = [ValueError(f'Неизвестный вид задачи: {kind}')]
+            errors *= len(group)
+        else:
+            errors = handler(group)
+        now = timezone.now()
+        for job, error in zip(group, errors):
+            finish_job(job, error, now)
+    Job.objects.bulk_update(jobs, (
+        'status', 'locked_by', 'locked_at', 'last_error', 'run_at',
+        'finished_at',
+    ))
+    stats = {'claimed': len(jobs)}
+    for status in (Job.Status.DONE, Job.Status.PENDING, Job.Status.FAILED):
+        stats[status] = sum(job.status == status for job in jobs)
+    return stats
+
+
+def queue_depth():
+    """
+    Возвращает метрики очереди.
+
+    Количество задач по статусам, число задач с наступившим сроком и
+    возраст самой старой из них в секундах.
+    """
+    now = timezone.now()
+    counts = dict(
+        Job.objects.order_by().values_list('status')
+        .annotate(count=Count('id'))
+    )
+    metrics = {status: counts.get(status, 0) for status in Job.Status.values}
+    due = Job.objects.filter(
+        status=Job.Status.PENDING, run_at__lte=now
+    ).aggregate(count=Count('id'), oldest=Min('run_at'))
+    metrics['due'] = due['count']
+    metrics['oldest_due_age'] = (
+        (now - due['oldest']).total_seconds() if due['oldest'] else 0
+    )
+    return metrics
@@ -8,3 +8,7 @@ class ReviewsConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reviews'
+
+    def ready(self):
+        """Подключает обработчики сигналов."""
+        from reviews import signals  # noqa: F401
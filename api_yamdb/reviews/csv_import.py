@@ -0,0 +1,247 @@
+"""Потоковая загрузка данных из CSV файлов в базу."""
+
+import csv
+import os
+import pickle
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from graphlib import TopologicalSorter
+
+import django
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    Review,
+    Title,
+    TitleGenre,
+)
+from reviews.utils import bump_table_versions
+from users.models import User
+
+FILE_MODELS = {
+    'category.csv': Category,
+    'comments.csv': Comment,
+    'genre_title.csv': TitleGenre,
+    'genre.csv': Genre,
+    'review.csv': Review,
+    'titles.csv': Title,
+    'users.csv': User,
+}
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def build_dependency_graph(file_names):
+    """Строит граф зависимостей файлов по связям их моделей."""
+    models = {FILE_MODELS[name]: name for name in file_names}
+    sorter = TopologicalSorter()
+    for model, name in models.items():
+        sorter.add(name, *(
+            models[field.related_model]
+            for field in model._meta.concrete_fields
+            if field.is_relation and field.related_model in models
+            and field.related_model is not model
+        ))
+    return sorter
+
+
+def resolve_load_order(file_names):
+    """Сортирует файлы так, чтобы связанные таблицы шли раньше зависимых."""
+    return list(build_dependency_graph(file_names).static_order())
+
+
+def resolve_load_waves(file_names):
+    """Разбивает файлы на волны, внутри которых таблицы независимы."""
+    sorter = build_dependency_graph(file_names)
+    sorter.prepare()
+    waves = []
+    while sorter.is_active():
+        wave = sorted(sorter.get_ready())
+        waves.append(wave)
+        sorter.done(*wave)
+    return waves
+
+
+def build_columns(model, header):
+    """Сопоставляет колонки CSV с полями модели."""
+    fields = {}
+    for field in model._meta.concrete_fields:
+        fields[field.name] = field
+        fields[field.attname] = field
+    columns = []
+    for column in header:
+        if column not in fields:
+            raise ValueError(
+                f'Колонка {column} не найдена в модели {model.__name__}'
+            )
+        field = fields[column]
+        columns.append((column, field.attname, field))
+    return columns
+
+
+def convert_row(columns, row):
+    """Преобразует строку CSV в значения полей модели и проверяет их."""
+    values = {}
+    for column, attname, field in columns:
+        value = row[column]
+        if value == '' and field.null:
+            values[attname] = None
+        elif value == '' and field.has_default():
+            values[attname] = field.get_default()
+        else:
+            values[attname] = field.to_python(value)
+            field.run_validators(values[attname])
+    return values
+
+
+def iter_rows(path, model, chunk_size, rejected):
+    """
+    Читает CSV файл и отдает списки значений полей размером chunk_size.
+
+    Каждая запись - словарь значений атрибутов модели. Записи, которые
+    не удалось преобразовать, добавляются в rejected в виде кортежей
+    (номер записи, ошибка) и пропускаются.
+    """
+    with open(path, mode='r', encoding='utf-8', newline='') as file:
+        reader = csv.DictReader(file)
+        columns = build_columns(model, reader.fieldnames)
+        rows = []
+        for number, row in enumerate(reader, 1):
+            try:
+                rows.append(convert_row(columns, row))
+            except (ValidationError, ValueError, TypeError) as error:
+                rejected.append((number, error))
+            if len(rows) == chunk_size:
+                yield rows
+                rows = []
+        if rows:
+            yield rows
+
+
+@contextmanager
+def preserved_auto_dates(model, attnames):
+    """
+    Сохраняет даты из CSV вместо автоматически подставляемых.
+
+    Отключается только auto_now_add полей из attnames: даты, которых нет
+    в файле, подставляются как обычно.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+        and field.attname in attnames
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def reset_sequences(model):
+    """Сдвигает счетчики первичных ключей после загрузки с явными id."""
+    statements = connection.ops.sequence_reset_sql(no_style(), [model])
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def insert_rows(model, chunks, progress=None):
+    """
+    Записывает порции уже преобразованных значений через bulk_create.
+
+    Каждая порция записывается в отдельной транзакции. Возвращает
+    количество записанных строк.
+    """
+    loaded = 0
+    for rows in chunks:
+        with preserved_auto_dates(model, rows[0]), transaction.atomic():
+            model.objects.bulk_create([model(**values) for values in rows])
+        loaded += len(rows)
+        if progress:
+            progress(loaded)
+    reset_sequences(model)
+    bump_table_versions(model)
+    return loaded
+
+
+def load_file(path, model, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    Загружает CSV файл в таблицу модели порциями через bulk_create.
+
+    Файл читается по мере записи, поэтому расход памяти не зависит от
+    его размера. Возвращает словарь со статистикой загрузки.
+    """
+    rejected = []
+    started = time.monotonic()
+    loaded = insert_rows(
+        model, iter_rows(path, model, chunk_size, rejected), progress
+    )
+    return {
+        'loaded': loaded,
+        'rejected': rejected,
+        'elapsed': time.monotonic() - started,
+    }
+
+
+def init_worker():
+    """Настраивает Django в процессе пула, запущенном через spawn."""
+    if not apps.ready:
+        django.setup()
+
+
+def convert_file(path, model_label, spill_dir, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Разбирает и проверяет CSV файл без записи в базу.
+
+    Выполняется в процессе пула. Порции преобразованных значений по
+    одной записываются в файл в каталоге spill_dir, поэтому ни процесс
+    пула, ни основной процесс не держат весь файл в памяти. Возвращает
+    словарь с путем к этому файлу, количеством записей и списком
+    отклоненных записей (номер, текст ошибки).
+    """
+    model = apps.get_model(model_label)
+    started = time.monotonic()
+    rejected = []
+    converted = 0
+    with tempfile.NamedTemporaryFile(
+        dir=spill_dir, suffix='.pickle', delete=False
+    ) as spill:
+        for rows in iter_rows(path, model, chunk_size, rejected):
+            pickle.dump(rows, spill, protocol=pickle.HIGHEST_PROTOCOL)
+            converted += len(rows)
+    return {
+        'spill': spill.name,
+        'total': converted + len(rejected),
+        'rejected': [(number, str(error)) for number, error in rejected],
+        'elapsed': time.monotonic() - started,
+    }
+
+
+def read_spill(path):
+    """Отдает порции значений из файла convert_file и удаляет его."""
+    try:
+        with open(path, 'rb') as file:
+            while True:
+                try:
+                    yield pickle.load(file)
+                except EOFError:
+                    return
+    finally:
+        os.remove(path)
+
+
+def create_validation_pool(workers):
+    """Создает пул процессов для параллельного разбора файлов."""
+    return ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
@@ -0,0 +1,364 @@
+"""Генерация синтетических данных для проверки работы на больших объемах."""
+
+import datetime as dt
+import os
+import random
+import time
+
+from django.db import connection, transaction
+
+from reviews.constants import MAX_SCORE, MIN_SCORE
+from reviews.csv_import import (
+    DEFAULT_CHUNK_SIZE,
+    build_columns,
+    reset_sequences,
+)
+from reviews.models import Category, Comment, Genre, Review, Title, TitleGenre
+from reviews.search import deferred_search_index
+from reviews.utils import bump_table_versions, recalculate_title_ratings
+from users.models import User
+
+CATEGORIES = 10
+GENRES = 20
+MAX_TITLE_GENRES = 4
+# Доли пользователей с ролями модератора и администратора.
+MODERATOR_SHARE = 0.005
+ADMIN_SHARE = 0.001
+START_DATE = dt.datetime(2015, 1, 1, tzinfo=dt.timezone.utc)
+END_DATE = dt.datetime(2025, 1, 1, tzinfo=dt.timezone.utc)
+# Размер пула слов, из отрезков которого собираются тексты.
+WORD_POOL_SIZE = 100_000
+
+WORDS = (
+    'фильм', 'книга', 'песня', 'альбом', 'сериал', 'история', 'любовь',
+    'война', 'мир', 'время', 'город', 'дорога', 'море', 'звезда', 'ночь',
+    'утро', 'герой', 'злодей', 'жизнь', 'смерть', 'судьба', 'сюжет',
+    'персонаж', 'актер', 'актриса', 'режиссер', 'автор', 'музыка', 'голос',
+    'финал', 'начало', 'середина', 'тайна', 'загадка', 'друг', 'враг',
+    'семья', 'детство', 'память', 'мечта', 'страх', 'надежда', 'сцена',
+    'глава', 'роман', 'повесть', 'рассказ', 'поэзия', 'ритм', 'мелодия',
+    'отличный', 'скучный', 'интересный', 'сильный', 'слабый', 'новый',
+    'старый', 'красивый', 'мрачный', 'смешной', 'грустный', 'долгий',
+    'короткий', 'неожиданный', 'предсказуемый', 'глубокий', 'живой',
+    'смотреть', 'читать', 'слушать', 'понравиться', 'рекомендовать',
+    'запомниться', 'удивить', 'разочаровать', 'ждать', 'пересматривать',
+    'очень', 'совсем', 'почти', 'снова', 'всегда', 'никогда', 'наконец',
+    'и', 'но', 'в', 'на', 'не', 'с', 'по', 'это', 'как', 'так', 'все',
+)
+
+USER_HEADER = ('id', 'username', 'email', 'role', 'bio', 'first_name',
+               'last_name')
+GROUP_HEADER = ('id', 'name', 'slug')
+TITLE_HEADER = ('id', 'name', 'year', 'category')
+TITLE_GENRE_HEADER = ('id', 'title_id', 'genre_id')
+REVIEW_HEADER = ('id', 'title_id', 'text', 'author', 'score', 'pub_date')
+COMMENT_HEADER = ('id', 'review_id', 'text', 'author', 'pub_date')
+
+
+def zipf_index(rng, size, exponent):
+    """
+    Возвращает номер от 0 до size - 1 с распределением Ципфа.
+
+    Используется обратная функция непрерывного степенного распределения,
+    поэтому выборка не требует таблицы весов и работает за O(1).
+    """
+    uniform = rng.random()
+    if exponent == 1:
+        rank = (size + 1) ** uniform
+    else:
+        power = 1 - exponent
+        rank = (((size + 1) ** power - 1) * uniform + 1) ** (1 / power)
+    return min(int(rank), size) - 1
+
+
+class DataGenerator:
+    """
+    Детерминированный генератор таблиц в формате CSV файлов load_csv.
+
+    Число отзывов на произведение, активность авторов, число комментариев
+    на отзыв, категории и жанры распределены по закону Ципфа, длина
+    текстов - логнормально. Одинаковые параметры и seed дают одинаковые
+    данные.
+    """
+
+    def __init__(self, titles, reviews, comments, users=None, seed=42,
+                 exponent=1.1):
+        self.titles = max(titles, 1)
+        self.users = max(users or reviews // 20, 10)
+        self.comments = comments
+        self.exponent = exponent
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.review_counts = self.draw_review_counts(reviews)
+        self.reviews = sum(self.review_counts)
+        if not self.reviews:
+            self.comments = 0
+        self.word_pool = self.rng.choices(WORDS, k=WORD_POOL_SIZE)
+
+    @property
+    def sizes(self):
+        """Количество строк основных таблиц."""
+        return {
+            'titles': self.titles,
+            'reviews': self.reviews,
+            'comments': self.comments,
+            'users': self.users,
+        }
+
+    def draw_review_counts(self, reviews):
+        """
+        Распределяет отзывы по произведениям.
+
+        У произведения не может быть отзывов больше, чем пользователей,
+        поэтому лишние отзывы самых популярных произведений отбрасываются.
+        """
+        counts = [0] * self.titles
+        for _ in range(reviews):
+            counts[zipf_index(self.rng, self.titles, self.exponent)] += 1
+        return [min(count, self.users) for count in counts]
+
+    def text(self, mu, sigma):
+        """Возвращает текст логнормально распределенной длины в словах."""
+        length = max(int(self.rng.lognormvariate(mu, sigma)), 1)
+        length = min(length, WORD_POOL_SIZE)
+        start = self.rng.randrange(WORD_POOL_SIZE - length + 1)
+        return ' '.join(self.word_pool[start:start + length])
+
+    def date(self):
+        """Возвращает случайную дату публикации."""
+        return START_DATE + dt.timedelta(
+            seconds=self.rng.random()
+            * (END_DATE - START_DATE).total_seconds()
+        )
+
+    def draw_authors(self, count):
+        """
+        Выбирает count разных авторов с учетом их активности.
+
+        Если нужна большая часть пользователей, распределение активности
+        не влияет на результат, и авторы выбираются равномерно.
+        """
+        if count * 2 > self.users:
+            return [index + 1 for index in self.rng.sample(
+                range(self.users), count
+            )]
+        authors = set()
+        while len(authors) < count:
+            authors.add(zipf_index(self.rng, self.users, self.exponent) + 1)
+        return list(authors)
+
+    def user_rows(self):
+        """Строки таблицы пользователей."""
+        for pk in range(1, self.users + 1):
+            share = self.rng.random()
+            if share < ADMIN_SHARE:
+                role = User.Role.ADMIN
+            elif share < ADMIN_SHARE + MODERATOR_SHARE:
+                role = User.Role.MODERATOR
+            else:
+                role = User.Role.USER
+            yield (
+                pk, f'user{pk}', f'user{pk}@yamdb.fake', role, '', '', ''
+            )
+
+    def category_rows(self):
+        """Строки таблицы категорий."""
+        for pk in range(1, CATEGORIES + 1):
+            yield pk, f'Категория {pk}', f'category-{pk}'
+
+    def genre_rows(self):
+        """Строки таблицы жанров."""
+        for pk in range(1, GENRES + 1):
+            yield pk, f'Жанр {pk}', f'genre-{pk}'
+
+    def title_rows(self):
+        """Строки таблицы произведений."""
+        for pk in range(1, self.titles + 1):
+            name = self.text(1, 0.4)[:200].capitalize()
+            year = END_DATE.year - 1 - min(
+                int(self.rng.expovariate(1 / 15)), 120
+            )
+            category = zipf_index(self.rng, CATEGORIES, self.exponent) + 1
+            yield pk, name, year, category
+
+    def title_genre_rows(self):
+        """Строки таблицы связей произведений с жанрами."""
+        pk = 0
+        for title_id in range(1, self.titles + 1):
+            count = 1 + zipf_index(self.rng, MAX_TITLE_GENRES, 2)
+            genres = set()
+            while len(genres) < count:
+                genres.add(zipf_index(self.rng, GENRES, self.exponent) + 1)
+            for genre_id in sorted(genres):
+                pk += 1
+                yield pk, title_id, genre_id
+
+    def review_rows(self):
+        """
+        Строки таблицы отзывов.
+
+        Оценки произведения группируются вокруг его собственного среднего,
+        поэтому рейтинги различаются.
+        """
+        pk = 0
+        for title_id, count in enumerate(self.review_counts, 1):
+            mean = self.rng.uniform(4, 9)
+            for author in self.draw_authors(count):
+                pk += 1
+                score = min(max(
+                    round(self.rng.gauss(mean, 1.8)), MIN_SCORE
+                ), MAX_SCORE)
+                yield (
+                    pk, title_id, self.text(3.0, 0.6), author, score,
+                    self.date(),
+                )
+
+    def comment_rows(self):
+        """
+        Строки таблицы комментариев.
+
+        Больше всего комментариев получают первые отзывы популярных
+        произведений; тексты длиннее, чем у отзывов, с длинным хвостом.
+        """
+        for pk in range(1, self.comments + 1):
+            yield (
+                pk,
+                zipf_index(self.rng, self.reviews, self.exponent) + 1,
+                self.text(3.4, 0.9),
+                zipf_index(self.rng, self.users, self.exponent) + 1,
+                self.date(),
+            )
+
+    def tables(self):
+        """
+        Возвращает таблицы в порядке загрузки.
+
+        Каждая таблица - кортеж (имя CSV файла, модель, заголовок, строки).
+        Строки генерируются лениво и должны читаться по порядку таблиц.
+        """
+        return (
+            ('users.csv', User, USER_HEADER, self.user_rows()),
+            ('category.csv', Category, GROUP_HEADER, self.category_rows()),
+            ('genre.csv', Genre, GROUP_HEADER, self.genre_rows()),
+            ('titles.csv', Title, TITLE_HEADER, self.title_rows()),
+            ('genre_title.csv', TitleGenre, TITLE_GENRE_HEADER,
+             self.title_genre_rows()),
+            ('review.csv', Review, REVIEW_HEADER, self.review_rows()),
+            ('comments.csv', Comment, COMMENT_HEADER, self.comment_rows()),
+        )
+
+
+def chunked(rows, chunk_size):
+    """Разбивает поток строк на списки размером chunk_size."""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def format_csv_value(value):
+    """Приводит значение к виду, в котором даты записаны в исходных CSV."""
+    if isinstance(value, dt.datetime):
+        return value.isoformat(timespec='milliseconds').replace(
+            '+00:00', 'Z'
+        )
+    return value
+
+
+def write_csv(path, header, rows):
+    """
+    Записывает строки таблицы в CSV файл и возвращает их количество.
+
+    Сгенерированные значения не содержат запятых, кавычек и переводов
+    строк, поэтому строки собираются без модуля csv, который заметно
+    медленнее на длинных текстах.
+    """
+    count = 0
+    with open(path, mode='w', encoding='utf-8', newline='') as file:
+        file.write(','.join(header) + '\n')
+        for row in rows:
+            file.write(
+                ','.join([str(format_csv_value(value)) for value in row])
+                + '\n'
+            )
+            count += 1
+    return count
+
+
+def insert_rows(model, header, rows, chunk_size):
+    """
+    Записывает строки в таблицу модели через executemany.
+
+    Объекты моделей не создаются. Поля, которых нет в заголовке,
+    заполняются значениями по умолчанию. Каждая порция записывается в
+    отдельной транзакции. Возвращает количество строк.
+    """
+    fields = [field for _, _, field in build_columns(model, header)]
+    missing = [
+        field for field in model._meta.concrete_fields
+        if field not in fields
+    ]
+    defaults = tuple(
+        field.get_db_prep_save(field.get_default(), connection)
+        for field in missing
+    )
+    adapters = [
+        (index, connection.ops.adapt_datetimefield_value)
+        for index, field in enumerate(fields)
+        if field.get_internal_type() == 'DateTimeField'
+    ]
+    columns = ', '.join(
+        connection.ops.quote_name(field.column)
+        for field in (*fields, *missing)
+    )
+    placeholders = ', '.join(['%s'] * (len(fields) + len(missing)))
+    sql = (
+        f'INSERT INTO {connection.ops.quote_name(model._meta.db_table)} '
+        f'({columns}) VALUES ({placeholders})'
+    )
+    count = 0
+    for chunk in chunked(rows, chunk_size):
+        if adapters:
+            chunk = [list(row) for row in chunk]
+            for row in chunk:
+                for index, adapt in adapters:
+                    row[index] = adapt(row[index])
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(sql, [(*row, *defaults) for row in chunk])
+        count += len(chunk)
+    return count
+
+
+def generate_csv(generator, directory, progress=None):
+    """Записывает сгенерированные таблицы в CSV файлы для load_csv."""
+    os.makedirs(directory, exist_ok=True)
+    for file_name, _, header, rows in generator.tables():
+        started = time.monotonic()
+        count = write_csv(os.path.join(directory, file_name), header, rows)
+        if progress:
+            progress(file_name, count, time.monotonic() - started)
+
+
+def generate_database(generator, chunk_size=DEFAULT_CHUNK_SIZE,
+                      progress=None):
+    """
+    Записывает сгенерированные таблицы в базу.
+
+    Поисковый индекс строится один раз после записи. Затем сдвигаются
+    счетчики первичных ключей, пересчитываются рейтинги и версии таблиц.
+    """
+    models = []
+    with deferred_search_index():
+        for file_name, model, header, rows in generator.tables():
+            started = time.monotonic()
+            count = insert_rows(model, header, rows, chunk_size)
+            reset_sequences(model)
+            models.append(model)
+            if progress:
+                progress(file_name, count, time.monotonic() - started)
+    recalculate_title_ratings()
+    bump_table_versions(*models)
@@ -0,0 +1,42 @@
+"""Команда для обновления индекса похожих произведений."""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.similarity import build_similarity_index
+
+
+class Command(BaseCommand):
+    """Команда для обновления индекса похожих произведений."""
+
+    help = (
+        'Пересчет похожих произведений, признаки которых изменились с '
+        'прошлого запуска.'
+    )
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы командной строки."""
+        parser.add_argument(
+            '--neighbors',
+            type=int,
+            default=None,
+            help='Число похожих произведений (по умолчанию из настроек).',
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Пересчитать соседей всех произведений.',
+        )
+
+    def handle(self, *args, **options):
+        """Обрабатывает команду обновления индекса."""
+        if options['neighbors'] is not None and options['neighbors'] < 1:
+            raise CommandError('--neighbors должен быть положительным.')
+        start = time.perf_counter()
+        stats = build_similarity_index(options['neighbors'], options['full'])
+        self.stdout.write(
+            f'Произведений: {stats["titles"]}, изменилось: '
+            f'{stats["changed"]}, обновлено списков соседей: '
+            f'{stats["rewritten"]} за {time.perf_counter() - start:.1f} с'
+        )
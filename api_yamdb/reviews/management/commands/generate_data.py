@@ -0,0 +1,83 @@
+"""Команда для генерации синтетических данных."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.csv_import import DEFAULT_CHUNK_SIZE
+from reviews.generator import (
+    DataGenerator,
+    generate_csv,
+    generate_database,
+)
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    """Команда для генерации синтетических данных."""
+
+    help = (
+        'Генерация детерминированного набора данных заданного размера в '
+        'базу или в CSV файлы, совместимые с load_csv.'
+    )
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы командной строки."""
+        parser.add_argument('--titles', type=int, default=1000)
+        parser.add_argument('--reviews', type=int, default=20000)
+        parser.add_argument('--comments', type=int, default=50000)
+        parser.add_argument(
+            '--users', type=int, default=None,
+            help='Количество пользователей (по умолчанию reviews / 20).',
+        )
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--zipf', type=float, default=1.1,
+            help='Показатель распределения Ципфа.',
+        )
+        parser.add_argument(
+            '--csv-dir',
+            help='Записать CSV файлы в директорию вместо записи в базу.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Количество строк в одной транзакции.',
+        )
+
+    def handle(self, *args, **options):
+        """Обрабатывает команду генерации данных."""
+        for name in ('titles', 'chunk_size'):
+            if options[name] < 1:
+                raise CommandError(f'--{name} должен быть положительным.')
+        for name in ('reviews', 'comments'):
+            if options[name] < 0:
+                raise CommandError(f'--{name} не может быть отрицательным.')
+        if options['zipf'] <= 0:
+            raise CommandError('--zipf должен быть положительным.')
+        if not options['csv_dir'] and Title.objects.exists():
+            raise CommandError(
+                'База уже содержит данные. Используйте пустую базу или '
+                '--csv-dir.'
+            )
+        generator = DataGenerator(
+            options['titles'], options['reviews'], options['comments'],
+            users=options['users'], seed=options['seed'],
+            exponent=options['zipf'],
+        )
+        if options['csv_dir']:
+            generate_csv(generator, options['csv_dir'], self.report)
+        else:
+            generate_database(generator, options['chunk_size'], self.report)
+        self.stdout.write(
+            'Итого: ' + ', '.join(
+                f'{name} {count}' for name, count in generator.sizes.items()
+            )
+        )
+
+    def report(self, file_name, count, elapsed):
+        """Выводит статистику по таблице."""
+        rate = count / elapsed if elapsed else count
+        self.stdout.write(
+            f'{file_name}: {count} строк за {elapsed:.1f} с '
+            f'({rate:.0f} строк/с)'
+        )
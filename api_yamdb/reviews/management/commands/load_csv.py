@@ -1,19 +1,26 @@
 """Команда для загрузки данных из CSV файлов."""
 
-import csv
+import itertools
 import os
+import tempfile
+import time
+
 from django.conf import settings
-from django.core.management.base import BaseCommand
-
-from reviews.models import (
-    Category,
-    Comment,
-    Genre,
-    Review,
-    Title,
-    TitleGenre,
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.csv_import import (
+    DEFAULT_CHUNK_SIZE,
+    FILE_MODELS,
+    convert_file,
+    create_validation_pool,
+    insert_rows,
+    load_file,
+    read_spill,
+    resolve_load_order,
+    resolve_load_waves,
 )
-from users.models import User
+from reviews.models import Review
+from reviews.utils import recalculate_title_ratings
 
 CSV_DIR = settings.DATA_TO_LOAD_DIR
 
@@ -21,35 +28,165 @@ CSV_DIR = settings.DATA_TO_LOAD_DIR
 class Command(BaseCommand):
     """Команда для загрузки данных из CSV файлов."""
 
-    help = 'Наполнение отдельных таблиц базы данными'
+    help = (
+        'Наполнение отдельных таблиц базы данными. Без аргументов '
+        'загружаются все файлы; порядок определяется связями моделей.'
+    )
 
     def add_arguments(self, parser):
         """Добавляет аргументы командной строки."""
-        parser.add_argument('csv_files', nargs='+', type=str)
+        parser.add_argument('csv_files', nargs='*', type=str)
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Количество строк в одной транзакции bulk_create.',
+        )
+        parser.add_argument(
+            '--dir',
+            default=CSV_DIR,
+            help='Директория с CSV файлами.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help=(
+                'Количество процессов для параллельного разбора файлов. '
+                'Таблицы загружаются волнами в порядке зависимостей.'
+            ),
+        )
 
     def handle(self, *args, **kwargs):
         """Обрабатывает команду загрузки данных."""
-        csv_files = kwargs['csv_files']
-        equals = {
-            'category.csv': Category,
-            'comments.csv': Comment,
-            'genre_title.csv': TitleGenre,
-            'genre.csv': Genre,
-            'review.csv': Review,
-            'titles.csv': Title,
-            'users.csv': User
-        }
-        for file_name in csv_files:
-            csv_file_path = os.path.join(CSV_DIR, file_name)
-            if file_name in equals:
-                model = equals[file_name]
-                try:
-                    with open(csv_file_path, mode='r') as file:
-                        reader = csv.DictReader(file)
-                        for row in reader:
-                            model.objects.create(**row)
-                    print(f'Данные для модели {model} загружены.')
-                except Exception as e:
-                    print(f'Ошибка загрузки данных в модель {model}: {e}')
+        csv_files = kwargs['csv_files'] or list(FILE_MODELS)
+        unknown = [name for name in csv_files if name not in FILE_MODELS]
+        if unknown:
+            raise CommandError(
+                f'Не найдена модель для данных {", ".join(unknown)}'
+            )
+        if kwargs['chunk_size'] < 1:
+            raise CommandError('Размер порции должен быть положительным.')
+        if kwargs['workers'] < 1:
+            raise CommandError('Количество процессов должно быть '
+                               'положительным.')
+        started = time.monotonic()
+        if kwargs['workers'] > 1:
+            results = self.load_parallel(
+                csv_files, kwargs['dir'], kwargs['chunk_size'],
+                kwargs['workers'],
+            )
+        else:
+            results = self.load_sequential(
+                csv_files, kwargs['dir'], kwargs['chunk_size']
+            )
+        loaded = sum(stats['loaded'] for stats in results)
+        rejected = sum(len(stats['rejected']) for stats in results)
+        self.stdout.write(
+            f'Итого: загружено {loaded}, пропущено {rejected} за '
+            f'{time.monotonic() - started:.2f} с'
+        )
+
+    def load_sequential(self, csv_files, directory, chunk_size):
+        """Загружает файлы по одному в порядке зависимостей."""
+        results = []
+        for file_name in resolve_load_order(csv_files):
+            stats = self.load(file_name, directory, chunk_size)
+            if stats:
+                results.append(stats)
+        return results
+
+    def load_parallel(self, csv_files, directory, chunk_size, workers):
+        """
+        Разбирает файлы в пуле процессов и загружает их волнами.
+
+        Файлы отправляются в пул в порядке загрузки, и разбираемых, но
+        еще не записанных файлов не больше workers. Основной процесс
+        только записывает готовые значения, читая их порциями из
+        временных файлов.
+        """
+        results = []
+        waves = resolve_load_waves(csv_files)
+        queue = iter([name for wave in waves for name in wave])
+        with create_validation_pool(workers) as pool, \
+                tempfile.TemporaryDirectory() as spill_dir:
+            futures = {}
+
+            def submit(file_names):
+                for file_name in file_names:
+                    futures[file_name] = pool.submit(
+                        convert_file,
+                        os.path.join(directory, file_name),
+                        FILE_MODELS[file_name]._meta.label,
+                        spill_dir,
+                        chunk_size,
+                    )
+
+            submit(itertools.islice(queue, workers))
+            for number, wave in enumerate(waves, 1):
+                self.stdout.write(f'Волна {number}: {", ".join(wave)}')
+                for file_name in wave:
+                    future = futures.pop(file_name)
+                    submit(itertools.islice(queue, 1))
+                    try:
+                        checked = future.result()
+                    except Exception as e:
+                        self.stderr.write(
+                            f'{file_name}: ошибка проверки: {e}'
+                        )
+                        continue
+                    self.stdout.write(
+                        f'{file_name}: проверено {checked["total"]}, '
+                        f'отклонено {len(checked["rejected"])} за '
+                        f'{checked["elapsed"]:.2f} с'
+                    )
+                    stats = self.load(file_name, directory, chunk_size,
+                                      converted=checked)
+                    if stats:
+                        results.append(stats)
+        return results
+
+    def load(self, file_name, directory, chunk_size, converted=None):
+        """
+        Загружает один файл.
+
+        Если файл уже разобран в пуле процессов, записываются готовые
+        порции значений из временного файла converted без повторного
+        разбора.
+        """
+        model = FILE_MODELS[file_name]
+        path = os.path.join(directory, file_name)
+        started = time.monotonic()
+        try:
+            if converted is None:
+                stats = load_file(path, model, chunk_size)
             else:
-                print(f'Не найдена модель для данных {file_name}')
+                stats = {
+                    'loaded': insert_rows(
+                        model, read_spill(converted['spill'])
+                    ),
+                    'rejected': converted['rejected'],
+                    'elapsed': time.monotonic() - started,
+                }
+        except Exception as e:
+            self.stderr.write(
+                f'Ошибка загрузки данных в модель {model.__name__}: {e}'
+            )
+            return None
+        self.report(file_name, stats)
+        if model is Review:
+            recalculate_title_ratings()
+        return stats
+
+    def report(self, file_name, stats):
+        """Выводит статистику загрузки одного файла."""
+        for number, error in stats['rejected']:
+            self.stderr.write(f'{file_name}: запись {number} пропущена: '
+                              f'{error}')
+        elapsed = stats['elapsed']
+        speed = stats['loaded'] / elapsed if elapsed else stats['loaded']
+        self.stdout.write(
+            f'{file_name}: загружено {stats["loaded"]}, пропущено '
+            f'{len(stats["rejected"])} за {elapsed:.2f} с '
+            f'({speed:.0f} строк/с)'
+        )
@@ -0,0 +1,30 @@
+"""Команда для пересчета сохраненных рейтингов произведений."""
+
+from django.core.management.base import BaseCommand
+
+from reviews.utils import recalculate_title_ratings
+
+
+class Command(BaseCommand):
+    """Команда для пересчета сохраненных рейтингов произведений."""
+
+    help = 'Пересчет рейтингов произведений и отчет о расхождениях'
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы командной строки."""
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать расхождения, не исправляя их.',
+        )
+
+    def handle(self, *args, **options):
+        """Обрабатывает команду пересчета рейтингов."""
+        drift = recalculate_title_ratings(dry_run=options['dry_run'])
+        for title_id, stored, actual in drift:
+            self.stdout.write(
+                f'Произведение {title_id}: сохранено {stored[0]}/{stored[1]}, '
+                f'фактически {actual[0]}/{actual[1]}'
+            )
+        action = 'найдено' if options['dry_run'] else 'исправлено'
+        self.stdout.write(f'Расхождений {action}: {len(drift)}')
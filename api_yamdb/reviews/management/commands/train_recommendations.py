@@ -0,0 +1,55 @@
+"""Команда для обучения модели рекомендаций."""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews import recommendations
+
+
+class Command(BaseCommand):
+    """Команда для обучения модели рекомендаций."""
+
+    help = (
+        'Разложение матрицы оценок методом ALS и сохранение факторов '
+        'пользователей и произведений для рекомендаций.'
+    )
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы командной строки."""
+        parser.add_argument(
+            '--factors', type=int, default=None,
+            help='Размерность факторов (по умолчанию из настроек).',
+        )
+        parser.add_argument(
+            '--regularization', type=float, default=None,
+            help='Коэффициент регуляризации (по умолчанию из настроек).',
+        )
+        parser.add_argument(
+            '--iterations', type=int, default=None,
+            help='Число итераций ALS (по умолчанию из настроек).',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Количество процессов для расчета факторов.',
+        )
+
+    def handle(self, *args, **options):
+        """Обрабатывает команду обучения."""
+        for name in ('factors', 'iterations', 'workers'):
+            if options[name] is not None and options[name] < 1:
+                raise CommandError(f'--{name} должен быть положительным.')
+        if options['regularization'] is not None and (
+            options['regularization'] <= 0
+        ):
+            raise CommandError('--regularization должен быть положительным.')
+        start = time.perf_counter()
+        stats = recommendations.train_recommendations(
+            options['factors'], options['regularization'],
+            options['iterations'], options['workers'],
+        )
+        self.stdout.write(
+            f'Пользователей: {stats["users"]}, произведений: '
+            f'{stats["titles"]}, оценок: {stats["ratings"]} за '
+            f'{time.perf_counter() - start:.1f} с'
+        )
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.1 on 2026-10-18 10:00
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_title_ratings(apps, schema_editor):
+    """Заполняет сохраненные рейтинги по существующим отзывам."""
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    rows = Review.objects.values('title').annotate(
+        score_sum=Sum('score'), score_count=Count('id')
+    ).order_by()
+    for row in rows:
+        Title.objects.filter(pk=row['title']).update(
+            rating_sum=row['score_sum'], rating_count=row['score_count']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_alter_review_author'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_title_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.1.1 on 2026-10-18 11:00
+
+from django.db import migrations
+
+SQLITE_FTS_TABLES = (
+    ('reviews_title_fts', 'reviews_title', ('name', 'description')),
+    ('reviews_review_fts', 'reviews_review', ('text',)),
+    ('reviews_comment_fts', 'reviews_comment', ('text',)),
+)
+
+POSTGRES_SEARCH_INDEXES = (
+    ('reviews_title_search_idx', 'reviews_title',
+     (('name', 'A'), ('description', 'B'))),
+    ('reviews_review_search_idx', 'reviews_review', (('text', 'A'),)),
+    ('reviews_comment_search_idx', 'reviews_comment', (('text', 'A'),)),
+)
+
+
+def sqlite_create_statements(fts, table, columns):
+    """SQL для таблицы FTS5 с внешним содержимым и триггеров синхронизации."""
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    delete = (
+        f"INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old});"
+    )
+    insert = f'INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new});'
+    return (
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, "
+        f"content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')",
+        f'CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN '
+        f'{insert} END',
+        f'CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN '
+        f'{delete} END',
+        f'CREATE TRIGGER {fts}_au AFTER UPDATE ON {table} BEGIN '
+        f'{delete} {insert} END',
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    )
+
+
+def postgres_create_statement(index, table, columns):
+    """SQL для GIN индекса по взвешенному tsvector."""
+    vector = ' || '.join(
+        f"setweight(to_tsvector('russian'::regconfig, "
+        f"COALESCE({column}, '')), '{weight}')"
+        for column, weight in columns
+    )
+    return f'CREATE INDEX {index} ON {table} USING GIN (({vector}))'
+
+
+def create_search_index(apps, schema_editor):
+    """Создает поисковые структуры для используемой СУБД."""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for fts, table, columns in SQLITE_FTS_TABLES:
+            for sql in sqlite_create_statements(fts, table, columns):
+                schema_editor.execute(sql)
+    elif vendor == 'postgresql':
+        for index, table, columns in POSTGRES_SEARCH_INDEXES:
+            schema_editor.execute(
+                postgres_create_statement(index, table, columns)
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    """Удаляет поисковые структуры."""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for fts, _, _ in SQLITE_FTS_TABLES:
+            for suffix in ('ai', 'ad', 'au'):
+                schema_editor.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+            schema_editor.execute(f'DROP TABLE IF EXISTS {fts}')
+    elif vendor == 'postgresql':
+        for index, _, _ in POSTGRES_SEARCH_INDEXES:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {index}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_review_comment_pub_date_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.1 on 2026-10-18 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_full_text_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TableVersion',
+            fields=[
+                ('name', models.CharField(max_length=256, primary_key=True, serialize=False, verbose_name='Таблица')),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='Версия')),
+                ('modified', models.DateTimeField(auto_now=True, verbose_name='Дата изменения')),
+            ],
+            options={
+                'verbose_name': 'версия таблицы',
+                'verbose_name_plural': 'Версии таблиц',
+            },
+        ),
+    ]
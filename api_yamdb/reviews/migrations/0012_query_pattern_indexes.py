@@ -0,0 +1,60 @@
+# Generated by Django 5.1.1 on 2026-10-18 12:30
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def delete_duplicate_title_genres(apps, schema_editor):
+    """Оставляет по одной связи для каждой пары произведение-жанр."""
+    TitleGenre = apps.get_model('reviews', 'TitleGenre')
+    duplicates = (
+        TitleGenre.objects.values('title', 'genre')
+        .annotate(first_id=Min('id'), count=Count('id'))
+        .filter(count__gt=1)
+        .order_by()
+    )
+    for row in duplicates:
+        TitleGenre.objects.filter(
+            title=row['title'], genre=row['genre']
+        ).exclude(id=row['first_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_tableversion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['name'], name='category_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='genre',
+            index=models.Index(fields=['name'], name='genre_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['name'], name='title_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year', 'name'], name='title_year_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'name'], name='title_category_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titlegenre',
+            index=models.Index(fields=['genre', 'title'], name='titlegenre_genre_title_idx'),
+        ),
+        migrations.RunPython(
+            delete_duplicate_title_genres, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='titlegenre',
+            constraint=models.UniqueConstraint(fields=('title', 'genre'), name='unique_title_genre'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.1 on 2026-10-18 18:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_query_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleFingerprint',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='fingerprint', serialize=False, to='reviews.title', verbose_name='Произведение')),
+                ('digest', models.BigIntegerField(verbose_name='Отпечаток')),
+            ],
+            options={
+                'verbose_name': 'отпечаток произведения',
+                'verbose_name_plural': 'Отпечатки произведений',
+            },
+        ),
+        migrations.CreateModel(
+            name='TitleSimilarity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='Сходство')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_to', to='reviews.title', verbose_name='Похожее произведение')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similarities', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'похожее произведение',
+                'verbose_name_plural': 'Похожие произведения',
+                'indexes': [models.Index(fields=['title', '-score'], name='similarity_title_score_idx')],
+            },
+        ),
+    ]
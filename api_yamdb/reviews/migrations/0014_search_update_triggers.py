@@ -0,0 +1,66 @@
+# Generated by Django 5.1.1 on 2026-10-18 21:00
+
+from django.db import migrations
+
+SQLITE_FTS_TABLES = (
+    ('reviews_title_fts', 'reviews_title', ('name', 'description')),
+    ('reviews_review_fts', 'reviews_review', ('text',)),
+    ('reviews_comment_fts', 'reviews_comment', ('text',)),
+)
+
+
+def sqlite_update_trigger(fts, table, columns, restricted=True):
+    """
+    SQL триггера обновления индекса FTS5.
+
+    С restricted триггер срабатывает только при изменении колонок текста.
+    """
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    event = f'UPDATE OF {names}' if restricted else 'UPDATE'
+    return (
+        f'CREATE TRIGGER {fts}_au AFTER {event} ON {table} BEGIN '
+        f"INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old}); "
+        f'INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new}); END'
+    )
+
+
+def replace_update_triggers(schema_editor, restricted):
+    """Пересоздает триггеры обновления FTS5."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for fts, table, columns in SQLITE_FTS_TABLES:
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {fts}_au')
+        schema_editor.execute(
+            sqlite_update_trigger(fts, table, columns, restricted)
+        )
+
+
+def restrict_update_triggers(apps, schema_editor):
+    """
+    Ограничивает триггеры обновления FTS5 колонками текста.
+
+    Раньше индекс переписывался при любом UPDATE, в том числе при
+    пересчете рейтинга произведения.
+    """
+    replace_update_triggers(schema_editor, restricted=True)
+
+
+def unrestrict_update_triggers(apps, schema_editor):
+    """Возвращает триггеры из миграции 0010."""
+    replace_update_triggers(schema_editor, restricted=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_titlesimilarity_titlefingerprint'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            restrict_update_triggers, unrestrict_update_triggers
+        ),
+    ]
@@ -40,6 +40,7 @@ class Category(models.Model):
         ordering = ('name',)
         verbose_name = 'категория'
         verbose_name_plural = 'Категории'
+        indexes = [models.Index(fields=['name'], name='category_name_idx')]
 
 
 class Genre(models.Model):
@@ -65,6 +66,7 @@ class Genre(models.Model):
         ordering = ('name',)
         verbose_name = 'жанр'
         verbose_name_plural = 'Жанры'
+        indexes = [models.Index(fields=['name'], name='genre_name_idx')]
 
 
 class Title(models.Model):
@@ -100,6 +102,16 @@ class Title(models.Model):
         through='TitleGenre',
         verbose_name='Жанр',
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         """Мета-класс для модели Title."""
@@ -108,11 +120,27 @@ class Title(models.Model):
         ordering = ('name',)
         verbose_name = 'произведение'
         verbose_name_plural = 'Произведения'
+        # Списки сортируются по названию, в том числе после фильтров по
+        # году и категории.
+        indexes = [
+            models.Index(fields=['name'], name='title_name_idx'),
+            models.Index(fields=['year', 'name'], name='title_year_name_idx'),
+            models.Index(
+                fields=['category', 'name'], name='title_category_name_idx'
+            ),
+        ]
 
     def __str__(self):
         """Строковое представление произведения."""
         return self.name[:MAX_LENGTH]
 
+    @property
+    def rating(self):
+        """Средняя оценка произведения или None, если отзывов нет."""
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
 
 class TitleGenre(models.Model):
     """Промежуточная модель для связи Title и Genre."""
@@ -126,6 +154,21 @@ class TitleGenre(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        """Мета-класс для модели TitleGenre."""
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'genre'], name='unique_title_genre'
+            )
+        ]
+        # Фильтр произведений по жанру идет от жанра к произведениям.
+        indexes = [
+            models.Index(
+                fields=['genre', 'title'], name='titlegenre_genre_title_idx'
+            )
+        ]
+
     def __str__(self):
         """Строковое представление связи Title-Genre."""
         return f'{self.title} - {self.genre}'
@@ -164,6 +207,12 @@ class Review(models.Model):
 
         constraints = [models.UniqueConstraint(fields=['title', 'author'],
                                                name='unique_review')]
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx',
+            ),
+        ]
 
 
 class Comment(models.Model):
@@ -186,3 +235,98 @@ class Comment(models.Model):
         auto_now_add=True
     )
     text = models.TextField(verbose_name='Текст комментария')
+
+    class Meta:
+        """Мета-класс для модели Comment."""
+
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx',
+            ),
+        ]
+
+
+class TitleSimilarity(models.Model):
+    """Похожее произведение из индекса сходства."""
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='similarities',
+        verbose_name='Произведение',
+    )
+    similar = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='similar_to',
+        verbose_name='Похожее произведение',
+    )
+    score = models.FloatField(verbose_name='Сходство')
+
+    class Meta:
+        """Мета-класс для модели TitleSimilarity."""
+
+        verbose_name = 'похожее произведение'
+        verbose_name_plural = 'Похожие произведения'
+        # Соседи произведения читаются одним проходом по индексу.
+        indexes = [
+            models.Index(
+                fields=['title', '-score'], name='similarity_title_score_idx'
+            ),
+        ]
+
+    def __str__(self):
+        """Строковое представление пары похожих произведений."""
+        return f'{self.title_id} ~ {self.similar_id}: {self.score:.3f}'
+
+
+class TitleFingerprint(models.Model):
+    """Отпечаток признаков произведения на момент расчета сходства."""
+
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='fingerprint',
+        verbose_name='Произведение',
+    )
+    digest = models.BigIntegerField(verbose_name='Отпечаток')
+
+    class Meta:
+        """Мета-класс для модели TitleFingerprint."""
+
+        verbose_name = 'отпечаток произведения'
+        verbose_name_plural = 'Отпечатки произведений'
+
+    def __str__(self):
+        """Строковое представление отпечатка."""
+        return f'{self.title_id}: {self.digest}'
+
+
+class TableVersion(models.Model):
+    """Счетчик изменений таблицы для условных GET-запросов."""
+
+    name = models.CharField(
+        max_length=NAME_MAX_LENGTH,
+        primary_key=True,
+        verbose_name='Таблица',
+    )
+    version = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Версия',
+    )
+    modified = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения',
+    )
+
+    class Meta:
+        """Мета-класс для модели TableVersion."""
+
+        verbose_name = 'версия таблицы'
+        verbose_name_plural = 'Версии таблиц'
+
+    def __str__(self):
+        """Строковое представление версии таблицы."""
+        return f'{self.name}: {self.version}'
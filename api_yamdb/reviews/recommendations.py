@@ -0,0 +1,307 @@
+"""
+Персональные рекомендации произведений.
+
+Матрица оценок пользователь x произведение раскладывается методом
+чередующихся наименьших квадратов (ALS) на факторы пользователей и
+произведений. Факторы сохраняются в файлы .npy, которые API читает через
+отображение в память, а рекомендации - произведения с наибольшим
+скалярным произведением факторов.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+from django.conf import settings
+from scipy import sparse
+
+from reviews.csv_import import init_worker
+from reviews.models import Review
+
+# Оценок, читаемых из базы за один запрос.
+CHUNK_SIZE = 10_000
+# Строк матрицы оценок в одной задаче пула процессов.
+BLOCK_ROWS = 4096
+# Чисел в одном дополненном массиве факторов при расчете матриц Грама.
+GRAM_CHUNK_SIZE = 1 << 22
+CURRENT_FILE = 'current'
+FACTOR_FILES = ('user_ids', 'user_factors', 'title_ids', 'title_factors')
+
+_loaded = {'stamp': None, 'model': None}
+# Матрицы и факторы процесса пула, см. init_solver.
+_solver = {}
+
+
+def load_ratings():
+    """
+    Читает оценки одним проходом по отзывам.
+
+    Возвращает id пользователей и произведений, соответствующие строкам
+    и столбцам разреженной матрицы оценок, и саму матрицу.
+    """
+    rows = np.fromiter(
+        Review.objects.values_list('author_id', 'title_id', 'score')
+        .iterator(chunk_size=CHUNK_SIZE),
+        dtype=np.dtype((np.int64, 3)),
+    )
+    user_ids, users = np.unique(rows[:, 0], return_inverse=True)
+    title_ids, titles = np.unique(rows[:, 1], return_inverse=True)
+    ratings = sparse.csr_matrix(
+        (rows[:, 2].astype(np.float64), (users, titles)),
+        shape=(len(user_ids), len(title_ids)),
+    )
+    return user_ids, title_ids, ratings
+
+
+def gram_matrices(ratings, fixed):
+    """
+    Возвращает матрицы Y^T Y строк ratings по факторам Y их столбцов.
+
+    Строки группируются по числу оценок, округленному до степени двойки,
+    и дополняются нулевыми факторами до общей длины. Матрицы группы
+    считаются одним пакетным умножением, а дополнение не больше чем
+    вдвое увеличивает объем данных.
+    """
+    rank = fixed.shape[1]
+    counts = np.diff(ratings.indptr)
+    grams = np.zeros((len(counts), rank, rank))
+    if not ratings.nnz:
+        return grams
+    padded = np.vstack((fixed, np.zeros((1, rank))))
+    widths = 1 << np.ceil(np.log2(np.maximum(counts, 1))).astype(np.int64)
+    widths[counts == 0] = 0
+    for width in np.unique(widths[widths > 0]):
+        rows = np.flatnonzero(widths == width)
+        step = max(GRAM_CHUNK_SIZE // (width * rank), 1)
+        for start in range(0, len(rows), step):
+            part = rows[start:start + step]
+            positions = ratings.indptr[part, None] + np.arange(width)
+            columns = np.where(
+                positions < ratings.indptr[part + 1, None],
+                ratings.indices[np.minimum(positions, ratings.nnz - 1)],
+                len(fixed),
+            )
+            rated = padded[columns]
+            grams[part] = np.swapaxes(rated, 1, 2) @ rated
+    return grams
+
+
+def solve_factors(ratings, fixed, regularization):
+    """
+    Находит факторы строк ratings при известных факторах столбцов.
+
+    Для каждой строки решается система (Y^T Y + l n I) x = Y^T r, где Y -
+    факторы только оцененных строкой столбцов, а r - ее оценки.
+    """
+    rank = fixed.shape[1]
+    grams = gram_matrices(ratings, fixed)
+    counts = np.maximum(np.diff(ratings.indptr), 1)
+    grams += regularization * counts[:, None, None] * np.eye(rank)
+    return np.linalg.solve(grams, (ratings @ fixed)[..., None])[..., 0]
+
+
+def solve_block(ratings, fixed, regularization, out, start):
+    """Решает строки ratings блока, начинающегося с start, в out."""
+    stop = start + BLOCK_ROWS
+    out[start:stop] = solve_factors(ratings[start:stop], fixed,
+                                    regularization)
+
+
+def init_solver(matrices, paths, regularization):
+    """
+    Настраивает процесс пула для расчета факторов.
+
+    Матрицы оценок передаются один раз при запуске процесса, а факторы
+    читаются и записываются через отображенные в память файлы paths.
+    """
+    init_worker()
+    _solver.update(
+        matrices=matrices,
+        factors=[np.load(path, mmap_mode='r+') for path in paths],
+        regularization=regularization,
+    )
+
+
+def solve_shared_block(side, start):
+    """Решает блок строк матрицы side в процессе пула."""
+    factors = _solver['factors']
+    solve_block(_solver['matrices'][side], factors[1 - side],
+                _solver['regularization'], factors[side], start)
+
+
+def factorize(ratings, rank, regularization, iterations, workers=1,
+              seed=42):
+    """
+    Раскладывает матрицу оценок на факторы пользователей и произведений.
+
+    Оценки центрируются по среднему, поэтому порядок рекомендаций задает
+    только скалярное произведение факторов. При workers > 1 блоки строк
+    решаются в пуле процессов.
+    """
+    ratings = ratings.copy()
+    ratings.data -= ratings.data.mean()
+    matrices = (ratings, ratings.T.tocsr())
+    rng = np.random.default_rng(seed)
+    titles = rng.normal(scale=0.1, size=(ratings.shape[1], rank))
+    if workers == 1:
+        factors = (np.zeros((ratings.shape[0], rank)), titles)
+        for _ in range(iterations):
+            for side, matrix in enumerate(matrices):
+                for start in range(0, matrix.shape[0], BLOCK_ROWS):
+                    solve_block(matrix, factors[1 - side], regularization,
+                                factors[side], start)
+        return factors
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [
+            os.path.join(directory, f'{name}.npy')
+            for name in ('users', 'titles')
+        ]
+        factors = [
+            np.lib.format.open_memmap(
+                path, mode='w+', dtype=np.float64,
+                shape=(matrix.shape[0], rank),
+            )
+            for path, matrix in zip(paths, matrices)
+        ]
+        factors[1][:] = titles
+        factors[1].flush()
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=init_solver,
+            initargs=(matrices, paths, regularization),
+        ) as pool:
+            for _ in range(iterations):
+                for side, matrix in enumerate(matrices):
+                    list(pool.map(
+                        solve_shared_block, repeat(side),
+                        range(0, matrix.shape[0], BLOCK_ROWS),
+                    ))
+        return tuple(np.array(array) for array in factors)
+
+
+def save_factors(directory, arrays):
+    """
+    Сохраняет факторы в новый подкаталог и делает его текущим.
+
+    Имя текущего подкаталога заменяется атомарно, поэтому процессы API
+    не читают наполовину записанные файлы; остается одна прошлая версия.
+    """
+    os.makedirs(directory, exist_ok=True)
+    version = f'{time.time_ns()}'
+    os.makedirs(os.path.join(directory, version))
+    for name in FACTOR_FILES:
+        np.save(
+            os.path.join(directory, version, f'{name}.npy'),
+            np.ascontiguousarray(arrays[name]),
+        )
+    current = os.path.join(directory, CURRENT_FILE)
+    previous = read_current(directory)
+    with open(f'{current}.tmp', 'w', encoding='utf-8') as file:
+        file.write(version)
+    os.replace(f'{current}.tmp', current)
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if os.path.isdir(path) and name not in (version, previous):
+            shutil.rmtree(path, ignore_errors=True)
+    return version
+
+
+def read_current(directory):
+    """Возвращает имя текущего подкаталога факторов или None."""
+    try:
+        with open(
+            os.path.join(directory, CURRENT_FILE), encoding='utf-8'
+        ) as file:
+            return file.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def train_recommendations(rank=None, regularization=None, iterations=None,
+                          workers=1):
+    """
+    Обучает модель рекомендаций по всем отзывам и сохраняет факторы.
+
+    Возвращает число пользователей, произведений и оценок.
+    """
+    user_ids, title_ids, ratings = load_ratings()
+    stats = {
+        'users': len(user_ids),
+        'titles': len(title_ids),
+        'ratings': ratings.nnz,
+    }
+    if not ratings.nnz:
+        return stats
+    users, titles = factorize(
+        ratings,
+        rank or settings.RECOMMENDATIONS_FACTORS,
+        regularization or settings.RECOMMENDATIONS_REGULARIZATION,
+        iterations or settings.RECOMMENDATIONS_ITERATIONS,
+        workers,
+    )
+    save_factors(settings.RECOMMENDATIONS_DIR, {
+        'user_ids': user_ids,
+        'user_factors': users.astype(np.float32),
+        'title_ids': title_ids,
+        'title_factors': titles.astype(np.float32),
+    })
+    return stats
+
+
+class RecommendationModel:
+    """Факторы, отображенные в память из подкаталога модели."""
+
+    def __init__(self, path):
+        for name in FACTOR_FILES:
+            setattr(self, name, np.load(
+                os.path.join(path, f'{name}.npy'), mmap_mode='r'
+            ))
+
+    def recommend(self, user_id, exclude, limit):
+        """
+        Возвращает id произведений с наибольшей оценкой модели.
+
+        Произведения из exclude пропускаются. Для пользователя, которого
+        не было при обучении, возвращается None.
+        """
+        row = np.searchsorted(self.user_ids, user_id)
+        if row == len(self.user_ids) or self.user_ids[row] != user_id:
+            return None
+        scores = self.title_factors @ self.user_factors[row]
+        exclude = np.fromiter(exclude, dtype=np.int64)
+        positions = np.searchsorted(self.title_ids, exclude)
+        known = positions < len(self.title_ids)
+        known[known] = self.title_ids[positions[known]] == exclude[known]
+        scores[positions[known]] = -np.inf
+        limit = min(limit, len(scores) - int(known.sum()))
+        if limit < 1:
+            return []
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return self.title_ids[top].tolist()
+
+
+def get_recommendation_model():
+    """
+    Возвращает текущую модель или None, если ее нет.
+
+    Модель загружается один раз на процесс и перечитывается после того,
+    как команда обучения сменит текущий подкаталог.
+    """
+    directory = settings.RECOMMENDATIONS_DIR
+    version = read_current(directory)
+    stamp = (str(directory), version)
+    if stamp != _loaded['stamp']:
+        model = None
+        if version:
+            try:
+                model = RecommendationModel(
+                    os.path.join(directory, version)
+                )
+            except (OSError, ValueError):
+                model = None
+        _loaded.update(stamp=stamp, model=model)
+    return _loaded['model']
@@ -0,0 +1,156 @@
+"""Полнотекстовый поиск по произведениям, отзывам и комментариям."""
+
+import re
+from contextlib import contextmanager
+from functools import reduce
+from operator import add
+
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from reviews.models import Comment, Review, Title
+from reviews.stemmer import stem
+
+WORD_RE = re.compile(r'\w+')
+
+# Таблицы FTS5 и веса колонок для bm25: название важнее описания.
+SQLITE_FTS_TABLES = {
+    Title: ('reviews_title_fts', (10.0, 1.0)),
+    Review: ('reviews_review_fts', (1.0,)),
+    Comment: ('reviews_comment_fts', (1.0,)),
+}
+
+# Колонки, по которым строятся поисковые векторы PostgreSQL.
+POSTGRES_SEARCH_FIELDS = {
+    Title: (('name', 'A'), ('description', 'B')),
+    Review: (('text', 'A'),),
+    Comment: (('text', 'A'),),
+}
+
+
+@contextmanager
+def deferred_search_index():
+    """
+    Откладывает обновление индекса FTS5 на время массовой записи.
+
+    Триггеры синхронизации удаляются, а после записи создаются заново,
+    и индекс перестраивается одной командой rebuild, что в несколько раз
+    быстрее построчного обновления. На других СУБД ничего не делает.
+    """
+    if connection.vendor != 'sqlite':
+        yield
+        return
+    tables = [table for table, _ in SQLITE_FTS_TABLES.values()]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger'"
+        )
+        triggers = [
+            (name, sql) for name, sql in cursor.fetchall()
+            if any(name.startswith(f'{table}_') for table in tables)
+        ]
+        for name, _ in triggers:
+            cursor.execute(f'DROP TRIGGER {name}')
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            for _, sql in triggers:
+                cursor.execute(sql)
+            for table in tables:
+                cursor.execute(
+                    f"INSERT INTO {table}({table}) VALUES ('rebuild')"
+                )
+
+
+def get_search_terms(query):
+    """Разбивает запрос на слова и приводит их к основам."""
+    return [stem(word) for word in WORD_RE.findall(query.lower())]
+
+
+def order_by_ids(queryset, ids):
+    """Возвращает объекты queryset в порядке переданных id."""
+    objects = queryset.in_bulk(ids)
+    return [objects[pk] for pk in ids if pk in objects]
+
+
+class BaseSearchBackend:
+    """Базовый класс поискового бэкенда."""
+
+    def search_ids(self, model, query, limit):
+        """Возвращает id найденных объектов по убыванию релевантности."""
+        raise NotImplementedError
+
+    def search(self, model, query, limit, queryset=None):
+        """Возвращает найденные объекты модели по убыванию релевантности."""
+        if queryset is None:
+            queryset = model.objects.all()
+        return order_by_ids(queryset, self.search_ids(model, query, limit))
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """
+    Поиск по виртуальным таблицам SQLite FTS5.
+
+    Таблицы создаются миграцией и синхронизируются триггерами. В индексе
+    хранятся слова целиком, поэтому каждое слово запроса приводится к
+    основе и ищется как префикс.
+    """
+
+    def build_match(self, query):
+        """Строит выражение MATCH из основ слов запроса."""
+        terms = [term for term in get_search_terms(query) if term]
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def search_ids(self, model, query, limit):
+        """Возвращает id найденных объектов по убыванию релевантности."""
+        match = self.build_match(query)
+        if not match:
+            return []
+        table, weights = SQLITE_FTS_TABLES[model]
+        bm25_args = ', '.join(str(weight) for weight in weights)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {table} WHERE {table} MATCH %s '
+                f'ORDER BY bm25({table}, {bm25_args}) LIMIT %s',
+                (match, limit),
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    Поиск по tsvector PostgreSQL с русской морфологией.
+
+    Выражение вектора совпадает с GIN индексами из миграции, поэтому
+    фильтрация выполняется по индексу.
+    """
+
+    config = 'russian'
+
+    def search_ids(self, model, query, limit):
+        """Возвращает id найденных объектов по убыванию релевантности."""
+        from django.contrib.postgres.search import (
+            SearchQuery,
+            SearchRank,
+            SearchVector,
+        )
+
+        vector = reduce(add, (
+            SearchVector(field, weight=weight, config=self.config)
+            for field, weight in POSTGRES_SEARCH_FIELDS[model]
+        ))
+        search_query = SearchQuery(query, config=self.config)
+        return list(
+            model.objects.annotate(
+                search=vector, rank=SearchRank(vector, search_query)
+            ).filter(search=search_query).order_by('-rank').values_list(
+                'pk', flat=True
+            )[:limit]
+        )
+
+
+def get_search_backend():
+    """Возвращает поисковый бэкенд из настройки SEARCH_BACKEND."""
+    return import_string(settings.SEARCH_BACKEND)()
@@ -0,0 +1,26 @@
+"""Обработчики сигналов приложения reviews."""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Genre, Review, Title, TitleGenre
+from reviews.utils import bump_table_versions
+
+# Таблицы, изменение которых меняет представление произведений и
+# справочников в API.
+VERSIONED_MODELS = (Category, Genre, Title, TitleGenre, Review)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_version_on_change(sender, **kwargs):
+    """Увеличивает версию таблицы при изменении ее записей."""
+    if sender in VERSIONED_MODELS and not kwargs.get('raw'):
+        bump_table_versions(sender)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def bump_version_on_genre_change(sender, action, **kwargs):
+    """Увеличивает версию связей жанров при изменении жанров произведения."""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_table_versions(TitleGenre)
@@ -0,0 +1,297 @@
+"""
+Индекс похожих произведений.
+
+Сходство складывается из совпадения жанров и категории, близости годов
+выпуска и общих высоких оценок: произведения похожи, если их высоко
+оценили одни и те же пользователи. Признаки собираются в разреженные
+матрицы, а сходство считается блоками строк матричными произведениями.
+"""
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from scipy import sparse
+
+from reviews.models import (
+    Review,
+    Title,
+    TitleFingerprint,
+    TitleGenre,
+    TitleSimilarity,
+)
+from reviews.utils import bump_table_versions
+
+# Строк матрицы сходства в одном блоке: блок занимает BLOCK_ROWS * n чисел.
+BLOCK_ROWS = 256
+# Строк, читаемых из базы за один запрос и записываемых одной пачкой.
+CHUNK_SIZE = 10_000
+NO_CATEGORY = -1
+STORED = np.dtype([
+    ('title', np.int64), ('similar', np.int64), ('score', np.float64),
+])
+
+
+def mix(values):
+    """Перемешивает биты чисел массива (финализатор splitmix64)."""
+    values = values.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(
+        0xBF58476D1CE4E5B9
+    )
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(
+        0x94D049BB133111EB
+    )
+    return values ^ (values >> np.uint64(31))
+
+
+def read_array(queryset, dtype):
+    """Читает строки queryset в массив numpy порциями по CHUNK_SIZE."""
+    return np.fromiter(queryset.iterator(chunk_size=CHUNK_SIZE), dtype=dtype)
+
+
+def top_neighbors(positions, scores, count):
+    """Возвращает count лучших столбцов каждой строки по убыванию."""
+    top = np.argpartition(-scores, count - 1, axis=1)[:, :count]
+    scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-scores, axis=1, kind='stable')
+    return (
+        np.take_along_axis(np.take_along_axis(positions, top, 1), order, 1),
+        np.take_along_axis(scores, order, axis=1),
+    )
+
+
+class TitleFeatures:
+    """
+    Признаки всех произведений; строки упорядочены по id.
+
+    Жанры и авторы высоких оценок хранятся разреженными матрицами с
+    нормированными строками, поэтому их произведение дает косинусное
+    сходство. Отпечаток строки меняется вместе с любым из признаков.
+    """
+
+    def __init__(self):
+        titles = read_array(
+            Title.objects.order_by('id').values_list(
+                'id', Coalesce('category_id', Value(NO_CATEGORY)), 'year'
+            ),
+            np.dtype((np.int64, 3)),
+        )
+        self.ids = titles[:, 0]
+        self.categories = titles[:, 1]
+        self.years = titles[:, 2].astype(np.float64)
+        self.genres, genre_hashes = self.load_matrix(
+            TitleGenre.objects.values_list('title_id', 'genre_id')
+        )
+        self.ratings, rating_hashes = self.load_matrix(
+            Review.objects.filter(
+                score__gte=settings.TITLE_SIMILARITY_HIGH_SCORE
+            ).values_list('title_id', 'author_id')
+        )
+        digests = mix(self.categories)
+        for values in (titles[:, 2], genre_hashes, rating_hashes):
+            digests = mix(digests ^ values.astype(np.uint64))
+        self.digests = digests.view(np.int64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def positions(self, ids):
+        """Возвращает номера строк для id и маску известных id."""
+        positions = np.searchsorted(self.ids, ids)
+        known = positions < len(self.ids)
+        known[known] = self.ids[positions[known]] == ids[known]
+        return positions, known
+
+    def load_matrix(self, queryset):
+        """
+        Загружает пары (произведение, признак) в разреженную матрицу.
+
+        Возвращает матрицу с единичными строками и отпечатки множеств
+        признаков произведений. Пары произведений, добавленных после
+        чтения списка, пропускаются.
+        """
+        pairs = read_array(queryset, np.dtype((np.int64, 2)))
+        rows, known = self.positions(pairs[:, 0])
+        rows, values = rows[known], pairs[known, 1]
+        hashes = np.zeros(len(self), dtype=np.uint64)
+        np.add.at(hashes, rows, mix(values))
+        labels, columns = np.unique(values, return_inverse=True)
+        sizes = np.bincount(rows, minlength=len(self))
+        norms = np.zeros(len(self))
+        norms[sizes > 0] = 1 / np.sqrt(sizes[sizes > 0])
+        matrix = sparse.csr_matrix(
+            (norms[rows], (rows, columns)), shape=(len(self), len(labels))
+        )
+        return matrix, hashes
+
+    def scores(self, rows, columns=None):
+        """Возвращает сходство строк rows со столбцами columns (всеми)."""
+        weights = settings.TITLE_SIMILARITY_WEIGHTS
+        genres, ratings = self.genres, self.ratings
+        categories, years = self.categories, self.years
+        if columns is not None:
+            genres, ratings = genres[columns], ratings[columns]
+            categories, years = categories[columns], years[columns]
+        scores = weights['genre'] * (self.genres[rows] @ genres.T).toarray()
+        scores += weights['ratings'] * (
+            self.ratings[rows] @ ratings.T
+        ).toarray()
+        scores += weights['category'] * (
+            (self.categories[rows, None] == categories)
+            & (categories != NO_CATEGORY)
+        )
+        scores += weights['year'] / (
+            1 + np.abs(self.years[rows, None] - years)
+            / settings.TITLE_SIMILARITY_YEAR_SCALE
+        )
+        return scores
+
+
+class SimilarityIndex:
+    """Сохраненные соседи и отпечатки в номерах строк признаков."""
+
+    def __init__(self, features, count, full):
+        self.features = features
+        self.count = count
+        self.changed = np.ones(len(features), dtype=bool)
+        self.neighbors = np.zeros((len(features), count), dtype=np.int64)
+        self.scores = np.zeros((len(features), count))
+        self.complete = np.zeros(len(features), dtype=bool)
+        if not full:
+            self.load()
+
+    def load(self):
+        """Сравнивает отпечатки и читает полные списки соседей."""
+        features = self.features
+        stored = read_array(
+            TitleFingerprint.objects.values_list('title_id', 'digest'),
+            np.dtype((np.int64, 2)),
+        )
+        rows, known = features.positions(stored[:, 0])
+        rows = rows[known]
+        self.changed[rows] = features.digests[rows] != stored[known, 1]
+        stored = read_array(
+            TitleSimilarity.objects.order_by('title_id', '-score').values_list(
+                'title_id', 'similar_id', 'score'
+            ),
+            STORED,
+        )
+        rows, known = features.positions(stored['title'])
+        similar, similar_known = features.positions(stored['similar'])
+        known &= similar_known
+        sizes = np.bincount(rows[known], minlength=len(features))
+        self.complete = sizes == self.count
+        full_rows = known & self.complete[np.where(known, rows, 0)]
+        rows = np.flatnonzero(self.complete)
+        self.neighbors[rows] = similar[full_rows].reshape(-1, self.count)
+        self.scores[rows] = stored['score'][full_rows].reshape(
+            -1, self.count
+        )
+
+    def stale_rows(self):
+        """
+        Возвращает строки, соседей которых нужно искать среди всех.
+
+        Это измененные произведения, неполные списки и списки, в которые
+        входят измененные произведения: их сходство могло уменьшиться.
+        """
+        return np.flatnonzero(
+            self.changed | ~self.complete
+            | self.changed[self.neighbors].any(axis=1)
+        )
+
+    def rebuild(self, rows):
+        """Ищет соседей строк rows среди всех произведений."""
+        scores = self.features.scores(rows)
+        scores[np.arange(len(rows)), rows] = -np.inf
+        positions = np.broadcast_to(
+            np.arange(len(self.features)), scores.shape
+        )
+        return top_neighbors(positions, scores, self.count)
+
+    def merge(self, rows, changed):
+        """
+        Добавляет к сохраненным соседям строк rows измененные строки.
+
+        Сходство с остальными произведениями не менялось, поэтому новые
+        соседи - лучшие из сохраненных и измененных.
+        """
+        positions = np.hstack((
+            self.neighbors[rows],
+            np.broadcast_to(changed, (len(rows), len(changed))),
+        ))
+        scores = np.hstack((
+            self.scores[rows], self.features.scores(rows, changed)
+        ))
+        return top_neighbors(positions, scores, self.count)
+
+
+def save_neighbors(ids, rows, neighbors, scores):
+    """Заменяет сохраненных соседей произведений строк rows."""
+    TitleSimilarity.objects.filter(title_id__in=ids[rows].tolist()).delete()
+    TitleSimilarity.objects.bulk_create(
+        [
+            TitleSimilarity(title_id=title_id, similar_id=similar_id,
+                            score=score)
+            for title_id, similar_ids, row_scores in zip(
+                ids[rows].tolist(), ids[neighbors].tolist(), scores.tolist()
+            )
+            for similar_id, score in zip(similar_ids, row_scores)
+        ],
+        batch_size=CHUNK_SIZE,
+    )
+
+
+def build_similarity_index(neighbors=None, full=False):
+    """
+    Обновляет индекс похожих произведений.
+
+    Пересчитываются только списки соседей, на которые могли повлиять
+    произведения с изменившимися признаками; full пересчитывает все.
+    Возвращает число произведений, измененных произведений и
+    перезаписанных списков соседей.
+    """
+    features = TitleFeatures()
+    count = min(
+        neighbors or settings.TITLE_SIMILARITY_NEIGHBORS, len(features) - 1
+    )
+    stats = {'titles': len(features), 'changed': 0, 'rewritten': 0}
+    if count < 1:
+        return stats
+    index = SimilarityIndex(features, count, full)
+    changed = np.flatnonzero(index.changed)
+    stats['changed'] = len(changed)
+    stale = index.stale_rows()
+    merged = np.setdiff1d(np.arange(len(features)), stale)
+    if not len(changed):
+        merged = merged[:0]
+    with transaction.atomic():
+        for start in range(0, len(stale), BLOCK_ROWS):
+            rows = stale[start:start + BLOCK_ROWS]
+            save_neighbors(features.ids, rows, *index.rebuild(rows))
+            stats['rewritten'] += len(rows)
+        for start in range(0, len(merged), BLOCK_ROWS):
+            rows = merged[start:start + BLOCK_ROWS]
+            positions, scores = index.merge(rows, changed)
+            moved = (positions != index.neighbors[rows]).any(axis=1)
+            save_neighbors(
+                features.ids, rows[moved], positions[moved], scores[moved]
+            )
+            stats['rewritten'] += int(moved.sum())
+        TitleFingerprint.objects.bulk_create(
+            [
+                TitleFingerprint(title_id=title_id, digest=digest)
+                for title_id, digest in zip(
+                    features.ids[changed].tolist(),
+                    features.digests[changed].tolist(),
+                )
+            ],
+            batch_size=CHUNK_SIZE,
+            update_conflicts=True,
+            unique_fields=('title',),
+            update_fields=('digest',),
+        )
+        if stats['rewritten']:
+            bump_table_versions(TitleSimilarity)
+    return stats
@@ -0,0 +1,79 @@
+"""Стеммер Портера (Snowball) для русского языка."""
+
+import re
+
+VOWELS = 'аеиоуыэюя'
+
+PERFECTIVE_GERUND = re.compile(
+    r'(ив|ивши|ившись|ыв|ывши|ывшись|(?<=[ая])(в|вши|вшись))$'
+)
+REFLEXIVE = re.compile(r'(ся|сь)$')
+ADJECTIVE = re.compile(
+    r'(ее|ие|ые|ое|ими|ыми|ей|ий|ый|ой|ем|им|ым|ом|его|ого|ему|ому|их|ых'
+    r'|ую|юю|ая|яя|ою|ею)$'
+)
+PARTICIPLE = re.compile(r'(ивш|ывш|ующ|(?<=[ая])(ем|нн|вш|ющ|щ))$')
+VERB = re.compile(
+    r'(ила|ыла|ена|ейте|уйте|ите|или|ыли|ей|уй|ил|ыл|им|ым|ен|ило|ыло|ено'
+    r'|ят|ует|уют|ит|ыт|ены|ить|ыть|ишь|ую|ю'
+    r'|(?<=[ая])(ла|на|ете|йте|ли|й|л|ем|н|ло|но|ет|ют|ны|ть|ешь|нно))$'
+)
+NOUN = re.compile(
+    r'(а|ев|ов|ие|ье|е|иями|ями|ами|еи|ии|и|ией|ей|ой|ий|й|иям|ям|ием|ем'
+    r'|ам|ом|о|у|ах|иях|ях|ы|ь|ию|ью|ю|ия|ья|я)$'
+)
+DERIVATIONAL = re.compile(r'(ост|ость)$')
+SUPERLATIVE = re.compile(r'(ейше|ейш)$')
+DOUBLE_N = re.compile(r'(?<=н)н$')
+I_ENDING = re.compile(r'и$')
+SOFT_SIGN = re.compile(r'ь$')
+
+
+def _region_start(word, start):
+    """Возвращает начало области после первой пары гласная-согласная."""
+    for index in range(start + 1, len(word)):
+        if word[index] not in VOWELS and word[index - 1] in VOWELS:
+            return index + 1
+    return len(word)
+
+
+def _strip(pattern, word, start):
+    """Удаляет окончание, если оно целиком лежит в области с позиции start."""
+    match = pattern.search(word, start)
+    if match is None:
+        return word, False
+    return word[:match.start()], True
+
+
+def stem(word):
+    """Возвращает основу русского слова."""
+    word = word.lower().replace('ё', 'е')
+    rv = next(
+        (index + 1 for index, char in enumerate(word) if char in VOWELS),
+        len(word),
+    )
+    r2 = _region_start(word, _region_start(word, 0) - 1)
+
+    word, found = _strip(PERFECTIVE_GERUND, word, rv)
+    if not found:
+        word, _ = _strip(REFLEXIVE, word, rv)
+        word, found = _strip(ADJECTIVE, word, rv)
+        if found:
+            word, _ = _strip(PARTICIPLE, word, rv)
+        else:
+            word, found = _strip(VERB, word, rv)
+            if not found:
+                word, _ = _strip(NOUN, word, rv)
+
+    word, _ = _strip(I_ENDING, word, rv)
+    word, _ = _strip(DERIVATIONAL, word, r2)
+
+    word, found = _strip(DOUBLE_N, word, rv + 1)
+    if found:
+        return word
+    word, found = _strip(SUPERLATIVE, word, rv)
+    if found:
+        word, _ = _strip(DOUBLE_N, word, rv + 1)
+        return word
+    word, _ = _strip(SOFT_SIGN, word, rv)
+    return word
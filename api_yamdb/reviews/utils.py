@@ -0,0 +1,123 @@
+"""Утилиты для приложения reviews."""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from reviews.models import Review, TableVersion, Title
+
+# Модели, версии которых увеличатся в конце deferred_table_versions.
+_deferred_versions = ContextVar('deferred_versions', default=None)
+
+
+def change_title_rating(title_id, score_delta, count_delta=0):
+    """Атомарно изменяет сохраненные сумму и количество оценок."""
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=F('rating_sum') + score_delta,
+        rating_count=F('rating_count') + count_delta,
+    )
+
+
+def recalculate_title_ratings(title_ids=None, dry_run=False):
+    """
+    Пересчитывает рейтинги произведений по таблице отзывов.
+
+    Возвращает список кортежей (id, сохраненные, фактические) для
+    произведений, у которых сумма и количество оценок разошлись.
+    """
+    titles = Title.objects.only('id', 'rating_sum', 'rating_count')
+    reviews = Review.objects.all()
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+        reviews = reviews.filter(title_id__in=title_ids)
+    actual = {
+        row['title']: (row['score_sum'], row['score_count'])
+        for row in reviews.values('title').annotate(
+            score_sum=Sum('score'), score_count=Count('id')
+        ).order_by()
+    }
+    drift = []
+    changed = []
+    for title in titles.iterator():
+        stored = (title.rating_sum, title.rating_count)
+        expected = actual.get(title.pk, (0, 0))
+        if stored != expected:
+            drift.append((title.pk, stored, expected))
+            title.rating_sum, title.rating_count = expected
+            changed.append(title)
+    if changed and not dry_run:
+        with transaction.atomic():
+            Title.objects.bulk_update(
+                changed, ('rating_sum', 'rating_count'), batch_size=500
+            )
+            bump_table_versions(Title)
+    return drift
+
+
+@contextmanager
+def deferred_table_versions():
+    """
+    Откладывает увеличение версий таблиц на время массовой записи.
+
+    Построчные сигналы не обновляют счетчики, а каждая измененная таблица
+    получает одно увеличение после успешного завершения блока.
+    """
+    if _deferred_versions.get() is not None:
+        yield
+        return
+    models = set()
+    token = _deferred_versions.set(models)
+    try:
+        yield
+    finally:
+        _deferred_versions.reset(token)
+    bump_table_versions(*models)
+
+
+def bump_table_versions(*models):
+    """Увеличивает счетчики изменений таблиц переданных моделей."""
+    deferred = _deferred_versions.get()
+    if deferred is not None:
+        deferred.update(models)
+        return
+    now = timezone.now()
+    for model in models:
+        name = model._meta.label_lower
+        updated = TableVersion.objects.filter(name=name).update(
+            version=F('version') + 1, modified=now
+        )
+        if updated:
+            continue
+        _, created = TableVersion.objects.get_or_create(
+            name=name, defaults={'version': 1}
+        )
+        if not created:
+            TableVersion.objects.filter(name=name).update(
+                version=F('version') + 1, modified=now
+            )
+
+
+def get_table_versions(models):
+    """Возвращает кортежи (таблица, версия, дата изменения) для моделей."""
+    names = sorted(model._meta.label_lower for model in models)
+    return format_table_versions(names, TableVersion.objects.in_bulk(names))
+
+
+async def aget_table_versions(models):
+    """Асинхронный вариант get_table_versions."""
+    names = sorted(model._meta.label_lower for model in models)
+    return format_table_versions(
+        names, await TableVersion.objects.ain_bulk(names)
+    )
+
+
+def format_table_versions(names, versions):
+    """Возвращает версии таблиц names, отсутствующим - нулевую."""
+    return [
+        (name, versions[name].version, versions[name].modified)
+        if name in versions else (name, 0, None)
+        for name in names
+    ]
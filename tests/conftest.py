@@ -1,6 +1,8 @@
 import os
 import sys
 
+import pytest
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(BASE_DIR)
 
@@ -29,3 +31,19 @@ if FILENAME not in project_dir_content:
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(settings, tmp_path):
+    from django.core.cache import cache
+
+    cache.clear()
+    settings.CACHES = {
+        **settings.CACHES,
+        'shared': {**settings.CACHES['shared'], 'LOCATION': tmp_path},
+    }
+
+
+@pytest.fixture(autouse=True)
+def eager_jobs(settings):
+    settings.JOBS_EAGER = True
@@ -0,0 +1,86 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Title
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_changes(self, client, admin_client,
+                                              admin, user, user_client):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client}
+        )
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения обновляется при создании '
+            'отзыва.'
+        )
+
+        response = create_single_review(user_client, title_id, 'text', 2)
+        assert self.get_rating(client, title_id) == 3.5
+
+        user_review_url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=response.json()['id']
+        )
+        response = user_client.patch(user_review_url, data={'score': 9})
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 7, (
+            'Проверьте, что рейтинг произведения обновляется при изменении '
+            'оценки в отзыве.'
+        )
+
+        response = user_client.delete(user_review_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения обновляется при удалении '
+            'отзыва.'
+        )
+
+        response = admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) is None
+
+    def test_02_rating_after_author_deleted(self, client, admin_client,
+                                            admin, user, user_client):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        create_single_review(user_client, titles[0]['id'], 'text', 1)
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, titles[0]['id']) == 5
+
+    def test_03_recalculate_command(self, client, admin_client, admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id = titles[0]['id']
+        Title.objects.filter(pk=title_id).update(
+            rating_sum=100, rating_count=3
+        )
+        call_command('recalculate_ratings', '--dry-run')
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (100, 3)
+
+        call_command('recalculate_ratings')
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что команда `recalculate_ratings` исправляет '
+            'расхождения в сохраненных рейтингах.'
+        )
@@ -0,0 +1,117 @@
+import pytest
+from django.contrib.auth import get_user_model
+
+from api.pagination import (
+    AsyncPageNumberPagination,
+    OptionalCursorPagination,
+    PubDateCursorPagination,
+)
+from reviews.models import Category, Comment, Genre, Review, Title, TitleGenre
+
+User = get_user_model()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryCount:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    # Версии таблиц для ETag, COUNT(*) для пагинации, произведения с
+    # категориями, жанры.
+    TITLES_LIST_QUERIES = 4
+    # Родительский объект, COUNT(*) для пагинации, объекты с авторами.
+    NESTED_LIST_QUERIES = 3
+    PAGE_SIZE = 100
+
+    def create_titles(self, count):
+        category = Category.objects.create(name='Фильм', slug='films')
+        genres = [
+            Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+            for idx in range(3)
+        ]
+        titles = Title.objects.bulk_create(
+            Title(name=f'Произведение {idx}', year=2000, category=category)
+            for idx in range(count)
+        )
+        TitleGenre.objects.bulk_create(
+            TitleGenre(title=title, genre=genre)
+            for title in titles for genre in genres
+        )
+        return titles
+
+    @pytest.mark.parametrize('titles_count', (1, 10, 50))
+    def test_01_titles_list_query_count(self, client, large_pages,
+                                        titles_count,
+                                        django_assert_num_queries):
+        self.create_titles(titles_count)
+        with django_assert_num_queries(self.TITLES_LIST_QUERIES):
+            response = client.get(self.TITLES_URL)
+        results = response.json()['results']
+        assert len(results) == titles_count, (
+            'Проверьте, что все произведения попадают на одну страницу.'
+        )
+        assert all(
+            title['category'] and len(title['genre']) == 3
+            for title in results
+        )
+
+    def test_02_title_detail_query_count(self, client,
+                                         django_assert_num_queries):
+        titles = self.create_titles(1)
+        with django_assert_num_queries(3):
+            client.get(
+                self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0].pk)
+            )
+
+    @pytest.fixture
+    def large_pages(self, monkeypatch):
+        for pagination in (AsyncPageNumberPagination,
+                           OptionalCursorPagination, PubDateCursorPagination):
+            monkeypatch.setattr(pagination, 'page_size', self.PAGE_SIZE)
+
+    def create_authors(self, count):
+        return User.objects.bulk_create(
+            User(username=f'author{idx}', email=f'author{idx}@yamdb.fake')
+            for idx in range(count)
+        )
+
+    @pytest.mark.parametrize('reviews_count', (1, PAGE_SIZE))
+    @pytest.mark.parametrize('mode', ('', '?pagination=cursor'))
+    def test_03_reviews_list_query_count(self, client, large_pages, mode,
+                                         reviews_count,
+                                         django_assert_num_queries):
+        title = self.create_titles(1)[0]
+        Review.objects.bulk_create(
+            Review(title=title, author=author, text='Отзыв', score=5)
+            for author in self.create_authors(reviews_count)
+        )
+        queries = self.NESTED_LIST_QUERIES - bool(mode)
+        with django_assert_num_queries(queries):
+            response = client.get(f'/api/v1/titles/{title.pk}/reviews/{mode}')
+        assert len(response.json()['results']) == reviews_count
+
+    @pytest.mark.parametrize('comments_count', (1, PAGE_SIZE))
+    @pytest.mark.parametrize('mode', ('', '?pagination=cursor'))
+    def test_04_comments_list_query_count(self, client, large_pages, mode,
+                                          comments_count,
+                                          django_assert_num_queries):
+        title = self.create_titles(1)[0]
+        authors = self.create_authors(comments_count)
+        review = Review.objects.create(
+            title=title, author=authors[0], text='Отзыв' * 1000, score=5
+        )
+        Comment.objects.bulk_create(
+            Comment(review=review, author=author, text='Комментарий')
+            for author in authors
+        )
+        queries = self.NESTED_LIST_QUERIES - bool(mode)
+        with django_assert_num_queries(queries):
+            response = client.get(
+                f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/'
+                f'{mode}'
+            )
+        results = response.json()['results']
+        assert len(results) == comments_count
+        assert {comment['author'] for comment in results} == {
+            author.username for author in authors
+        }, 'Проверьте, что в комментариях указаны их авторы.'
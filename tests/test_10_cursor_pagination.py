@@ -0,0 +1,61 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Comment, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def walk_pages(self, client, url):
+        ids = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                f'Проверьте, что в курсорном режиме `{url}` не выполняется '
+                'подсчет общего количества объектов.'
+            )
+            ids.extend(item['id'] for item in data['results'])
+            url = data['next']
+        return ids
+
+    def test_01_reviews_and_comments_cursor(self, client, django_user_model):
+        title = Title.objects.create(name='Произведение', year=2000)
+        authors = django_user_model.objects.bulk_create(
+            django_user_model(username=f'user{idx}',
+                              email=f'user{idx}@yamdb.fake')
+            for idx in range(25)
+        )
+        reviews = Review.objects.bulk_create(
+            Review(title=title, author=author, text='text', score=5)
+            for author in authors
+        )
+        comments = Comment.objects.bulk_create(
+            Comment(review=reviews[0], author=author, text='text')
+            for author in authors
+        )
+
+        ids = self.walk_pages(
+            client,
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.pk)
+            + '?pagination=cursor'
+        )
+        assert ids == [review.pk for review in reviews], (
+            'Проверьте, что курсорная пагинация отзывов возвращает все '
+            'отзывы в порядке публикации.'
+        )
+        ids = self.walk_pages(
+            client,
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title.pk, review_id=reviews[0].pk
+            ) + '?pagination=cursor'
+        )
+        assert ids == [comment.pk for comment in comments]
@@ -0,0 +1,111 @@
+import csv
+import os
+import pickle
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews.csv_import import (
+    FILE_MODELS,
+    convert_file,
+    insert_rows,
+    load_file,
+    read_spill,
+    resolve_load_order,
+)
+from reviews.models import Category, Review, Title
+
+
+def count_records(file_name):
+    path = os.path.join(settings.DATA_TO_LOAD_DIR, file_name)
+    with open(path, encoding='utf-8', newline='') as file:
+        return sum(1 for _ in csv.DictReader(file))
+
+
+def test_01_load_order():
+    order = resolve_load_order(list(FILE_MODELS))
+    assert order.index('users.csv') < order.index('review.csv')
+    assert order.index('titles.csv') < order.index('genre_title.csv')
+    assert order.index('review.csv') < order.index('comments.csv')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_02_load_all_files():
+    call_command('load_csv', '--chunk-size', '7')
+    for file_name, model in FILE_MODELS.items():
+        assert model.objects.count() == count_records(file_name), (
+            f'Проверьте, что команда `load_csv` загружает все записи из '
+            f'`{file_name}`.'
+        )
+    review = Review.objects.get(pk=1)
+    assert (review.pub_date.year, review.author_id) == (2019, 100), (
+        'Проверьте, что команда `load_csv` сохраняет дату публикации и '
+        'автора из CSV файла.'
+    )
+    title = Title.objects.get(pk=review.title_id)
+    assert title.rating_count == title.reviews.count()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_03_load_with_workers(tmp_path):
+    for file_name in ('category.csv', 'titles.csv'):
+        with open(os.path.join(settings.DATA_TO_LOAD_DIR, file_name),
+                  encoding='utf-8') as source:
+            content = source.read()
+        if file_name == 'titles.csv':
+            content = content.rstrip('\n') + '\n999,Из будущего,3000,1\n'
+        (tmp_path / file_name).write_text(content, encoding='utf-8')
+
+    call_command(
+        'load_csv', 'titles.csv', 'category.csv',
+        '--workers', '2', '--dir', str(tmp_path)
+    )
+    assert Title.objects.count() == count_records('titles.csv'), (
+        'Проверьте, что при загрузке с `--workers` некорректные записи '
+        'отклоняются, а остальные загружаются.'
+    )
+    assert not Title.objects.filter(pk=999).exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_04_insert_converted_rows(tmp_path):
+    path = tmp_path / 'category.csv'
+    rows = [f'{idx},Категория {idx},category-{idx}' for idx in range(1, 2001)]
+    rows[1] = 'x,Книга,book'
+    path.write_text('id,name,slug\n' + '\n'.join(rows) + '\n',
+                    encoding='utf-8')
+    converted = convert_file(
+        str(path), Category._meta.label, str(tmp_path), 100
+    )
+    path.unlink()
+    assert (converted['total'], len(converted['rejected'])) == (2000, 1)
+    assert len(pickle.dumps(converted)) < 1000, (
+        'Проверьте, что процесс пула не возвращает преобразованные строки '
+        'целиком, а записывает их во временный файл.'
+    )
+    assert insert_rows(Category, read_spill(converted['spill'])) == 1999, (
+        'Проверьте, что строки, разобранные в пуле процессов, '
+        'записываются без повторного чтения файла.'
+    )
+    assert not os.path.exists(converted['spill'])
+    assert Category.objects.filter(slug='category-3').exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_05_auto_dates_without_column(tmp_path, user):
+    title = Title.objects.create(name='Гамлет', year=1603)
+    path = tmp_path / 'review.csv'
+    path.write_text(
+        f'id,title_id,text,author,score\n1,{title.pk},Отзыв,{user.pk},7\n',
+        encoding='utf-8',
+    )
+    stats = load_file(str(path), Review)
+    assert (stats['loaded'], stats['rejected']) == (1, [])
+    pub_date = Review.objects.get(pk=1).pub_date
+    assert pub_date and timezone.now() - pub_date < timedelta(minutes=1), (
+        'Проверьте, что дата публикации подставляется автоматически, '
+        'если ее нет в CSV файле.'
+    )
@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from reviews.models import Comment, Review, Title
+from reviews.stemmer import stem
+
+
+@pytest.mark.parametrize('word,expected', (
+    ('фильмы', 'фильм'),
+    ('фильмов', 'фильм'),
+    ('красивейший', 'красив'),
+    ('найденный', 'найден'),
+    ('ёлки', 'елк'),
+))
+def test_01_russian_stemmer(word, expected):
+    assert stem(word) == expected
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12Search:
+
+    SEARCH_URL = '/api/v1/search/'
+
+    def test_01_search_requires_query(self, client):
+        response = client.get(self.SEARCH_URL)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что GET-запрос к `{self.SEARCH_URL}` без параметра '
+            '`q` возвращает ответ со статусом 400.'
+        )
+
+    def test_02_ranked_search_with_stemming(self, client, user):
+        godfather = Title.objects.create(
+            name='Крестный отец', year=1972,
+            description='Фильм о семье и о мафии.'
+        )
+        other = Title.objects.create(
+            name='Побег из Шоушенка', year=1994,
+            description='Один из лучших фильмов о семьях заключенных.'
+        )
+        Title.objects.create(name='Гамлет', year=1603)
+        review = Review.objects.create(
+            title=godfather, author=user, score=10,
+            text='Лучшие фильмы никогда не стареют.'
+        )
+        Comment.objects.create(
+            review=review, author=user, text='Согласен, отличный фильм!'
+        )
+
+        response = client.get(self.SEARCH_URL, {'q': 'семьи'})
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [title['id'] for title in data['titles']] == [
+            godfather.pk, other.pk
+        ], (
+            'Проверьте, что поиск находит произведения по разным формам '
+            'слова.'
+        )
+
+        response = client.get(self.SEARCH_URL, {'q': 'фильмами'})
+        data = response.json()
+        assert len(data['titles']) == 2
+        assert [item['id'] for item in data['reviews']] == [review.pk]
+        assert data['reviews'][0]['title'] == godfather.pk
+        assert len(data['comments']) == 1
+        assert data['comments'][0]['review'] == review.pk
+
+        godfather.description = 'Без ключевых слов.'
+        godfather.save()
+        review.delete()
+        response = client.get(self.SEARCH_URL, {'q': 'фильм'})
+        data = response.json()
+        assert [title['id'] for title in data['titles']] == [other.pk], (
+            'Проверьте, что поисковый индекс обновляется при изменении и '
+            'удалении объектов.'
+        )
+        assert data['reviews'] == [] and data['comments'] == []
+
+    @pytest.mark.skipif(connection.vendor != 'sqlite',
+                        reason='Триггеры FTS5 есть только в SQLite.')
+    def test_03_index_skips_non_text_updates(self):
+        title = Title.objects.create(name='Гамлет', year=1603)
+
+        def count_changes(**fields):
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT total_changes()')
+                before = cursor.fetchone()[0]
+                Title.objects.filter(pk=title.pk).update(**fields)
+                cursor.execute('SELECT total_changes()')
+                return cursor.fetchone()[0] - before
+
+        assert count_changes(rating_count=3, rating_sum=27) == 1, (
+            'Проверьте, что изменение полей без текста не переписывает '
+            'поисковый индекс.'
+        )
+        assert count_changes(name='Отелло') > 1
@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ConditionalGet:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_categories_etag(self, client, admin_client):
+        response = client.get(self.CATEGORIES_URL)
+        etag = response.get('ETag')
+        assert etag, (
+            f'Проверьте, что ответ на GET-запрос к `{self.CATEGORIES_URL}` '
+            'содержит заголовок `ETag`.'
+        )
+
+        response = client.get(self.CATEGORIES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{self.CATEGORIES_URL}` с '
+            'актуальным `If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert not response.content
+
+        admin_client.post(
+            self.CATEGORIES_URL, data={'name': 'Фильм', 'slug': 'films'}
+        )
+        response = client.get(self.CATEGORIES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.get('ETag') != etag
+        assert response.json()['count'] == 1
+
+    def test_02_title_changes_with_reviews(self, client, admin_client,
+                                           user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = client.get(url)
+        etag = response['ETag']
+        last_modified = response['Last-Modified']
+
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert client.get(
+            self.TITLES_URL + '?year=1984', HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.OK
+
+        create_single_review(user_client, titles[0]['id'], 'text', 7)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый отзыв меняет `ETag` произведения: от него '
+            'зависит рейтинг.'
+        )
+        assert response.json()['rating'] == 7
+
+    def test_03_if_none_match_any(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = client.get(url, HTTP_IF_NONE_MATCH='*')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['id'] == titles[0]['id']
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=999),
+            HTTP_IF_NONE_MATCH='*',
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что GET-запрос к несуществующему произведению с '
+            '`If-None-Match: *` возвращает ответ со статусом 404.'
+        )
@@ -0,0 +1,99 @@
+import pytest
+from django.db import transaction
+
+from api.cache import get_tag_versions
+from api.signals import title_tag
+from reviews.models import Review
+from reviews.utils import change_title_rating
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    # Запрос версий таблиц для ETag выполняется и при попадании в кэш.
+    CACHE_HIT_QUERIES = 1
+
+    def test_01_review_invalidates_only_its_title(
+            self, client, admin_client, user_client,
+            django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        first_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        second_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[1]['id']
+        )
+        second_reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[1]['id']
+        )
+        for url in (first_url, second_url, second_reviews_url):
+            client.get(url)
+        with django_assert_num_queries(self.CACHE_HIT_QUERIES):
+            client.get(second_url)
+
+        create_single_review(user_client, titles[0]['id'], 'text', 8)
+
+        with django_assert_num_queries(self.CACHE_HIT_QUERIES):
+            assert client.get(second_url).json()['rating'] is None
+        with django_assert_num_queries(0):
+            client.get(second_reviews_url)
+        assert client.get(first_url).json()['rating'] == 8, (
+            'Проверьте, что новый отзыв сбрасывает кэш страницы '
+            'произведения.'
+        )
+        results = client.get(self.TITLES_URL).json()['results']
+        ratings = {title['id']: title['rating'] for title in results}
+        assert ratings[titles[0]['id']] == 8, (
+            'Проверьте, что новый отзыв сбрасывает кэш списков '
+            'произведений, в которые входит произведение.'
+        )
+
+    def test_02_title_changes_invalidate_lists(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLES_URL + '?genre=drama'
+        assert client.get(url).json()['count'] == 1
+
+        response = admin_client.patch(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            data={'genre': ['drama']}, format='json'
+        )
+        assert response.status_code == 200
+        assert client.get(url).json()['count'] == 2, (
+            'Проверьте, что изменение жанров произведения сбрасывает кэш '
+            'отфильтрованных списков.'
+        )
+
+        admin_client.delete('/api/v1/categories/films/')
+        results = client.get(url).json()['results']
+        assert all(
+            title['category'] is None or title['category']['slug'] != 'films'
+            for title in results
+        )
+
+    def test_03_invalidation_after_commit(self, client, admin_client, user):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        assert client.get(url).json()['rating'] is None
+        versions = get_tag_versions([title_tag(title_id)])
+
+        with transaction.atomic():
+            Review.objects.create(
+                title_id=title_id, author=user, text='text', score=8
+            )
+            change_title_rating(title_id, 8, 1)
+            assert get_tag_versions([title_tag(title_id)]) == versions, (
+                'Проверьте, что кэш сбрасывается только после фиксации '
+                'транзакции записи.'
+            )
+            assert client.get(url).json()['rating'] is None
+
+        assert get_tag_versions([title_tag(title_id)]) != versions
+        assert client.get(url).json()['rating'] == 8, (
+            'Проверьте, что после фиксации транзакции отзыв сбрасывает '
+            'кэш страницы произведения.'
+        )
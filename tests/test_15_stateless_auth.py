@@ -0,0 +1,131 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.checks import run_checks
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api import authentication
+from api.authentication import (
+    RoleAccessToken,
+    StatelessJWTAuthentication,
+    cache_user,
+    is_revoked,
+)
+from tests.utils import create_titles
+
+
+def authenticate(token):
+    request = APIRequestFactory().get(
+        '/', HTTP_AUTHORIZATION=f'Bearer {token}'
+    )
+    return StatelessJWTAuthentication().authenticate(request)[0]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15StatelessAuth:
+
+    TOKEN_URL = '/api/v1/auth/token/'
+
+    def test_01_token_contains_role(self, client, user):
+        user.confirmation_code = 'CODE42'
+        user.save()
+        response = client.post(self.TOKEN_URL, data={
+            'username': user.username, 'confirmation_code': 'CODE42'
+        })
+        assert response.status_code == HTTPStatus.OK
+        token = RoleAccessToken(response.json()['token'])
+        assert token['role'] == user.role
+        assert token['username'] == user.username
+
+    def test_02_authentication_without_queries(self, user,
+                                               django_assert_num_queries):
+        token = RoleAccessToken.for_user(user)
+        with django_assert_num_queries(0):
+            request_user = authenticate(token)
+        assert request_user == user
+        assert (request_user.username, request_user.role) == (
+            user.username, user.role
+        )
+
+    def test_03_role_change_revokes_claims(self, admin_client, user,
+                                           django_assert_num_queries):
+        token = RoleAccessToken.for_user(user)
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'moderator'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        with django_assert_num_queries(1):
+            request_user = authenticate(token)
+        assert request_user.is_moderator, (
+            'Проверьте, что после изменения роли через `/api/v1/users/` '
+            'роль из ранее выданного токена не используется.'
+        )
+
+    def test_04_stateless_user_writes(self, admin_client, user):
+        titles, _, _ = create_titles(admin_client)
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.post(url, data={'text': 'text', 'score': 4})
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+        response = client.patch(
+            f'{url}{response.json()["id"]}/', data={'score': 6}
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        response = client.get('/api/v1/users/me/')
+        assert response.json()['email'] == user.email
+
+    def test_05_profile_edit_keeps_claims(self, user, user_client,
+                                          django_assert_num_queries):
+        token = RoleAccessToken.for_user(user)
+        response = user_client.patch(
+            '/api/v1/users/me/', data={'bio': 'Новая биография'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        with django_assert_num_queries(0):
+            authenticate(token)
+        assert not is_revoked(token), (
+            'Проверьте, что изменение профиля без роли и флагов не отзывает '
+            'данные ранее выданных токенов.'
+        )
+        user.is_active = False
+        user.save()
+        assert is_revoked(token), (
+            'Проверьте, что блокировка пользователя отзывает данные '
+            'ранее выданных токенов.'
+        )
+
+    def test_06_shared_revocation_cache(self, settings):
+        assert not run_checks()
+        settings.JWT_REVOCATION_CACHE_ALIAS = 'default'
+        assert [error.id for error in run_checks()] == ['api.E002'], (
+            'Проверьте, что кэш в памяти процесса нельзя использовать для '
+            'отзыва токенов.'
+        )
+
+    def test_07_user_cache_bounded(self, settings, admin, user, moderator,
+                                   django_assert_num_queries):
+        settings.JWT_USER_CACHE_TTL = 60
+        settings.JWT_USER_CACHE_SIZE = 2
+        cache = authentication._user_cache
+        cache.clear()
+        for account in (admin, user, moderator):
+            assert authenticate(AccessToken.for_user(account)) == account
+        assert list(cache) == [user.pk, moderator.pk], (
+            'Проверьте, что кэш пользователей ограничен '
+            '`JWT_USER_CACHE_SIZE` записями.'
+        )
+        with django_assert_num_queries(0):
+            authenticate(AccessToken.for_user(moderator))
+        cache_user(admin.pk, admin, ttl=0)
+        cache_user(user.pk, user, ttl=60)
+        assert admin.pk not in cache, (
+            'Проверьте, что истекшие записи удаляются из кэша '
+            'пользователей.'
+        )
+        cache.clear()
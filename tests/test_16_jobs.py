@@ -0,0 +1,91 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from jobs import handlers
+from jobs.models import Job
+from jobs.queue import queue_depth, run_batch, send_mail_later
+
+
+class FailingBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+@pytest.fixture
+def queued_jobs(settings):
+    settings.JOBS_EAGER = False
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('queued_jobs')
+class Test16Jobs:
+
+    def test_01_signup_enqueues_mail(self, client):
+        response = client.post('/api/v1/auth/signup/', data={
+            'username': 'queued', 'email': 'queued@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что письмо с кодом подтверждения не отправляется '
+            'во время запроса, а ставится в очередь.'
+        )
+        job = Job.objects.get()
+        assert job.status == Job.Status.PENDING
+
+        call_command('run_worker', '--once')
+        job.refresh_from_db()
+        assert job.status == Job.Status.DONE
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == ['queued@yamdb.fake']
+
+    def test_02_mail_batch_uses_one_connection(self, monkeypatch):
+        connections = []
+
+        def get_connection(*args, **kwargs):
+            connections.append(EmailBackend())
+            return connections[-1]
+
+        monkeypatch.setattr(handlers, 'get_connection', get_connection)
+        for number in range(3):
+            send_mail_later('Тема', 'Текст', None, [f'{number}@yamdb.fake'])
+        stats = run_batch('worker', batch_size=10)
+        assert stats['done'] == 3
+        assert len(connections) == 1
+        assert len(mail.outbox) == 3
+
+    def test_03_retry_with_backoff(self, settings):
+        settings.EMAIL_BACKEND = 'tests.test_16_jobs.FailingBackend'
+        settings.JOBS_MAX_ATTEMPTS = 2
+        job = send_mail_later('Тема', 'Текст', None, ['fail@yamdb.fake'])
+
+        assert run_batch('worker', batch_size=10)['pending'] == 1
+        job.refresh_from_db()
+        assert job.attempts == 1
+        assert job.run_at > timezone.now()
+        assert 'SMTP недоступен' in job.last_error
+        assert run_batch('worker', batch_size=10)['claimed'] == 0, (
+            'Проверьте, что повтор задачи откладывается.'
+        )
+
+        Job.objects.update(run_at=timezone.now() - timedelta(seconds=1))
+        assert run_batch('worker', batch_size=10)['failed'] == 1
+        job.refresh_from_db()
+        assert job.status == Job.Status.FAILED
+        assert len(mail.outbox) == 0
+
+    def test_04_queue_depth(self):
+        send_mail_later('Тема', 'Текст', None, ['a@yamdb.fake'])
+        job = send_mail_later('Тема', 'Текст', None, ['b@yamdb.fake'])
+        job.run_at = timezone.now() + timedelta(hours=1)
+        job.save()
+        depth = queue_depth()
+        assert depth['pending'] == 2
+        assert depth['due'] == 1
+        assert depth['done'] == 0
+        assert depth['oldest_due_age'] >= 0
@@ -0,0 +1,83 @@
+import re
+from http import HTTPStatus
+
+import pytest
+
+from api.metrics import percentile, registry
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    registry.clear()
+
+
+def test_01_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 0.5) == 50
+    assert percentile(values, 0.99) == 99
+    assert percentile([], 0.5) == 0
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17Metrics:
+
+    TITLES_URL = '/api/v1/titles/'
+    METRICS_URL = '/api/v1/_internal/metrics'
+
+    def test_02_server_timing(self, client, settings):
+        settings.DEBUG = True
+        response = client.get(self.TITLES_URL)
+        header = response.get('Server-Timing', '')
+        match = re.search(r'sql;dur=[\d.]+;desc="(\d+) queries"', header)
+        assert match, (
+            'Проверьте, что в режиме DEBUG ответ содержит заголовок '
+            '`Server-Timing` с числом и временем SQL запросов.'
+        )
+        assert int(match.group(1)) > 0
+        for name in ('serializer', 'render', 'total'):
+            assert f'{name};dur=' in header
+
+        settings.DEBUG = False
+        assert 'Server-Timing' not in client.get(self.TITLES_URL)
+
+    def test_03_metrics_permissions(self, client, user_client, admin_client):
+        assert client.get(self.METRICS_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.get(self.METRICS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        assert admin_client.get(self.METRICS_URL).status_code == HTTPStatus.OK
+
+    def test_04_metrics_report(self, client, admin_client):
+        for _ in range(3):
+            client.get(self.TITLES_URL)
+        client.get('/admin/login/')
+        routes = admin_client.get(self.METRICS_URL).json()['routes']
+        assert list(routes) == ['GET titles-list'], (
+            'Проверьте, что метрики собираются только по маршрутам API.'
+        )
+        report = routes['GET titles-list']
+        assert report['count'] == 3
+        assert report['query_count']['p50'] > 0
+        assert report['total_time']['p99'] >= report['total_time']['p50']
+        assert report['serializer_time']['sum'] > 0
+        assert report['render_time']['sum'] > 0
+
+    def test_05_prometheus(self, client, admin_client):
+        client.get(self.TITLES_URL)
+        response = admin_client.get(
+            self.METRICS_URL, data={'format': 'prometheus'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/plain')
+        content = response.content.decode()
+        assert '# TYPE yamdb_api_queries summary' in content
+        assert (
+            'yamdb_api_queries{route="GET titles-list",quantile="0.5"}'
+            in content
+        )
+        assert 'yamdb_api_request_seconds_count{route="GET titles-list"} 1' in (
+            content
+        )
+        assert 'yamdb_jobs{status="pending"} 0' in content
@@ -0,0 +1,57 @@
+import pytest
+
+from benchmarks.dataset import seed_dataset
+from benchmarks.runner import TRANSPORTS, run_scenario
+from benchmarks.scenarios import build_scenarios, prepare_context
+from reviews.models import Comment, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+def test_01_seed_dataset():
+    sizes = seed_dataset(titles=5, reviews=23, comments=10, seed=1)
+    assert Title.objects.count() == sizes['titles'] == 5
+    assert Review.objects.count() == sizes['reviews'] > 0
+    assert Comment.objects.count() == sizes['comments'] == 10
+    ratings = Title.objects.values_list('rating_count', flat=True)
+    assert sum(ratings) == sizes['reviews'], (
+        'Проверьте, что после заполнения базы рейтинги произведений '
+        'пересчитаны.'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('transport_class', TRANSPORTS.values())
+def test_02_scenarios(transport_class):
+    sizes = seed_dataset(titles=3, reviews=6, comments=6)
+    context = prepare_context()
+    with transport_class() as transport:
+        for scenario in build_scenarios(context, sizes):
+            summary = run_scenario(
+                transport, scenario, context['admin_token'],
+                iterations=2, warmup=0,
+            )
+            assert summary['requests'] == 2
+            assert summary['errors'] == 0, (
+                f'Сценарий `{scenario.name}` завершился с ошибкой.'
+            )
+            assert summary['p99_ms'] >= summary['p50_ms'] > 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_03_scenarios_use_existing_titles():
+    sizes = seed_dataset(titles=3, reviews=6, comments=6)
+    Title.objects.filter(pk=1).delete()
+    context = prepare_context()
+    transport_class = next(iter(TRANSPORTS.values()))
+    with transport_class() as transport:
+        for scenario in build_scenarios(context, sizes):
+            if 'title' not in scenario.name and 'review' not in scenario.name:
+                continue
+            summary = run_scenario(
+                transport, scenario, context['admin_token'],
+                iterations=3, warmup=0,
+            )
+            assert summary['errors'] == 0, (
+                f'Проверьте, что сценарий `{scenario.name}` обращается '
+                'только к существующим произведениям.'
+            )
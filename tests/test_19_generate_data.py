@@ -0,0 +1,83 @@
+from collections import Counter
+
+import pytest
+from django.core.management import call_command
+
+from reviews.generator import DataGenerator, generate_csv
+from reviews.models import Comment, Review, Title, TitleGenre
+
+SIZES = {'titles': 50, 'reviews': 2000, 'comments': 1000, 'users': 1000}
+
+
+def read_files(directory):
+    return {
+        path.name: path.read_text(encoding='utf-8')
+        for path in sorted(directory.iterdir())
+    }
+
+
+def test_01_generator_is_deterministic(tmp_path):
+    generate_csv(DataGenerator(**SIZES, seed=7), tmp_path / 'first')
+    generate_csv(DataGenerator(**SIZES, seed=7), tmp_path / 'second')
+    generate_csv(DataGenerator(**SIZES, seed=8), tmp_path / 'other')
+    first = read_files(tmp_path / 'first')
+    assert first == read_files(tmp_path / 'second'), (
+        'Проверьте, что одинаковый seed дает одинаковые данные.'
+    )
+    assert first != read_files(tmp_path / 'other')
+
+
+def test_02_distributions():
+    generator = DataGenerator(**SIZES)
+    counts = sorted(generator.review_counts, reverse=True)
+    assert counts[0] > 10 * counts[len(counts) // 2], (
+        'Проверьте, что число отзывов на произведение распределено '
+        'по закону Ципфа.'
+    )
+    tables = {name: list(rows) for name, _, _, rows in generator.tables()}
+    pairs = [(row[1], row[3]) for row in tables['review.csv']]
+    assert len(pairs) == len(set(pairs)) == generator.reviews, (
+        'Проверьте, что у произведения нет двух отзывов одного автора.'
+    )
+    genres = Counter(row[1] for row in tables['genre_title.csv'])
+    assert max(genres.values()) > 1
+    review_words = sorted(
+        len(row[2].split()) for row in tables['review.csv']
+    )
+    comment_words = sorted(
+        len(row[2].split()) for row in tables['comments.csv']
+    )
+    assert (
+        comment_words[len(comment_words) // 2]
+        > review_words[len(review_words) // 2]
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_03_generate_database():
+    call_command('generate_data', *(
+        f'--{name}={value}' for name, value in SIZES.items()
+    ))
+    sizes = DataGenerator(**SIZES).sizes
+    assert Title.objects.count() == sizes['titles']
+    assert Review.objects.count() == sizes['reviews']
+    assert Comment.objects.count() == sizes['comments']
+    assert TitleGenre.objects.exists()
+    ratings = Title.objects.values_list('rating_count', flat=True)
+    assert sum(ratings) == sizes['reviews']
+
+
+@pytest.mark.django_db(transaction=True)
+def test_04_csv_compatible_with_load_csv(tmp_path):
+    call_command('generate_data', f'--csv-dir={tmp_path}', *(
+        f'--{name}={value}' for name, value in SIZES.items()
+    ))
+    call_command('load_csv', f'--dir={tmp_path}')
+    sizes = DataGenerator(**SIZES).sizes
+    assert Review.objects.count() == sizes['reviews'], (
+        'Проверьте, что CSV файлы generate_data загружаются командой '
+        '`load_csv` без отклоненных записей.'
+    )
+    assert Comment.objects.count() == sizes['comments']
+    ratings = Title.objects.values_list('rating_count', flat=True)
+    assert sum(ratings) == sizes['reviews']
@@ -0,0 +1,50 @@
+import pytest
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+
+from benchmarks.dataset import seed_dataset
+from benchmarks.explain import explain, explain_scenario, find_scans
+from benchmarks.management.commands.run_benchmarks import DUMMY_CACHES
+from benchmarks.runner import ClientTransport
+from benchmarks.scenarios import build_scenarios, prepare_context
+from reviews.models import Genre, Title, TitleGenre
+
+
+@pytest.mark.django_db
+def test_01_unique_title_genre():
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    title = Title.objects.create(name='Фильм', year=2000)
+    TitleGenre.objects.create(title=title, genre=genre)
+    with pytest.raises(IntegrityError):
+        TitleGenre.objects.create(title=title, genre=genre)
+
+
+@pytest.mark.django_db
+def test_02_find_scans():
+    with CaptureQueriesContext(connection) as queries:
+        list(Title.objects.filter(description='текст'))
+        list(Title.objects.filter(year=2000))
+    unindexed, indexed = (
+        explain(query['sql']) for query in queries.captured_queries
+    )
+    assert find_scans(unindexed) == {'reviews_title'}
+    assert find_scans(indexed) == set()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_03_endpoints_use_indexes(settings):
+    settings.CACHES = DUMMY_CACHES
+    sizes = seed_dataset(titles=20, reviews=100, comments=50)
+    context = prepare_context()
+    with ClientTransport() as transport:
+        for scenario in build_scenarios(context, sizes):
+            status, results = explain_scenario(
+                transport, scenario, context['admin_token']
+            )
+            assert status < 400
+            assert results, scenario.name
+            for sql, _, scans in results:
+                assert not scans, (
+                    f'Сценарий `{scenario.name}` читает таблицы '
+                    f'{scans} целиком: {sql}'
+                )
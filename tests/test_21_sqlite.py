@@ -0,0 +1,83 @@
+import json
+import subprocess
+import sys
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+
+from api.views import ReviewViewSet
+from tests.utils import create_titles
+
+
+def open_database(path):
+    default = connections[DEFAULT_DB_ALIAS]
+    return type(default)(
+        {**default.settings_dict, 'NAME': str(path)}, alias='sqlite_check'
+    )
+
+
+@pytest.mark.django_db
+def test_01_connection_pragmas(tmp_path):
+    database = open_database(tmp_path / 'pragmas.sqlite3')
+    raw = database.get_new_connection(database.get_connection_params())
+    try:
+        pragmas = {
+            name: raw.execute(f'PRAGMA {name}').fetchone()[0]
+            for name in ('journal_mode', 'synchronous', 'mmap_size',
+                         'cache_size', 'busy_timeout')
+        }
+    finally:
+        raw.close()
+    assert pragmas == {
+        'journal_mode': settings.SQLITE_JOURNAL_MODE.lower(),
+        'synchronous': 1,
+        'mmap_size': settings.SQLITE_MMAP_SIZE,
+        'cache_size': settings.SQLITE_CACHE_SIZE,
+        'busy_timeout': settings.SQLITE_BUSY_TIMEOUT * 1000,
+    }, 'Проверьте, что настройки SQLite применяются к новым соединениям.'
+    assert database.transaction_mode == settings.SQLITE_TRANSACTION_MODE
+
+
+@pytest.mark.django_db(transaction=True)
+def test_02_locked_database_response(admin_client, user_client,
+                                     monkeypatch):
+    titles, _, _ = create_titles(admin_client)
+
+    def locked(self, serializer):
+        raise OperationalError('database is locked')
+
+    monkeypatch.setattr(ReviewViewSet, 'perform_create', locked)
+    response = user_client.post(
+        f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+        data={'text': 'Отзыв', 'score': 5},
+    )
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE, (
+        'Проверьте, что на занятую базу API отвечает кодом 503.'
+    )
+    assert response['Retry-After']
+
+
+def test_03_concurrent_reviews(tmp_path):
+    output = tmp_path / 'load.json'
+    subprocess.run(
+        (
+            sys.executable, 'manage.py', 'run_benchmarks',
+            '--titles', '20', '--reviews', '100', '--comments', '10',
+            '--transport', 'wsgi', '--mixed', '--no-cache',
+            '--scenario', 'review_create', '--scenario', 'reviews_page',
+            '--scenario', 'title_detail',
+            '--iterations', '100', '--warmup', '0', '--concurrency', '8',
+            '--database-name', str(tmp_path / 'load.sqlite3'),
+            '--output', str(output),
+        ),
+        cwd=settings.BASE_DIR, check=True, capture_output=True,
+    )
+    results = json.loads(output.read_text(encoding='utf-8'))['results']
+    for name, summary in results['wsgi'].items():
+        assert summary['requests'] == 100
+        assert summary['errors'] == 0, (
+            f'Проверьте, что при одновременных чтении и записи отзывов '
+            f'запросы сценария `{name}` не завершаются ошибкой.'
+        )
@@ -0,0 +1,140 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from api.replicas import pool
+from tests.utils import create_titles
+
+User = get_user_model()
+
+
+@pytest.fixture
+def replicas(tmp_path, settings):
+    """Подключает файлы SQLite как реплики основной базы."""
+    aliases = []
+
+    def add(alias, path=None):
+        default = connections[DEFAULT_DB_ALIAS]
+        connections[alias] = type(default)({
+            **default.settings_dict,
+            'NAME': str(path or tmp_path / f'{alias}.sqlite3'),
+        }, alias)
+        aliases.append(alias)
+        settings.DATABASE_REPLICAS = list(aliases)
+
+    def sync():
+        """Копирует основную базу в реплики."""
+        primary = connections[DEFAULT_DB_ALIAS]
+        primary.ensure_connection()
+        for alias in aliases:
+            replica = connections[alias]
+            replica.ensure_connection()
+            primary.connection.backup(replica.connection)
+
+    pool.clear()
+    yield add, sync
+    pool.clear()
+    for alias in aliases:
+        connections[alias].close()
+        del connections[alias]
+
+
+def get_usernames(client):
+    response = client.get('/api/v1/users/')
+    assert response.status_code == HTTPStatus.OK
+    return {user['username'] for user in response.json()['results']}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22Replicas:
+
+    def test_01_read_your_writes(self, client, admin_client, replicas):
+        add, sync = replicas
+        add('replica')
+        sync()
+        create_titles(admin_client)
+        assert client.get('/api/v1/titles/').json()['count'] == 0, (
+            'Проверьте, что безопасные запросы к API читают из реплики.'
+        )
+        assert admin_client.get('/api/v1/titles/').json()['count'] == 2, (
+            'Проверьте, что после записи автор читает из основной базы.'
+        )
+        cache.clear()
+        assert admin_client.get('/api/v1/titles/').json()['count'] == 0, (
+            'Проверьте, что закрепление за основной базой ограничено '
+            'по времени.'
+        )
+        sync()
+        cache.clear()
+        assert client.get('/api/v1/titles/').json()['count'] == 2
+
+    def test_02_stale_responses_not_cached(self, client, admin_client,
+                                           replicas):
+        add, sync = replicas
+        add('replica')
+        sync()
+        create_titles(admin_client)
+        assert client.get('/api/v1/titles/').json()['count'] == 0
+        sync()
+        assert client.get('/api/v1/titles/').json()['count'] == 2, (
+            'Проверьте, что ответы из реплики вскоре после записи не '
+            'сохраняются в кэш.'
+        )
+
+    def test_03_round_robin(self, admin_client, replicas):
+        add, sync = replicas
+        add('replica_1')
+        add('replica_2')
+        sync()
+        for alias in ('replica_1', 'replica_2'):
+            User.objects.using(alias).create(
+                username=alias, email=f'{alias}@yamdb.fake'
+            )
+        seen = [
+            get_usernames(admin_client) & {'replica_1', 'replica_2'}
+            for _ in range(4)
+        ]
+        assert seen[0] != seen[1] and seen[:2] == seen[2:], (
+            'Проверьте, что реплики выбираются по очереди.'
+        )
+
+    def test_04_least_latency(self, admin_client, replicas, settings):
+        add, sync = replicas
+        add('replica_1')
+        add('replica_2')
+        sync()
+        User.objects.using('replica_2').create(
+            username='fast', email='fast@yamdb.fake'
+        )
+        settings.DATABASE_REPLICA_SELECTION = 'least_latency'
+        pool.latency.update({'replica_1': 0.5, 'replica_2': 0.01})
+        for _ in range(3):
+            assert 'fast' in get_usernames(admin_client), (
+                'Проверьте, что выбирается реплика с наименьшей задержкой.'
+            )
+
+    def test_05_failed_replica(self, tmp_path, admin_client, replicas):
+        add, sync = replicas
+        add('replica')
+        sync()
+        add('broken', tmp_path / 'missing' / 'replica.sqlite3')
+        User.objects.using('replica').create(
+            username='replica', email='replica@yamdb.fake'
+        )
+        for _ in range(2):
+            assert 'replica' in get_usernames(admin_client), (
+                'Проверьте, что недоступная реплика пропускается.'
+            )
+        assert 'broken' in pool.failed_until
+
+    def test_06_primary_fallback(self, tmp_path, admin, admin_client,
+                                 replicas):
+        add, _ = replicas
+        add('broken', tmp_path / 'missing' / 'replica.sqlite3')
+        assert admin.username in get_usernames(admin_client), (
+            'Проверьте, что без доступных реплик чтение идет из основной '
+            'базы.'
+        )
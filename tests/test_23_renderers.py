@@ -0,0 +1,80 @@
+import datetime as dt
+import io
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from api import parsers, renderers
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+from tests.utils import create_reviews
+
+DATA = {
+    'results': [{
+        'id': 1,
+        'name': 'Мастер и Маргарита',
+        'text': 'Строка\u2028строка\u2029',
+        'rating': 7.333333333333333,
+        'price': Decimal('10.50'),
+        'pub_date': timezone.make_aware(
+            dt.datetime(2024, 5, 1, 12, 30, 15, 123456), dt.timezone.utc
+        ),
+        'day': dt.date(2024, 5, 1),
+        'genre': [{'name': 'Драма', 'slug': 'drama'}],
+        'score': None,
+    }],
+    'count': 1,
+    7: True,
+}
+
+
+@pytest.fixture(params=('orjson', 'stdlib'))
+def backend(request, monkeypatch):
+    if request.param == 'stdlib':
+        monkeypatch.setattr(renderers, 'orjson', None)
+        monkeypatch.setattr(parsers, 'orjson', None)
+    elif renderers.orjson is None:
+        pytest.skip('orjson не установлен.')
+    return request.param
+
+
+def test_01_same_output(backend):
+    assert FastJSONRenderer().render(DATA) == JSONRenderer().render(DATA), (
+        'Проверьте, что рендерер API формирует тот же JSON, что и '
+        'JSONRenderer DRF.'
+    )
+    assert FastJSONRenderer().render(None) == b''
+    media_type = 'application/json; indent=4'
+    assert FastJSONRenderer().render(DATA, media_type) == (
+        JSONRenderer().render(DATA, media_type)
+    )
+
+
+def test_02_parser(backend):
+    parser = FastJSONParser()
+    content = '{"text": "Отзыв", "score": 5}'.encode()
+    assert parser.parse(io.BytesIO(content)) == {'text': 'Отзыв', 'score': 5}
+    for content in (b'{"score": ', b'{"score": NaN}'):
+        with pytest.raises(ParseError):
+            parser.parse(io.BytesIO(content))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_03_api_responses(backend, admin, admin_client, user, user_client):
+    _, titles = create_reviews(
+        admin_client, {admin: admin_client, user: user_client}
+    )
+    for url in (
+        '/api/v1/titles/',
+        f'/api/v1/titles/{titles[0]["id"]}/',
+        f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+    ):
+        response = admin_client.get(url)
+        assert response['Content-Type'] == 'application/json'
+        assert response.content == JSONRenderer().render(response.data), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` совпадает с '
+            'ответом JSONRenderer DRF.'
+        )
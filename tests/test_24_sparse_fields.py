@@ -0,0 +1,99 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_titles
+
+
+def get_with_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f'Проверьте, что GET-запрос к `{url}` возвращает ответ со статусом '
+        '200.'
+    )
+    return response.json(), [query['sql'] for query in queries]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24SparseFields:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_titles_fields(self, client, admin_client):
+        create_titles(admin_client)
+        data, queries = get_with_queries(
+            client, f'{self.TITLES_URL}?fields=id,name,rating'
+        )
+        assert all(
+            set(title) == {'id', 'name', 'rating'}
+            for title in data['results']
+        ), (
+            'Проверьте, что параметр `fields` оставляет в ответе только '
+            'перечисленные поля.'
+        )
+        _, full_queries = get_with_queries(client, self.TITLES_URL)
+        assert len(queries) == len(full_queries) - 1, (
+            'Проверьте, что без поля `genre` жанры не загружаются.'
+        )
+        select = queries[-1]
+        assert all(
+            name not in select for name in ('description', 'reviews_category')
+        ), (
+            'Проверьте, что из запроса убираются столбцы и связи '
+            'неотображаемых полей.'
+        )
+        assert 'rating_sum' in select
+
+    def test_02_titles_omit(self, client, admin_client):
+        create_titles(admin_client)
+        data, queries = get_with_queries(
+            client, f'{self.TITLES_URL}?omit=genre,description'
+        )
+        assert set(data['results'][0]) == {
+            'id', 'name', 'year', 'category', 'rating'
+        }
+        assert data['results'][0]['category']['slug']
+        assert 'reviews_category' in queries[-1]
+
+    def test_03_unknown_field(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get(f'{self.TITLES_URL}?fields=id,secret')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что запрос неизвестного поля возвращает ответ со '
+            'статусом 400.'
+        )
+        assert 'fields' in response.json()
+
+    def test_04_writes_ignore_fields(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/?fields=id',
+            data={'name': 'Новое имя'},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['name'] == 'Новое имя'
+
+    def test_05_comments_without_related_queries(self, admin, admin_client,
+                                                 moderator, moderator_client,
+                                                 user, user_client):
+        authors = {
+            admin: admin_client,
+            moderator: moderator_client,
+            user: user_client,
+        }
+        _, reviews, titles = create_comments(admin_client, authors)
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+            'comments/?fields=id,author,text'
+        )
+        data, queries = get_with_queries(admin_client, url)
+        assert {
+            comment['author'] for comment in data['results']
+        } == {author.username for author in authors}
+        assert len(queries) <= 4, (
+            'Проверьте, что авторы комментариев загружаются одним '
+            'запросом со списком.'
+        )
@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews
+
+
+def select_queries(queries, table):
+    return [
+        query['sql'] for query in queries.captured_queries
+        if query['sql'].startswith('SELECT') and f'FROM "{table}"' in (
+            query['sql']
+        )
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25NestedResources:
+
+    REVIEWS_URL = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL = '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+
+    def test_01_review_create_loads_title_once(self, admin, admin_client,
+                                               user_client):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.post(
+                self.REVIEWS_URL.format(title_id=titles[0]['id']),
+                data={'text': 'Отзыв', 'score': 7},
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(select_queries(queries, 'reviews_title')) == 1, (
+            'Проверьте, что при создании отзыва произведение загружается '
+            'из базы один раз.'
+        )
+
+    def test_02_comments_parent_in_one_query(self, admin, admin_client):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.COMMENTS_URL.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        response = admin_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == HTTPStatus.CREATED
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        parents = select_queries(queries, 'reviews_review')
+        assert len(parents) == 1 and 'reviews_title' in parents[0], (
+            'Проверьте, что отзыв и его произведение загружаются одним '
+            'запросом.'
+        )
+
+    def test_03_review_of_other_title(self, admin, admin_client, client):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.COMMENTS_URL.format(
+            title_id=titles[1]['id'], review_id=reviews[0]['id']
+        )
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что комментарии отзыва недоступны по адресу '
+            'другого произведения.'
+        )
+        response = admin_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что нельзя прокомментировать отзыв по адресу '
+            'другого произведения.'
+        )
@@ -0,0 +1,142 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.core.cache import cache
+from django.test import AsyncClient
+from django.urls import resolve
+from rest_framework.views import APIView
+
+from api.authentication import RoleAccessToken
+from benchmarks.runner import async_reads
+from tests.utils import create_comments
+
+QUERIES = re.compile(r'(\d+) queries')
+
+
+@pytest.fixture
+def async_client():
+    with async_reads():
+        yield AsyncClient()
+
+
+def async_get(client, url, token=None, **headers):
+    if token:
+        headers['Authorization'] = f'Bearer {token}'
+    return async_to_sync(client.get)(url, headers=headers)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26AsyncReads:
+
+    @pytest.fixture
+    def urls(self, admin, admin_client, user, user_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        review_url = f'{title_url}reviews/{reviews[0]["id"]}/'
+        return [
+            '/api/v1/titles/',
+            '/api/v1/titles/?genre=drama&page=1',
+            '/api/v1/titles/?fields=id,name,rating',
+            title_url,
+            f'{title_url}reviews/',
+            f'{title_url}reviews/?pagination=cursor',
+            review_url,
+            f'{review_url}comments/',
+            f'{review_url}comments/?fields=id,author',
+            f'{review_url}comments/{comments[0]["id"]}/',
+            '/api/v1/titles/999/',
+            '/api/v1/titles/?page=100',
+            '/api/v1/titles/999/reviews/',
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/'
+            'comments/',
+            '/api/v1/titles/?fields=secret',
+        ]
+
+    def test_01_same_responses(self, urls, client, async_client):
+        for url in urls:
+            expected = client.get(url)
+            assert iscoroutinefunction(resolve(url.split('?')[0]).func)
+            response = async_get(async_client, url)
+            assert response.status_code == expected.status_code, (
+                f'Проверьте, что асинхронный GET-запрос к `{url}` '
+                'возвращает тот же статус, что и синхронный.'
+            )
+            assert response.content == expected.content, (
+                f'Проверьте, что асинхронный GET-запрос к `{url}` '
+                'возвращает тот же ответ, что и синхронный.'
+            )
+            assert response['Content-Type'] == expected['Content-Type']
+
+    def test_02_authentication(self, urls, admin, token_admin, async_client):
+        url = urls[4]
+        for token in (
+            token_admin['access'], str(RoleAccessToken.for_user(admin))
+        ):
+            response = async_get(async_client, url, token)
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что асинхронное чтение работает с токенами '
+                'с данными пользователя и без них.'
+            )
+        response = async_get(async_client, url, 'invalid')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_03_writes_stay_sync(self, urls, user, token_user,
+                                 async_client):
+        url = urls[7]
+        response = async_to_sync(async_client.post)(
+            url, {'text': 'Комментарий'},
+            headers={'Authorization': f'Bearer {token_user["access"]}'},
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что при асинхронном чтении запись через тот же '
+            'адрес выполняется синхронным представлением.'
+        )
+        response = async_to_sync(async_client.post)(url, {'text': 'Текст'})
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_04_conditional_get(self, urls, async_client):
+        url = urls[0]
+        response = async_get(async_client, url)
+        assert response.status_code == HTTPStatus.OK
+        assert async_get(
+            async_client, url, If_None_Match=response['ETag']
+        ).status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что асинхронный список произведений поддерживает '
+            'ETag.'
+        )
+
+    def test_05_query_count(self, urls, client, async_client, settings):
+        settings.DEBUG = True
+        for url in urls[:10]:
+            cache.clear()
+            expected = client.get(url)['Server-Timing']
+            cache.clear()
+            response = async_get(async_client, url)
+            assert QUERIES.search(response['Server-Timing'])[1] == (
+                QUERIES.search(expected)[1]
+            ), (
+                f'Проверьте, что асинхронный GET-запрос к `{url}` '
+                'выполняет столько же SQL-запросов, что и синхронный, и '
+                'что они учитываются в метриках.'
+            )
+
+    def test_06_initial_once(self, urls, token_admin, async_client,
+                             monkeypatch):
+        calls = []
+        negotiate = APIView.perform_content_negotiation
+
+        def counted(view, request, force=False):
+            calls.append(view.action)
+            return negotiate(view, request, force)
+
+        monkeypatch.setattr(APIView, 'perform_content_negotiation', counted)
+        response = async_get(async_client, urls[4], token_admin['access'])
+        assert response.status_code == HTTPStatus.OK
+        assert calls == ['list'], (
+            'Проверьте, что при загрузке пользователя из базы проверки '
+            'DRF перед обработчиком выполняются один раз.'
+        )
@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+
+from benchmarks.runner import async_reads
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27BatchTitles:
+
+    TITLES_URL = '/api/v1/titles/'
+    BATCH_URL = '/api/v1/titles/batch/'
+
+    def test_01_ids_param(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        ids = [titles[1]['id'], 999, titles[0]['id'], titles[1]['id']]
+        response = client.get(
+            f'{self.TITLES_URL}?ids={",".join(map(str, ids))}'
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [title['id'] for title in data['results']] == ids[:3:2], (
+            'Проверьте, что параметр `ids` возвращает произведения в '
+            'порядке запроса без повторов.'
+        )
+        assert data['missing'] == [999], (
+            'Проверьте, что отсутствующие id перечисляются в `missing`.'
+        )
+        assert data['count'] == 2
+        assert data['results'][0] == client.get(
+            f'{self.TITLES_URL}{ids[0]}/'
+        ).json()
+
+    def test_02_constant_queries(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        counts = []
+        for count in (1, len(titles)):
+            ids = ','.join(str(title['id']) for title in titles[:count])
+            with CaptureQueriesContext(connection) as queries:
+                client.get(f'{self.TITLES_URL}?ids={ids}')
+            counts.append(len(queries))
+        assert counts[0] == counts[1], (
+            'Проверьте, что число запросов к базе не зависит от числа '
+            'запрошенных произведений.'
+        )
+
+    def test_03_batch_post(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        ids = [title['id'] for title in reversed(titles)] + [999]
+        response = client.post(
+            self.BATCH_URL, {'ids': ids}, content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что POST-запрос к `/api/v1/titles/batch/` доступен '
+            'без токена.'
+        )
+        assert response.json() == client.get(
+            f'{self.TITLES_URL}?ids={",".join(map(str, ids))}'
+        ).json()
+
+    @pytest.mark.parametrize('ids', (
+        'abc', '', '0', ','.join(['1'] * (settings.BATCH_MAX_IDS + 1)),
+    ), ids=('text', 'empty', 'zero', 'too_many'))
+    def test_04_invalid_ids(self, client, ids):
+        response = client.get(f'{self.TITLES_URL}?ids={ids}')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что неверный список id возвращает ответ со '
+            'статусом 400.'
+        )
+        assert 'ids' in response.json()
+
+    def test_05_async(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}?ids={titles[1]["id"]},999'
+        expected = client.get(url).content
+        with async_reads():
+            response = async_to_sync(AsyncClient().get)(url)
+        assert response.content == expected
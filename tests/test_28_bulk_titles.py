@@ -0,0 +1,134 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title, TitleGenre
+from tests.utils import create_titles
+
+BULK_URL = '/api/v1/titles/bulk/'
+
+
+def new_titles(count, genres=('drama', 'comedy')):
+    return [
+        {
+            'name': f'Произведение {index}',
+            'year': 2000 + index % 20,
+            'category': 'books',
+            'genre': list(genres),
+        }
+        for index in range(count)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28BulkTitles:
+
+    def test_01_create_and_update(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        items = new_titles(3) + [
+            {
+                'id': titles[0]['id'],
+                'name': 'Новое имя',
+                'genre': ['horror'],
+            },
+        ]
+        response = admin_client.post(BULK_URL, items, format='json')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что POST-запрос администратора к '
+            '`/api/v1/titles/bulk/` возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert data['created'] == 3 and data['updated'] == 1
+        assert data['ids'][3] == titles[0]['id']
+        created = Title.objects.get(pk=data['ids'][0])
+        assert created.category.slug == 'books'
+        assert sorted(created.genre.values_list('slug', flat=True)) == [
+            'comedy', 'drama'
+        ], 'Проверьте, что новым произведениям назначаются жанры.'
+        updated = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert updated.json()['name'] == 'Новое имя'
+        assert [genre['slug'] for genre in updated.json()['genre']] == [
+            'horror'
+        ], 'Проверьте, что жанры изменяемого произведения заменяются.'
+        assert updated.json()['year'] == titles[0]['year']
+
+    def test_02_constant_queries(self, admin_client):
+        create_titles(admin_client)
+        counts = []
+        for count in (2, 40):
+            with CaptureQueriesContext(connection) as queries:
+                response = admin_client.post(
+                    BULK_URL, new_titles(count), format='json'
+                )
+            assert response.status_code == HTTPStatus.OK
+            counts.append(len(queries))
+        assert counts[0] == counts[1], (
+            'Проверьте, что число запросов к базе не зависит от числа '
+            'произведений в запросе.'
+        )
+        assert TitleGenre.objects.count() == 2 * 42 + 3
+
+    def test_03_item_errors(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        before = Title.objects.count()
+        items = new_titles(2) + [
+            {'name': 'Без года', 'category': 'books', 'genre': []},
+            {'name': 'Жанр', 'year': 2000, 'category': 'nope',
+             'genre': ['drama', 'unknown']},
+            {'id': 999, 'name': 'Нет такого'},
+            {'id': titles[0]['id'], 'year': 3000},
+        ]
+        response = admin_client.post(BULK_URL, items, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert len(errors) == len(items), (
+            'Проверьте, что ошибки возвращаются списком по элементам '
+            'запроса.'
+        )
+        assert errors[:2] == [{}, {}]
+        assert 'year' in errors[2]
+        assert set(errors[3]) == {'category', 'genre'}
+        assert len(errors[3]['genre']) == 1
+        assert 'id' in errors[4]
+        assert 'year' in errors[5]
+        assert Title.objects.count() == before, (
+            'Проверьте, что при ошибке в любом элементе ничего не '
+            'записывается.'
+        )
+
+    @pytest.mark.parametrize('items', ({}, [], 'text'))
+    def test_04_invalid_body(self, admin_client, items):
+        response = admin_client.post(BULK_URL, items, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_05_permissions(self, client, user_client):
+        assert client.post(
+            BULK_URL, new_titles(1), content_type='application/json'
+        ).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.post(
+            BULK_URL, new_titles(1), format='json'
+        ).status_code == HTTPStatus.FORBIDDEN
+
+    def test_06_cache_invalidation(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/'
+        detail_url = f'{url}{titles[0]["id"]}/'
+        first = client.get(url)
+        client.get(detail_url)
+        response = admin_client.post(
+            BULK_URL,
+            new_titles(1) + [{'id': titles[0]['id'], 'name': 'Новое'}],
+            format='json',
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert client.get(url).json()['count'] == (
+            first.json()['count'] + 1
+        ), 'Проверьте, что массовая запись сбрасывает кэш списка.'
+        assert client.get(detail_url).json()['name'] == 'Новое'
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=first['ETag']
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что массовая запись меняет ETag списка.'
+        )
@@ -0,0 +1,132 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import (
+    Genre, Review, Title, TitleGenre, TitleSimilarity
+)
+from users.models import User
+
+SIZES = {'titles': 60, 'reviews': 1500, 'comments': 0, 'users': 40}
+NEIGHBORS = 5
+
+
+def build(*args):
+    out = StringIO()
+    call_command(
+        'build_similar_titles', f'--neighbors={NEIGHBORS}', *args, stdout=out
+    )
+    return out.getvalue()
+
+
+def snapshot():
+    result = {}
+    for title_id, score in TitleSimilarity.objects.order_by(
+        'title_id', '-score'
+    ).values_list('title_id', 'score'):
+        result.setdefault(title_id, []).append(round(score, 9))
+    return result
+
+
+@pytest.fixture
+def titles():
+    call_command('generate_data', *(
+        f'--{name}={value}' for name, value in SIZES.items()
+    ), stdout=StringIO())
+    build()
+    return list(Title.objects.order_by('id'))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29SimilarTitles:
+
+    def test_01_full_build(self, titles):
+        index = snapshot()
+        assert set(index) == {title.id for title in titles}
+        assert all(
+            len(scores) == NEIGHBORS
+            and scores == sorted(scores, reverse=True)
+            for scores in index.values()
+        ), 'Проверьте, что у каждого произведения сохраняются лучшие соседи.'
+        assert not TitleSimilarity.objects.filter(
+            title_id=F('similar_id')
+        ).exists(), 'Проверьте, что произведение не попадает в свои соседи.'
+        assert 'обновлено списков соседей: 0' in build(), (
+            'Проверьте, что без изменений индекс не перезаписывается.'
+        )
+
+    def test_02_incremental_matches_full(self, titles):
+        genres = list(Genre.objects.all())
+        TitleGenre.objects.filter(title=titles[0]).delete()
+        TitleGenre.objects.create(title=titles[0], genre=genres[-1])
+        Title.objects.filter(pk=titles[1].pk).update(year=1900)
+        reviewed = Review.objects.filter(title=titles[-1]).values('author')
+        Review.objects.create(
+            title=titles[-1], text='Отзыв', score=10,
+            author=User.objects.exclude(pk__in=reviewed).first(),
+        )
+        titles[3].delete()
+        new_title = Title.objects.create(name='Новое', year=2000)
+        TitleGenre.objects.create(title=new_title, genre=genres[0])
+        output = build()
+        assert 'изменилось: 4' in output, (
+            'Проверьте, что команда находит произведения с измененными '
+            'признаками.'
+        )
+        incremental = snapshot()
+        assert titles[3].id not in incremental
+        assert len(incremental[new_title.id]) == NEIGHBORS
+        build('--full')
+        assert incremental == snapshot(), (
+            'Проверьте, что обновление индекса дает тот же результат, что '
+            'и полный пересчет.'
+        )
+
+    def test_03_endpoint(self, client, titles):
+        url = f'/api/v1/titles/{titles[0].id}/similar/'
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос к '
+            '`/api/v1/titles/{title_id}/similar/` доступен без токена.'
+        )
+        assert len(queries) == 2, (
+            'Проверьте, что похожие произведения загружаются одним запросом '
+            'к индексу и одним запросом жанров.'
+        )
+        data = response.json()
+        expected = TitleSimilarity.objects.filter(
+            title=titles[0]
+        ).order_by('-score', 'similar_id')
+        assert [title['id'] for title in data] == [
+            row.similar_id for row in expected
+        ]
+        assert data[0]['similarity'] == expected[0].score
+        assert set(data[0]) >= {'name', 'genre', 'category', 'rating'}
+        response = client.get(f'{url}?fields=id,similarity')
+        assert set(response.json()[0]) == {'id', 'similarity'}
+
+    def test_04_missing(self, client, titles):
+        for title_id in (0, 'abc'):
+            assert client.get(
+                f'/api/v1/titles/{title_id}/similar/'
+            ).status_code == HTTPStatus.NOT_FOUND
+        new_title = Title.objects.create(name='Новое', year=2000)
+        response = client.get(f'/api/v1/titles/{new_title.id}/similar/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == [], (
+            'Проверьте, что для произведения вне индекса возвращается '
+            'пустой список.'
+        )
+
+    def test_05_default_neighbors(self, titles):
+        call_command('build_similar_titles', '--full', stdout=StringIO())
+        assert {len(scores) for scores in snapshot().values()} == {
+            settings.TITLE_SIMILARITY_NEIGHBORS
+        }
@@ -0,0 +1,130 @@
+import os
+from http import HTTPStatus
+from io import StringIO
+
+import numpy as np
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, Title
+from reviews.recommendations import (
+    CURRENT_FILE,
+    get_recommendation_model,
+    read_current,
+)
+
+URL = '/api/v1/users/me/recommendations/'
+SIZES = {'titles': 40, 'reviews': 1500, 'comments': 0, 'users': 60}
+
+
+def train(*args):
+    call_command(
+        'train_recommendations', '--factors=4', '--iterations=5', *args,
+        stdout=StringIO(),
+    )
+
+
+def load_factors(directory):
+    path = os.path.join(directory, read_current(directory))
+    return {
+        name: np.load(os.path.join(path, name))
+        for name in sorted(os.listdir(path))
+    }
+
+
+@pytest.fixture(autouse=True)
+def factors_dir(settings, tmp_path):
+    settings.RECOMMENDATIONS_DIR = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def data():
+    call_command('generate_data', *(
+        f'--{name}={value}' for name, value in SIZES.items()
+    ), stdout=StringIO())
+    return list(Title.objects.order_by('id'))
+
+
+def review(user, titles, score=10):
+    for title in titles:
+        Review.objects.create(title=title, author=user, text='Отзыв',
+                              score=score)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30Recommendations:
+
+    def test_01_popular_without_model(self, data, user, user_client):
+        review(user, data[:3])
+        response = user_client.get(URL)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос пользователя к '
+            '`/api/v1/users/me/recommendations/` возвращает ответ со '
+            'статусом 200.'
+        )
+        expected = Title.objects.exclude(
+            pk__in=[title.pk for title in data[:3]]
+        ).order_by('-rating_count', 'id')[:10]
+        assert [title['id'] for title in response.json()] == [
+            title.pk for title in expected
+        ], (
+            'Проверьте, что без обученной модели рекомендуются '
+            'произведения с наибольшим числом оценок без отзывов '
+            'пользователя.'
+        )
+
+    def test_02_model(self, data, user, user_client, factors_dir):
+        review(user, data[:5])
+        train()
+        model = get_recommendation_model()
+        response = user_client.get(f'{URL}?limit=5')
+        assert response.status_code == HTTPStatus.OK
+        ids = [title['id'] for title in response.json()]
+        assert ids == model.recommend(
+            user.pk, [title.pk for title in data[:5]], 5
+        ), 'Проверьте, что рекомендации берутся из обученной модели.'
+        assert not set(ids) & {title.pk for title in data[:5]}
+        review(user, Title.objects.filter(pk=ids[0]))
+        ids_after = [
+            title['id'] for title in user_client.get(URL).json()
+        ]
+        assert ids[0] not in ids_after, (
+            'Проверьте, что произведения с новыми отзывами пользователя '
+            'исключаются без переобучения.'
+        )
+        assert ids_after[:4] == ids[1:]
+
+    def test_03_workers(self, data, factors_dir):
+        train()
+        sequential = load_factors(factors_dir)
+        train('--workers=2')
+        parallel = load_factors(factors_dir)
+        assert sequential.keys() == parallel.keys()
+        for name, array in sequential.items():
+            assert np.allclose(array, parallel[name], atol=1e-5), (
+                'Проверьте, что расчет в пуле процессов дает те же '
+                'факторы.'
+            )
+
+    def test_04_versions(self, data, factors_dir):
+        for _ in range(3):
+            train()
+        versions = sorted(
+            name for name in os.listdir(factors_dir)
+            if name != CURRENT_FILE
+        )
+        assert len(versions) == 2 and versions[-1] == read_current(
+            factors_dir
+        ), 'Проверьте, что хранятся текущая и одна прошлая версии факторов.'
+        model = get_recommendation_model()
+        assert isinstance(model.title_factors, np.memmap), (
+            'Проверьте, что факторы читаются через отображение в память.'
+        )
+
+    def test_05_access(self, client, user_client):
+        assert client.get(URL).status_code == HTTPStatus.UNAUTHORIZED
+        for limit in (0, 'abc', 1000):
+            assert user_client.get(
+                f'{URL}?limit={limit}'
+            ).status_code == HTTPStatus.BAD_REQUEST